@@ -1,3 +1,5 @@
+from cryptoxlib.CryptoXLibClient import CryptoXLibClient
+from cryptoxlib.HttpConnectionPool import HttpConnectionPool
 from cryptoxlib.clients.bitforex.BitforexClient import BitforexClient
 from cryptoxlib.clients.bitstamp.bitstampclient import BitstampClient
 from cryptoxlib.clients.liquid.LiquidClient import LiquidClient
@@ -18,74 +20,100 @@ from cryptoxlib.clients.coinmate.CoinmateClient import CoinmateClient
 
 class CryptoXLib(object):
     @staticmethod
-    def create_bitforex_client(api_key: str, sec_key: str) -> BitforexClient:
-        return BitforexClient(api_key, sec_key)
+    def _configure_client(client: CryptoXLibClient, http_connection_pool: HttpConnectionPool = None):
+        # several clients can share a single connection pool, e.g. for multiple accounts of the same exchange
+        if http_connection_pool is not None:
+            client.set_http_connection_pool(http_connection_pool)
+
+        return client
+
+    @staticmethod
+    def create_bitforex_client(api_key: str, sec_key: str,
+                               http_connection_pool: HttpConnectionPool = None) -> BitforexClient:
+        return CryptoXLib._configure_client(BitforexClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_liquid_client(api_key: str, sec_key: str) -> LiquidClient:
-        return LiquidClient(api_key, sec_key)
+    def create_liquid_client(api_key: str, sec_key: str,
+                             http_connection_pool: HttpConnectionPool = None) -> LiquidClient:
+        return CryptoXLib._configure_client(LiquidClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_bibox_client(api_key: str, sec_key: str) -> BiboxClient:
-        return BiboxClient(api_key, sec_key)
+    def create_bibox_client(api_key: str, sec_key: str,
+                            http_connection_pool: HttpConnectionPool = None) -> BiboxClient:
+        return CryptoXLib._configure_client(BiboxClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_bibox_europe_client(api_key: str, sec_key: str) -> BiboxEuropeClient:
-        return BiboxEuropeClient(api_key, sec_key)
+    def create_bibox_europe_client(api_key: str, sec_key: str,
+                                   http_connection_pool: HttpConnectionPool = None) -> BiboxEuropeClient:
+        return CryptoXLib._configure_client(BiboxEuropeClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_bitpanda_client(api_key: str) -> BitpandaClient:
-        return BitpandaClient(api_key)
+    def create_bitpanda_client(api_key: str,
+                               http_connection_pool: HttpConnectionPool = None) -> BitpandaClient:
+        return CryptoXLib._configure_client(BitpandaClient(api_key), http_connection_pool)
 
     @staticmethod
     def create_binance_client(api_key: str, sec_key: str,
-                              api_cluster: binance_enums.APICluster = binance_enums.APICluster.CLUSTER_DEFAULT) -> BinanceClient:
-        return BinanceClient(api_key, sec_key, api_cluster = api_cluster)
+                              api_cluster: binance_enums.APICluster = binance_enums.APICluster.CLUSTER_DEFAULT,
+                              http_connection_pool: HttpConnectionPool = None) -> BinanceClient:
+        return CryptoXLib._configure_client(BinanceClient(api_key, sec_key, api_cluster = api_cluster), http_connection_pool)
 
     @staticmethod
-    def create_binance_testnet_client(api_key: str, sec_key: str) -> BinanceTestnetClient:
-        return BinanceTestnetClient(api_key, sec_key)
+    def create_binance_testnet_client(api_key: str, sec_key: str,
+                                      http_connection_pool: HttpConnectionPool = None) -> BinanceTestnetClient:
+        return CryptoXLib._configure_client(BinanceTestnetClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_binance_usds_m_futures_client(api_key: str, sec_key: str) -> BinanceUSDSMFuturesClient:
-        return BinanceUSDSMFuturesClient(api_key, sec_key)
+    def create_binance_usds_m_futures_client(api_key: str, sec_key: str,
+                                             http_connection_pool: HttpConnectionPool = None) -> BinanceUSDSMFuturesClient:
+        return CryptoXLib._configure_client(BinanceUSDSMFuturesClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_binance_usds_m_futures_testnet_client(api_key: str, sec_key: str) -> BinanceUSDSMFuturesTestnetClient:
-        return BinanceUSDSMFuturesTestnetClient(api_key, sec_key)
+    def create_binance_usds_m_futures_testnet_client(api_key: str, sec_key: str,
+                                                     http_connection_pool: HttpConnectionPool = None) -> BinanceUSDSMFuturesTestnetClient:
+        return CryptoXLib._configure_client(BinanceUSDSMFuturesTestnetClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_binance_coin_m_futures_client(api_key: str, sec_key: str) -> BinanceCOINMFuturesClient:
-        return BinanceCOINMFuturesClient(api_key, sec_key)
+    def create_binance_coin_m_futures_client(api_key: str, sec_key: str,
+                                             http_connection_pool: HttpConnectionPool = None) -> BinanceCOINMFuturesClient:
+        return CryptoXLib._configure_client(BinanceCOINMFuturesClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_binance_coin_m_futures_testnet_client(api_key: str, sec_key: str) -> BinanceCOINMFuturesTestnetClient:
-        return BinanceCOINMFuturesTestnetClient(api_key, sec_key)
+    def create_binance_coin_m_futures_testnet_client(api_key: str, sec_key: str,
+                                                     http_connection_pool: HttpConnectionPool = None) -> BinanceCOINMFuturesTestnetClient:
+        return CryptoXLib._configure_client(BinanceCOINMFuturesTestnetClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_bitvavo_client(api_key: str, sec_key: str) -> BitvavoClient:
-        return BitvavoClient(api_key, sec_key)
+    def create_bitvavo_client(api_key: str, sec_key: str,
+                              http_connection_pool: HttpConnectionPool = None) -> BitvavoClient:
+        return CryptoXLib._configure_client(BitvavoClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_btse_client(api_key: str, sec_key: str) -> BtseClient:
-        return BtseClient(api_key, sec_key)
+    def create_btse_client(api_key: str, sec_key: str,
+                           http_connection_pool: HttpConnectionPool = None) -> BtseClient:
+        return CryptoXLib._configure_client(BtseClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_aax_client(api_key: str, sec_key: str) -> AAXClient:
-        return AAXClient(api_key, sec_key)
+    def create_aax_client(api_key: str, sec_key: str,
+                          http_connection_pool: HttpConnectionPool = None) -> AAXClient:
+        return CryptoXLib._configure_client(AAXClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_hitbtc_client(api_key: str, sec_key: str) -> HitbtcClient:
-        return HitbtcClient(api_key, sec_key)
+    def create_hitbtc_client(api_key: str, sec_key: str,
+                             http_connection_pool: HttpConnectionPool = None) -> HitbtcClient:
+        return CryptoXLib._configure_client(HitbtcClient(api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_eterbase_client(account_id: str, api_key: str, sec_key: str) -> EterbaseClient:
-        return EterbaseClient(account_id, api_key, sec_key)
+    def create_eterbase_client(account_id: str, api_key: str, sec_key: str,
+                               http_connection_pool: HttpConnectionPool = None) -> EterbaseClient:
+        return CryptoXLib._configure_client(EterbaseClient(account_id, api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_coinmate_client(user_id: str, api_key: str, sec_key: str) -> CoinmateClient:
-        return CoinmateClient(user_id, api_key, sec_key)
+    def create_coinmate_client(user_id: str, api_key: str, sec_key: str,
+                               http_connection_pool: HttpConnectionPool = None) -> CoinmateClient:
+        return CryptoXLib._configure_client(CoinmateClient(user_id, api_key, sec_key), http_connection_pool)
 
     @staticmethod
-    def create_bitstamp_client(api_key: str, sec_key: bytes) -> BitstampClient:
-        return BitstampClient(api_key, sec_key)
+    def create_bitstamp_client(api_key: str, sec_key: bytes,
+                               http_connection_pool: HttpConnectionPool = None) -> BitstampClient:
+        return CryptoXLib._configure_client(BitstampClient(api_key, sec_key), http_connection_pool)
@@ -1,21 +1,28 @@
 import asyncio
+import copy
 from urllib.parse import urlencode
 
 import aiohttp
+import yarl
 import ssl
 import logging
-import datetime
-import json
 import enum
 import time
 from abc import ABC, abstractmethod
 from multidict import CIMultiDictProxy
 from typing import List, Optional, Dict
 
+from cryptoxlib import wire_trace
 from cryptoxlib.version_conversions import async_create_task
 from cryptoxlib.Timer import Timer
+from cryptoxlib.HttpConnectionPool import HttpConnectionPool
+from cryptoxlib.RestCache import RestCache, get_cached_endpoints
+from cryptoxlib.LazyJson import LazyJson
+from cryptoxlib.ServerClock import ServerClock, get_timestamp_ms
 from cryptoxlib.exceptions import CryptoXLibException
-from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr
+from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, CallbackDispatchMode, WebsocketTransport
+from cryptoxlib.WebsocketSharding import ShardingLimits, SubscriptionSharder
+from cryptoxlib.WebsocketProcessPool import WebsocketProcessPool
 
 LOG = logging.getLogger(__name__)
 
@@ -35,6 +42,13 @@ class ContentType(enum.Enum):
     OTHER = "other"
 
 
+class RestResponseMode(enum.Enum):
+    # response bodies are decoded as soon as they are received
+    DECODED = enum.auto()
+    # successful response bodies are returned as LazyJson holding the raw bytes which are decoded on first access
+    LAZY = enum.auto()
+
+
 class SubscriptionSet(object):
     SUBSCRIPTION_SET_ID_SEQ = 0
 
@@ -43,7 +57,8 @@ class SubscriptionSet(object):
         SubscriptionSet.SUBSCRIPTION_SET_ID_SEQ += 1
 
         self.subscriptions: List[Subscription] = subscriptions
-        self.websocket_mgr: Optional[WebsocketMgr] = None
+        # a subscription set can be split across several websocket connections (shards)
+        self.websocket_mgrs: List[WebsocketMgr] = []
 
     def find_subscription(self, subscription: Subscription) -> Optional[Subscription]:
         for s in self.subscriptions:
@@ -52,19 +67,69 @@ class SubscriptionSet(object):
 
         return None
 
+    def find_websocket_mgr(self, subscription: Subscription) -> Optional[WebsocketMgr]:
+        for websocket_mgr in self.websocket_mgrs:
+            for s in websocket_mgr.subscriptions:
+                if s.internal_subscription_id == subscription.internal_subscription_id:
+                    return websocket_mgr
+
+        return None
+
 
 class CryptoXLibClient(ABC):
+    # attributes holding credentials, they are not handed over to websocket workers which do not authenticate
+    CREDENTIAL_ATTRIBUTES = ('api_key', 'sec_key', 'signer')
+
     def __init__(self, api_trace_log: bool = False, ssl_context: ssl.SSLContext = None) -> None:
         self.api_trace_log = api_trace_log
 
         self.rest_session = None
+        # connection pool is created on demand unless a (shared) pool is provided via set_http_connection_pool(...)
+        self.http_connection_pool: Optional[HttpConnectionPool] = None
+        self.http_connection_pool_owned = False
+        self.rest_timeout: Optional[aiohttp.ClientTimeout] = None
+        self.rest_response_mode = RestResponseMode.DECODED
+        # identical concurrent unsigned GET calls share a single HTTP request, see enable_rest_call_coalescing(...)
+        self.rest_call_coalescing = False
+        self.in_flight_rest_calls: Dict[tuple, asyncio.Task] = {}
+        self.coalesced_rest_call_count = 0
+        # cache of reference-data endpoints, see enable_rest_cache(...)
+        self.rest_cache: Optional[RestCache] = None
+        # timestamps follow the exchange time if enabled, see enable_server_clock(...)
+        self.server_clock: Optional[ServerClock] = None
+        # periodic requests keeping pre-opened connections alive, see warmup(...)
+        self.keep_warm_task: Optional[asyncio.Task] = None
         self.subscription_sets: Dict[int, SubscriptionSet] = {}
+        self.callback_dispatch_mode: Optional[CallbackDispatchMode] = None
+        self.websocket_sharding_limits: Optional[ShardingLimits] = None
+        self.websocket_transport: Optional[WebsocketTransport] = None
+        self.websocket_process_pool: Optional[WebsocketProcessPool] = None
 
         if ssl_context is not None:
             self.ssl_context = ssl_context
         else:
             self.ssl_context = ssl.create_default_context()
 
+    def __getstate__(self):
+        # the client is transferred to websocket worker processes without its runtime state. SSL contexts cannot be
+        # transferred, workers use the default one
+        state = self.__dict__.copy()
+        state['rest_session'] = None
+        state['http_connection_pool'] = None
+        state['http_connection_pool_owned'] = False
+        state['subscription_sets'] = {}
+        state['websocket_process_pool'] = None
+        state['in_flight_rest_calls'] = {}
+        state['rest_cache'] = None
+        state['keep_warm_task'] = None
+        state['ssl_context'] = None
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.ssl_context = ssl.create_default_context()
+
     @abstractmethod
     def _get_rest_api_uri(self) -> str:
         pass
@@ -82,29 +147,197 @@ class CryptoXLibClient(ABC):
                            ssl_context = None) -> WebsocketMgr:
         pass
 
+    def _get_websocket_sharding_limits(self) -> Optional[ShardingLimits]:
+        # exchanges with limits per websocket connection override this method, None disables sharding
+        return None
+
+    async def _acquire_rest_rate_limit(self, rest_call_type: RestCallType, resource: str, api_variable_path: str = None,
+                                       params: dict = None, data: dict = None) -> None:
+        # exchanges with client-side rate limiting override this method, it may delay the call or raise an exception
+        pass
+
+    async def _fetch_server_timestamp_ms(self) -> int:
+        raise CryptoXLibException(f"Server time is not available for {self.__class__.__name__}.")
+
+    async def _send_warmup_request(self) -> None:
+        # any answer opens the connection, clients override this with a cheap public endpoint. The request has to be
+        # sent directly (e.g. via _send_rest_call, not _create_get) since concurrent identical GETs may be coalesced
+        # into a single call and would warm up a single connection only
+        async with self._get_rest_session().get(self._get_rest_api_uri(), ssl = self.ssl_context) as response:
+            await response.read()
+
     async def close(self) -> None:
-        session = self._get_rest_session()
-        if session is not None:
-            await session.close()
+        if self.keep_warm_task is not None:
+            self.keep_warm_task.cancel()
+            try:
+                await self.keep_warm_task
+            except asyncio.CancelledError:
+                pass
+            self.keep_warm_task = None
+
+        if self.server_clock is not None:
+            await self.server_clock.stop()
+
+        if self.rest_cache is not None:
+            await self.rest_cache.close()
+
+        # shared connection pools are closed by their owner
+        if self.http_connection_pool is not None and self.http_connection_pool_owned:
+            await self.http_connection_pool.close()
+            self.http_connection_pool = None
+            self.http_connection_pool_owned = False
+
+        self.rest_session = None
+
+    def set_http_connection_pool(self, http_connection_pool: HttpConnectionPool) -> None:
+        if self.rest_session is not None:
+            raise CryptoXLibException("Connection pool cannot be changed once REST calls have been made.")
+
+        self.http_connection_pool = http_connection_pool
+        self.http_connection_pool_owned = False
+
+    def set_rest_timeout(self, total_timeout_sec: Optional[float] = None, connect_timeout_sec: Optional[float] = None,
+                         read_timeout_sec: Optional[float] = None) -> None:
+        # overrides the default timeouts of the connection pool for REST calls of this client
+        self.rest_timeout = aiohttp.ClientTimeout(total = total_timeout_sec, sock_connect = connect_timeout_sec,
+                                                  sock_read = read_timeout_sec)
+
+    def set_rest_response_mode(self, rest_response_mode: RestResponseMode) -> None:
+        """
+        In the LAZY mode bodies of successful responses are not decoded unless accessed. The raw bytes are available
+        via response['response'].raw, e.g. to forward large responses without decoding them. Error responses are
+        always decoded.
+        """
+        self.rest_response_mode = rest_response_mode
+
+    def enable_rest_call_coalescing(self, enabled: bool = True) -> None:
+        """
+        Identical unsigned GET calls (same resource, parameters and headers) issued while such a call is already in
+        flight wait for the result of the in-flight call instead of sending a new request. All callers receive the
+        same result object which therefore must not be modified.
+        """
+        self.rest_call_coalescing = enabled
+
+    def get_coalesced_rest_call_count(self) -> int:
+        # number of REST calls which were saved thanks to the coalescing
+        return self.coalesced_rest_call_count
+
+    def enable_rest_cache(self, max_size: int = RestCache.DEFAULT_MAX_SIZE, stale_ttl_sec: Optional[float] = None,
+                          ttl_overrides: Dict[str, float] = None) -> RestCache:
+        """
+        Enables caching of reference-data endpoints (exchange info, instruments, currencies, ...). Expired responses
+        are returned while being refreshed in the background, see RestCache for the parameters.
+        """
+        self.rest_cache = RestCache(max_size = max_size, stale_ttl_sec = stale_ttl_sec, ttl_overrides = ttl_overrides)
+
+        return self.rest_cache
+
+    async def preload_rest_cache(self, endpoints: List[str] = None) -> None:
+        """
+        Fetches responses of cached endpoints (called without arguments) in advance, e.g. at startup, so that later
+        calls are served from the cache and refreshed in the background. All cached endpoints of the client are
+        preloaded unless the endpoints (method names) are provided.
+        """
+        if self.rest_cache is None:
+            raise CryptoXLibException("REST cache is not enabled, see enable_rest_cache(...).")
+
+        if endpoints is None:
+            endpoints = get_cached_endpoints(type(self))
+
+        await asyncio.gather(*[getattr(self, endpoint)() for endpoint in endpoints])
+
+    def invalidate_rest_cache(self, endpoint: str = None) -> None:
+        # endpoint is the name of the client method, e.g. "get_exchange_info"
+        if self.rest_cache is not None:
+            self.rest_cache.invalidate(endpoint)
+
+    async def enable_server_clock(self, sync_interval_sec: float = ServerClock.DEFAULT_SYNC_INTERVAL_SEC,
+                                  sample_count: int = ServerClock.DEFAULT_SAMPLE_COUNT) -> ServerClock:
+        # timestamps of requests are derived from the exchange time, the clock is synchronized periodically
+        if self.server_clock is None:
+            server_clock = ServerClock(self._fetch_server_timestamp_ms, sync_interval_sec, sample_count)
+            await server_clock.sync()
+            server_clock.start()
+
+            self.server_clock = server_clock
+
+        return self.server_clock
+
+    async def warmup(self, connection_count: int = 1, keepalive_interval_sec: Optional[float] = None) -> None:
+        """
+        Opens connection_count connections of the REST connection pool in advance so that the first calls do not pay
+        for the DNS resolution, TCP and TLS handshakes and creation of the session. If keepalive_interval_sec is
+        provided, the connections are kept open by cheap requests sent periodically, the interval has to be shorter
+        than the keepalive timeout of the connection pool and of the exchange.
+        """
+        # concurrent requests cannot share a connection, i.e. each of them opens a new one which is returned
+        # to the pool afterwards
+        await self._warmup_connections(connection_count)
+
+        if keepalive_interval_sec is not None and self.keep_warm_task is None:
+            self.keep_warm_task = async_create_task(self._keep_warm(connection_count, keepalive_interval_sec))
+
+    async def _warmup_connections(self, connection_count: int) -> None:
+        await asyncio.gather(*[self._send_warmup_request() for _ in range(connection_count)])
+
+    async def _keep_warm(self, connection_count: int, keepalive_interval_sec: float) -> None:
+        while True:
+            await asyncio.sleep(keepalive_interval_sec)
+            try:
+                await self._warmup_connections(connection_count)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                LOG.warning(f"Keeping connections warm failed: {e}")
 
     async def _create_get(self, resource: str, params: dict = None, headers: dict = None, signed: bool = False,
-                          api_variable_path: str = None, content_type: ContentType = ContentType.JSON) -> dict:
-        return await self._create_rest_call(RestCallType.GET, resource, None, params, headers, signed, api_variable_path, content_type)
+                          api_variable_path: str = None, content_type: ContentType = ContentType.JSON,
+                          timeout: aiohttp.ClientTimeout = None) -> dict:
+        return await self._create_rest_call(RestCallType.GET, resource, None, params, headers, signed, api_variable_path, content_type, timeout)
 
     async def _create_post(self, resource: str, data: dict = None, params: dict = None, headers: dict = None, signed: bool = False,
-                           api_variable_path: str = None, content_type: ContentType = ContentType.JSON) -> dict:
-        return await self._create_rest_call(RestCallType.POST, resource, data, params, headers, signed, api_variable_path, content_type)
+                           api_variable_path: str = None, content_type: ContentType = ContentType.JSON,
+                           timeout: aiohttp.ClientTimeout = None) -> dict:
+        return await self._create_rest_call(RestCallType.POST, resource, data, params, headers, signed, api_variable_path, content_type, timeout)
 
     async def _create_delete(self, resource: str, data:dict = None,  params: dict = None, headers: dict = None, signed: bool = False,
-                             api_variable_path: str = None, content_type: ContentType = ContentType.JSON) -> dict:
-        return await self._create_rest_call(RestCallType.DELETE, resource, data, params, headers, signed, api_variable_path, content_type)
+                             api_variable_path: str = None, content_type: ContentType = ContentType.JSON,
+                             timeout: aiohttp.ClientTimeout = None) -> dict:
+        return await self._create_rest_call(RestCallType.DELETE, resource, data, params, headers, signed, api_variable_path, content_type, timeout)
 
     async def _create_put(self, resource: str, data: dict = None, params: dict = None, headers: dict = None, signed: bool = False,
-                          api_variable_path: str = None, content_type: ContentType = ContentType.JSON) -> dict:
-        return await self._create_rest_call(RestCallType.PUT, resource, data, params, headers, signed, api_variable_path, content_type)
+                          api_variable_path: str = None, content_type: ContentType = ContentType.JSON,
+                          timeout: aiohttp.ClientTimeout = None) -> dict:
+        return await self._create_rest_call(RestCallType.PUT, resource, data, params, headers, signed, api_variable_path, content_type, timeout)
 
     async def _create_rest_call(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signed: bool = False,
-                                api_variable_path: str = None, content_type: ContentType = ContentType.JSON) -> dict:
+                                api_variable_path: str = None, content_type: ContentType = ContentType.JSON,
+                                timeout: aiohttp.ClientTimeout = None) -> dict:
+        if not self.rest_call_coalescing or rest_call_type != RestCallType.GET or signed:
+            return await self._send_rest_call(rest_call_type, resource, data, params, headers, signed,
+                                              api_variable_path, content_type, timeout)
+
+        key = (resource, api_variable_path,
+               tuple(sorted((k, str(v)) for k, v in params.items())) if params is not None else None,
+               tuple(sorted(headers.items())) if headers is not None else None)
+
+        rest_call = self.in_flight_rest_calls.get(key)
+        if rest_call is not None:
+            self.coalesced_rest_call_count += 1
+            LOG.debug("Coalescing REST call [%s] with an in-flight call.", resource)
+        else:
+            # the call runs as a separate task so that cancellation of the first caller does not affect the others
+            rest_call = async_create_task(self._send_rest_call(rest_call_type, resource, data, params, headers, signed,
+                                                               api_variable_path, content_type, timeout))
+            self.in_flight_rest_calls[key] = rest_call
+            rest_call.add_done_callback(lambda _: self.in_flight_rest_calls.pop(key, None))
+
+        return await asyncio.shield(rest_call)
+
+    async def _send_rest_call(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signed: bool = False,
+                              api_variable_path: str = None, content_type: ContentType = ContentType.JSON,
+                              timeout: aiohttp.ClientTimeout = None, rest_api_uri: str = None,
+                              rate_limited: bool = True) -> dict:
         with Timer('RestCall'):
             # ensure headers & params are always valid objects
             if headers is None:
@@ -112,16 +345,31 @@ class CryptoXLibClient(ABC):
             if params is None:
                 params = {}
 
+            # rate limits are applied before signing so that the signature does not expire while waiting. Callers
+            # which acquired the limits themselves disable it
+            if rate_limited:
+                await self._acquire_rest_rate_limit(rest_call_type, resource, api_variable_path, params, data)
+
             # add signature into the parameters
             signature_data = {"signed": signed}
             if signed:
                 self._sign_payload(rest_call_type, resource, data, params, headers, signature_data)
 
-            resource_uri = self._get_rest_api_uri()
+            # the call can be sent to an alternative endpoint of the exchange, e.g. a different API cluster
+            resource_uri = rest_api_uri if rest_api_uri is not None else self._get_rest_api_uri()
             if api_variable_path is not None:
                 resource_uri += api_variable_path
             resource_uri += resource
 
+            # a query string built by the signer is sent as is so that it is neither re-encoded nor re-ordered
+            request_params = params
+            query_string = signature_data.get("query_string")
+            if query_string is not None:
+                if len(query_string) > 0:
+                    resource_uri += ('&' if '?' in resource_uri else '?') + query_string
+                resource_uri = yarl.URL(resource_uri, encoded = True)
+                request_params = None
+
             json_payload = None
             data_payload = None
             if data is not None:
@@ -132,34 +380,51 @@ class CryptoXLibClient(ABC):
                 else:
                     data_payload = data
 
+            # timeouts of the connection pool apply unless overridden for the call or the client
+            request_kwargs = {}
+            if timeout is None:
+                timeout = self.rest_timeout
+            if timeout is not None:
+                request_kwargs['timeout'] = timeout
+
             if rest_call_type == RestCallType.GET:
-                rest_call = self._get_rest_session().get(resource_uri, json = json_payload, data = data_payload, params = params, headers = headers, ssl = self.ssl_context)
+                rest_call = self._get_rest_session().get(resource_uri, json = json_payload, data = data_payload, params = request_params, headers = headers, ssl = self.ssl_context, **request_kwargs)
             elif rest_call_type == RestCallType.POST:
-                rest_call = self._get_rest_session().post(resource_uri, json = json_payload, data = data_payload, params = params, headers = headers, skip_auto_headers = ["Content-Type"], ssl = self.ssl_context)
+                rest_call = self._get_rest_session().post(resource_uri, json = json_payload, data = data_payload, params = request_params, headers = headers, skip_auto_headers = ["Content-Type"], ssl = self.ssl_context, **request_kwargs)
             elif rest_call_type == RestCallType.DELETE:
-                rest_call = self._get_rest_session().delete(resource_uri, json = json_payload, data = data_payload, params = params, headers = headers, ssl = self.ssl_context)
+                rest_call = self._get_rest_session().delete(resource_uri, json = json_payload, data = data_payload, params = request_params, headers = headers, ssl = self.ssl_context, **request_kwargs)
             elif rest_call_type == RestCallType.PUT:
-                rest_call = self._get_rest_session().put(resource_uri, json = json_payload, data = data_payload, params = params, headers = headers, ssl = self.ssl_context)
+                rest_call = self._get_rest_session().put(resource_uri, json = json_payload, data = data_payload, params = request_params, headers = headers, ssl = self.ssl_context, **request_kwargs)
             else:
                 raise Exception(f"Unsupported REST call type {rest_call_type}.")
 
-            LOG.debug(f"> rest type [{rest_call_type.name}], uri [{resource_uri}], params [{params}], headers [{headers}], data [{data}]")
+            if LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug(f"> rest type [{rest_call_type.name}], uri [{resource_uri}], params [{params}], headers [{headers}], data [{data}]")
+            # headers are not traced as they typically carry credentials
+            if wire_trace.tracer.enabled:
+                wire_trace.tracer.trace(wire_trace.OUTBOUND, "rest", (rest_call_type.name, resource_uri, params, data))
+
             async with rest_call as response:
                 status_code = response.status
                 headers = response.headers
-                body = await response.text()
+                # raw bytes are passed directly to the JSON decoder to avoid an intermediate string
+                raw_body = await response.read()
 
-                LOG.debug(f"<: status [{status_code}], response [{body}]")
+                if LOG.isEnabledFor(logging.DEBUG):
+                    LOG.debug(f"<: status [{status_code}], response [{raw_body}]")
+                if wire_trace.tracer.enabled:
+                    wire_trace.tracer.trace(wire_trace.INBOUND, "rest", (status_code, raw_body))
 
-                if len(body) > 0:
-                    try:
-                        body = json.loads(body)
-                    except json.JSONDecodeError:
-                        body = {
-                            "raw": body
-                        }
+                body = LazyJson(raw_body, response.get_encoding())
+                # errors are rare and their bodies small, they are decoded so that exceptions carry plain objects
+                if self.rest_response_mode == RestResponseMode.DECODED or status_code // 100 != 2:
+                    body = body.get_value()
 
-                self._preprocess_rest_response(status_code, headers, body, signature_data)
+                try:
+                    self._preprocess_rest_response(status_code, headers, body, signature_data)
+                except Exception:
+                    wire_trace.tracer.dump(f"rest call {rest_call_type.name} {resource_uri} failed")
+                    raise
 
                 return {
                     "status_code": status_code,
@@ -168,18 +433,25 @@ class CryptoXLibClient(ABC):
                 }
 
     def _get_rest_session(self) -> aiohttp.ClientSession:
-        if self.rest_session is not None:
+        if self.rest_session is not None and not self.rest_session.closed:
             return self.rest_session
 
-        if self.api_trace_log:
-            trace_config = aiohttp.TraceConfig()
-            trace_config.on_request_start.append(CryptoXLibClient._on_request_start)
-            trace_config.on_request_end.append(CryptoXLibClient._on_request_end)
-            trace_configs = [trace_config]
-        else:
-            trace_configs = None
+        if self.http_connection_pool is None:
+            if self.api_trace_log:
+                trace_config = aiohttp.TraceConfig()
+                trace_config.on_request_start.append(CryptoXLibClient._on_request_start)
+                trace_config.on_request_end.append(CryptoXLibClient._on_request_end)
+                trace_configs = [trace_config]
+            else:
+                trace_configs = None
 
-        self.rest_session = aiohttp.ClientSession(trace_configs=trace_configs)
+            self.http_connection_pool = HttpConnectionPool(trace_configs = trace_configs)
+            self.http_connection_pool_owned = True
+        elif self.api_trace_log:
+            LOG.warning("API trace log is not supported for shared connection pools, "
+                        "use trace_configs of the connection pool instead.")
+
+        self.rest_session = self.http_connection_pool.get_session()
 
         return self.rest_session
 
@@ -202,14 +474,39 @@ class CryptoXLibClient(ABC):
         LOG.debug(f"< Context: {trace_config_ctx}")
         LOG.debug(f"< Params: {params}")
 
-    @staticmethod
-    def _get_current_timestamp_ms() -> int:
-        return int(datetime.datetime.now(tz = datetime.timezone.utc).timestamp() * 1000)
+    def _get_current_timestamp_ms(self) -> int:
+        return get_timestamp_ms(self.server_clock)
 
     @staticmethod
     def _get_unix_timestamp_ns() -> int:
         return int(time.time_ns() * 10**9)
 
+    def set_callback_dispatch_mode(self, callback_dispatch_mode: CallbackDispatchMode) -> None:
+        # applies to all subscriptions which do not define their own dispatch mode
+        self.callback_dispatch_mode = callback_dispatch_mode
+
+    def _apply_callback_dispatch_mode(self, subscriptions: List[Subscription]) -> None:
+        if self.callback_dispatch_mode is None:
+            return
+
+        for subscription in subscriptions:
+            if subscription.callback_dispatch_mode is None:
+                subscription.set_callback_dispatch_mode(self.callback_dispatch_mode)
+
+    def set_websocket_sharding_limits(self, websocket_sharding_limits: Optional[ShardingLimits]) -> None:
+        # overrides the default limits of the exchange
+        self.websocket_sharding_limits = websocket_sharding_limits
+
+    def get_websocket_sharding_limits(self) -> Optional[ShardingLimits]:
+        if self.websocket_sharding_limits is not None:
+            return self.websocket_sharding_limits
+
+        return self._get_websocket_sharding_limits()
+
+    def set_websocket_transport(self, websocket_transport: Optional[WebsocketTransport]) -> None:
+        # overrides the transport of the exchange for websockets started afterwards
+        self.websocket_transport = websocket_transport
+
     def compose_subscriptions(self, subscriptions: List[Subscription]) -> int:
         subscription_set = SubscriptionSet(subscriptions = subscriptions)
         self.subscription_sets[subscription_set.subscription_set_id] = subscription_set
@@ -217,19 +514,57 @@ class CryptoXLibClient(ABC):
         return subscription_set.subscription_set_id
 
     async def add_subscriptions(self, subscription_set_id: int, subscriptions: List[Subscription]) -> None:
-        await self.subscription_sets[subscription_set_id].websocket_mgr.subscribe(subscriptions)
+        self._check_no_process_pool()
+
+        subscription_set = self.subscription_sets[subscription_set_id]
+
+        self._apply_callback_dispatch_mode(subscriptions)
+        subscription_set.subscriptions = subscription_set.subscriptions + subscriptions
+
+        # websockets not started yet, the subscriptions will be sharded at startup
+        if len(subscription_set.websocket_mgrs) == 0:
+            return
+
+        sharding_limits = self.get_websocket_sharding_limits()
+        if sharding_limits is None:
+            await subscription_set.websocket_mgrs[0].subscribe(subscriptions)
+        else:
+            shards = SubscriptionSharder(sharding_limits).assign(
+                [websocket_mgr.subscriptions for websocket_mgr in subscription_set.websocket_mgrs], subscriptions)
+            for websocket_mgr, shard_subscriptions in zip(subscription_set.websocket_mgrs, shards):
+                if len(shard_subscriptions) > 0:
+                    await websocket_mgr.subscribe(shard_subscriptions)
 
     async def unsubscribe_subscriptions(self, subscriptions: List[Subscription]) -> None:
+        self._check_no_process_pool()
+
+        subscription_sets: Dict[int, List[Subscription]] = {}
         for subscription in subscriptions:
             subscription_found = False
             for id, subscription_set in self.subscription_sets.items():
                 if subscription_set.find_subscription(subscription) is not None:
                     subscription_found = True
-                    await subscription_set.websocket_mgr.unsubscribe(subscriptions)
+                    subscription_sets.setdefault(id, []).append(subscription)
 
             if not subscription_found:
                 raise CryptoXLibException(f"No active subscription {subscription.subscription_id} found.")
 
+        for id, set_subscriptions in subscription_sets.items():
+            subscription_set = self.subscription_sets[id]
+
+            # each websocket manager is sent only the subscriptions it is responsible for
+            websocket_mgr_subscriptions: Dict[int, List[Subscription]] = {}
+            for subscription in set_subscriptions:
+                websocket_mgr = subscription_set.find_websocket_mgr(subscription)
+                if websocket_mgr is not None:
+                    websocket_mgr_subscriptions.setdefault(websocket_mgr.id, []).append(subscription)
+
+            subscription_set.subscriptions = [s for s in subscription_set.subscriptions if s not in set_subscriptions]
+
+            for websocket_mgr in subscription_set.websocket_mgrs:
+                if websocket_mgr.id in websocket_mgr_subscriptions:
+                    await websocket_mgr.unsubscribe(websocket_mgr_subscriptions[websocket_mgr.id])
+
     async def unsubscribe_subscription_set(self, subscription_set_id: int) -> None:
         return await self.unsubscribe_subscriptions(self.subscription_sets[subscription_set_id].subscriptions)
 
@@ -237,18 +572,59 @@ class CryptoXLibClient(ABC):
         for id, _ in self.subscription_sets.items():
             await self.unsubscribe_subscription_set(id)
 
-    async def start_websockets(self, websocket_start_time_interval_ms: int = 0) -> None:
+    def _get_websocket_worker_client(self, subscriptions: List[Subscription]) -> 'CryptoXLibClient':
+        worker_client = copy.copy(self)
+        if not any(subscription.requires_authentication() for subscription in subscriptions):
+            for attribute in self.CREDENTIAL_ATTRIBUTES:
+                if hasattr(worker_client, attribute):
+                    setattr(worker_client, attribute, None)
+
+        return worker_client
+
+    def _check_no_process_pool(self) -> None:
+        if self.websocket_process_pool is not None:
+            raise CryptoXLibException("Subscriptions cannot be modified while processed in worker processes.")
+
+    def _shard_subscriptions(self, subscriptions: List[Subscription]) -> List[List[Subscription]]:
+        sharding_limits = self.get_websocket_sharding_limits()
+        if sharding_limits is None:
+            return [list(subscriptions)]
+
+        return SubscriptionSharder(sharding_limits).split(subscriptions)
+
+    def _create_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int) -> WebsocketMgr:
+        websocket_mgr = self._get_websocket_mgr(subscriptions, startup_delay_ms, self.ssl_context)
+
+        sharding_limits = self.get_websocket_sharding_limits()
+        if sharding_limits is not None:
+            websocket_mgr.max_subscription_messages_per_sec = sharding_limits.max_subscription_messages_per_sec
+
+        if self.websocket_transport is not None:
+            websocket_mgr.set_transport(self.websocket_transport)
+
+        return websocket_mgr
+
+    async def start_websockets(self, websocket_start_time_interval_ms: int = 0, worker_processes: int = 0) -> None:
         if len(self.subscription_sets) < 1:
             raise CryptoXLibException("ERROR: There are no subscriptions to be started.")
 
+        if worker_processes > 0:
+            await self._start_websockets_in_processes(websocket_start_time_interval_ms, worker_processes)
+            return
+
         tasks = []
         startup_delay_ms = 0
         for id, subscription_set in self.subscription_sets.items():
-            subscription_set.websocket_mgr = self._get_websocket_mgr(subscription_set.subscriptions, startup_delay_ms, self.ssl_context)
-            tasks.append(async_create_task(
-                subscription_set.websocket_mgr.run())
-            )
-            startup_delay_ms += websocket_start_time_interval_ms
+            self._apply_callback_dispatch_mode(subscription_set.subscriptions)
+
+            subscription_set.websocket_mgrs = []
+            for shard_subscriptions in self._shard_subscriptions(subscription_set.subscriptions):
+                websocket_mgr = self._create_websocket_mgr(shard_subscriptions, startup_delay_ms)
+                subscription_set.websocket_mgrs.append(websocket_mgr)
+                tasks.append(async_create_task(
+                    websocket_mgr.run())
+                )
+                startup_delay_ms += websocket_start_time_interval_ms
 
         done, pending = await asyncio.wait(tasks, return_when = asyncio.FIRST_EXCEPTION)
         for task in done:
@@ -266,6 +642,23 @@ class CryptoXLibClient(ABC):
                 LOG.info("All websocket managers shut down.")
                 raise
 
+    async def _start_websockets_in_processes(self, websocket_start_time_interval_ms: int, worker_processes: int) -> None:
+        # subscription sets are processed in worker processes and only callbacks run in this process
+        for id, subscription_set in self.subscription_sets.items():
+            self._apply_callback_dispatch_mode(subscription_set.subscriptions)
+
+        self.websocket_process_pool = WebsocketProcessPool(self, worker_processes)
+        try:
+            await self.websocket_process_pool.run(
+                [subscription_set.subscriptions for subscription_set in self.subscription_sets.values()],
+                websocket_start_time_interval_ms)
+        finally:
+            self.websocket_process_pool = None
+
     async def shutdown_websockets(self):
+        if self.websocket_process_pool is not None:
+            await self.websocket_process_pool.shutdown()
+
         for id, subscription_set in self.subscription_sets.items():
-            await subscription_set.websocket_mgr.shutdown()
+            for websocket_mgr in subscription_set.websocket_mgrs:
+                await websocket_mgr.shutdown()
@@ -0,0 +1,63 @@
+import logging
+from typing import List, Optional
+
+import aiohttp
+
+LOG = logging.getLogger(__name__)
+
+
+class HttpConnectionPool(object):
+    """
+    HTTP connection pool used for REST calls. A single pool can be shared by any number of clients (e.g. several
+    accounts or exchanges), in such case the pool has to be closed by its owner once all clients are closed.
+
+    - limit: max number of simultaneous connections, 0 for unlimited
+    - limit_per_host: max number of simultaneous connections to a single host, 0 for unlimited
+    - keepalive_timeout_sec: period for which an idle connection is kept open for reuse
+    - dns_cache_ttl_sec: period for which resolved addresses are cached, None to cache forever
+    - total_timeout_sec, connect_timeout_sec, read_timeout_sec: default timeouts of a single REST call
+    """
+    DEFAULT_LIMIT = 100
+    DEFAULT_KEEPALIVE_TIMEOUT_SEC = 60
+    DEFAULT_DNS_CACHE_TTL_SEC = 300
+    DEFAULT_TOTAL_TIMEOUT_SEC = 30
+    DEFAULT_CONNECT_TIMEOUT_SEC = 10
+
+    def __init__(self, limit: int = DEFAULT_LIMIT, limit_per_host: int = 0,
+                 keepalive_timeout_sec: float = DEFAULT_KEEPALIVE_TIMEOUT_SEC,
+                 dns_cache_ttl_sec: Optional[int] = DEFAULT_DNS_CACHE_TTL_SEC,
+                 total_timeout_sec: Optional[float] = DEFAULT_TOTAL_TIMEOUT_SEC,
+                 connect_timeout_sec: Optional[float] = DEFAULT_CONNECT_TIMEOUT_SEC,
+                 read_timeout_sec: Optional[float] = None,
+                 trace_configs: List[aiohttp.TraceConfig] = None) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout_sec = keepalive_timeout_sec
+        self.dns_cache_ttl_sec = dns_cache_ttl_sec
+        self.timeout = aiohttp.ClientTimeout(total = total_timeout_sec, sock_connect = connect_timeout_sec,
+                                             sock_read = read_timeout_sec)
+        self.trace_configs = trace_configs
+
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        # the session has to be created from within a running event loop, therefore it is created lazily
+        if self.session is None or self.session.closed:
+            # aiohttp itself disables Nagle's algorithm (TCP_NODELAY) on every connection it opens
+            connector = aiohttp.TCPConnector(limit = self.limit,
+                                             limit_per_host = self.limit_per_host,
+                                             keepalive_timeout = self.keepalive_timeout_sec,
+                                             use_dns_cache = True,
+                                             ttl_dns_cache = self.dns_cache_ttl_sec)
+            self.session = aiohttp.ClientSession(connector = connector, timeout = self.timeout,
+                                                 trace_configs = self.trace_configs)
+
+        return self.session
+
+    def is_open(self) -> bool:
+        return self.session is not None and not self.session.closed
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
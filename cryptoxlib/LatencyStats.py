@@ -0,0 +1,64 @@
+import bisect
+import math
+from collections import deque
+from typing import Deque, List, Optional, Sequence
+
+
+class LatencyStats(object):
+    """
+    Latency statistics over a rolling window of the most recent calls plus lifetime counters.
+    """
+    DEFAULT_WINDOW_SIZE = 200
+    # upper bounds of histogram buckets, the last bucket is unbounded
+    DEFAULT_HISTOGRAM_BOUNDS_SEC = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE) -> None:
+        self.latencies_sec: Deque[float] = deque(maxlen = window_size)
+        self.call_count = 0
+        self.error_count = 0
+
+    def record(self, latency_sec: float) -> None:
+        self.latencies_sec.append(latency_sec)
+        self.call_count += 1
+
+    def record_error(self) -> None:
+        self.call_count += 1
+        self.error_count += 1
+
+    def get_sample_count(self) -> int:
+        return len(self.latencies_sec)
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        if len(self.latencies_sec) == 0:
+            return None
+
+        # nearest-rank percentile
+        latencies_sec = sorted(self.latencies_sec)
+        rank = max(math.ceil(percentile / 100 * len(latencies_sec)), 1)
+
+        return latencies_sec[rank - 1]
+
+    def get_mean(self) -> Optional[float]:
+        if len(self.latencies_sec) == 0:
+            return None
+
+        return sum(self.latencies_sec) / len(self.latencies_sec)
+
+    def get_histogram(self, bounds_sec: Sequence[float] = DEFAULT_HISTOGRAM_BOUNDS_SEC) -> List[int]:
+        # number of latencies of the window per bucket (previous bound, bound], len(bounds_sec) + 1 buckets
+        counts = [0] * (len(bounds_sec) + 1)
+        for latency_sec in self.latencies_sec:
+            counts[bisect.bisect_left(bounds_sec, latency_sec)] += 1
+
+        return counts
+
+    def get_stats(self) -> dict:
+        return {
+            "call_count": self.call_count,
+            "error_count": self.error_count,
+            "sample_count": len(self.latencies_sec),
+            "mean_sec": self.get_mean(),
+            "p50_sec": self.get_percentile(50),
+            "p95_sec": self.get_percentile(95),
+            "p99_sec": self.get_percentile(99),
+        }
@@ -0,0 +1,82 @@
+from typing import Any, Pattern
+
+from cryptoxlib import json_codec
+
+_NOT_DECODED = object()
+
+
+class LazyJson(object):
+    """
+    JSON document kept as raw bytes and decoded on first access. The raw bytes are available via `raw` and can be
+    forwarded (e.g. to disk or another service) without decoding at all.
+
+    Item access, iteration, `in`, `len` and attributes of the decoded value (e.g. `items()`, `get(...)`) work the
+    same as on the decoded value, i.e. code expecting decoded responses does not need to change.
+    """
+    __slots__ = ('raw', 'encoding', 'value')
+
+    DEFAULT_PREFIX_SIZE = 256
+
+    def __init__(self, raw: bytes, encoding: str = 'utf-8') -> None:
+        self.raw = raw
+        self.encoding = encoding
+        self.value = _NOT_DECODED
+
+    def __getstate__(self):
+        return self.raw, self.encoding
+
+    def __setstate__(self, state):
+        self.raw, self.encoding = state
+        self.value = _NOT_DECODED
+
+    def is_decoded(self) -> bool:
+        return self.value is not _NOT_DECODED
+
+    def get_value(self) -> Any:
+        if self.value is _NOT_DECODED:
+            if len(self.raw) == 0:
+                self.value = ""
+            else:
+                try:
+                    self.value = json_codec.loads(self.raw)
+                except json_codec.JSONDecodeError:
+                    self.value = {
+                        "raw": self.raw.decode(self.encoding, errors = "replace")
+                    }
+
+        return self.value
+
+    def matches_prefix(self, pattern: Pattern[bytes], prefix_size: int = DEFAULT_PREFIX_SIZE) -> bool:
+        # cheap check of the beginning of the document without decoding it, e.g. for error flags
+        return pattern.search(self.raw, 0, prefix_size) is not None
+
+    def __getitem__(self, item):
+        return self.get_value()[item]
+
+    def __contains__(self, item) -> bool:
+        return item in self.get_value()
+
+    def __iter__(self):
+        return iter(self.get_value())
+
+    def __len__(self) -> int:
+        return len(self.get_value())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyJson):
+            other = other.get_value()
+
+        return self.get_value() == other
+
+    def __getattr__(self, name: str) -> Any:
+        # only attributes of the decoded value get here, the own ones are slots
+        if name.startswith('__') or name in LazyJson.__slots__:
+            raise AttributeError(name)
+
+        return getattr(self.get_value(), name)
+
+    def __str__(self) -> str:
+        return str(self.get_value())
+
+    def __repr__(self) -> str:
+        return repr(self.get_value())
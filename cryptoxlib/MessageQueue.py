@@ -0,0 +1,162 @@
+import asyncio
+import enum
+import logging
+from collections import deque, OrderedDict
+from typing import Any, Callable, Awaitable, Hashable, Optional
+
+from cryptoxlib.version_conversions import async_create_task
+from cryptoxlib.exceptions import CryptoXLibException
+
+LOG = logging.getLogger(__name__)
+
+
+class QueueOverflowPolicy(enum.Enum):
+    # producer waits until the consumer frees space in the queue
+    BLOCK = enum.auto()
+    # the oldest pending message is discarded to make space for the new one
+    DROP_OLDEST = enum.auto()
+    # the new message is discarded
+    DROP_NEWEST = enum.auto()
+    # a new message replaces the pending message with the same key, if the queue is full and the key is not pending
+    # yet, the oldest pending message is discarded
+    CONFLATE = enum.auto()
+
+
+class MessageQueue(object):
+    def __init__(self, max_size: int, overflow_policy: QueueOverflowPolicy = QueueOverflowPolicy.BLOCK,
+                 conflation_key: Callable[[Any], Hashable] = None) -> None:
+        if max_size < 1:
+            raise CryptoXLibException(f"Queue size [{max_size}] must be a positive number.")
+
+        if overflow_policy == QueueOverflowPolicy.CONFLATE and conflation_key is None:
+            raise CryptoXLibException("Conflating queue requires a conflation key.")
+
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.conflation_key = conflation_key
+
+        if overflow_policy == QueueOverflowPolicy.CONFLATE:
+            self.messages = OrderedDict()
+        else:
+            self.messages = deque()
+
+        self.dropped_count = 0
+        self.conflated_count = 0
+        self.max_depth = 0
+
+        self.worker: Optional[asyncio.Task] = None
+        self.worker_exception: Optional[BaseException] = None
+        self.stopped = False
+
+        # events are created only once the queue is started in order to bind them to the running loop
+        self.not_empty: Optional[asyncio.Event] = None
+        self.not_full: Optional[asyncio.Event] = None
+
+    def get_depth(self) -> int:
+        return len(self.messages)
+
+    def is_running(self) -> bool:
+        return self.worker is not None
+
+    def start(self, consumer: Callable[[Any], Awaitable[None]]) -> None:
+        if self.worker is not None:
+            raise CryptoXLibException("Message queue has been already started.")
+
+        self.worker_exception = None
+        self.stopped = False
+        self.not_empty = asyncio.Event()
+        self.not_full = asyncio.Event()
+        self.worker = async_create_task(self._consume(consumer))
+
+    async def stop(self) -> None:
+        if self.worker is None:
+            return
+
+        worker = self.worker
+        self.worker = None
+        # a producer blocked on a full queue would otherwise wait forever
+        self.stopped = True
+        self.not_full.set()
+
+        if not worker.done():
+            worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # the exception has been already recorded by the worker
+            pass
+
+        self.messages.clear()
+
+    async def put(self, message: Any) -> None:
+        self._check_worker()
+
+        if self.overflow_policy == QueueOverflowPolicy.CONFLATE:
+            key = self.conflation_key(message)
+            if key in self.messages:
+                # replace the pending message while keeping its position in the queue
+                self.messages[key] = message
+                self.conflated_count += 1
+                return
+
+            if len(self.messages) >= self.max_size:
+                self.messages.popitem(last = False)
+                self.dropped_count += 1
+
+            self.messages[key] = message
+        else:
+            if len(self.messages) >= self.max_size:
+                if self.overflow_policy == QueueOverflowPolicy.BLOCK:
+                    while len(self.messages) >= self.max_size:
+                        self.not_full.clear()
+                        await self.not_full.wait()
+                        self._check_worker()
+                        if self.stopped:
+                            # the queue has been stopped in the meantime, the message has nobody to be delivered to
+                            return
+                elif self.overflow_policy == QueueOverflowPolicy.DROP_OLDEST:
+                    self.messages.popleft()
+                    self.dropped_count += 1
+                else:
+                    self.dropped_count += 1
+                    return
+
+            self.messages.append(message)
+
+        if len(self.messages) > self.max_depth:
+            self.max_depth = len(self.messages)
+
+        self.not_empty.set()
+
+    def _check_worker(self) -> None:
+        # exceptions raised by the consumer are propagated to the producer to preserve the behaviour of
+        # a non-queued processing
+        if self.worker_exception is not None:
+            raise self.worker_exception
+
+    def _pop(self) -> Any:
+        if self.overflow_policy == QueueOverflowPolicy.CONFLATE:
+            return self.messages.popitem(last = False)[1]
+        else:
+            return self.messages.popleft()
+
+    async def _consume(self, consumer: Callable[[Any], Awaitable[None]]) -> None:
+        try:
+            while True:
+                while len(self.messages) == 0:
+                    self.not_empty.clear()
+                    await self.not_empty.wait()
+
+                message = self._pop()
+                self.not_full.set()
+
+                await consumer(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOG.error(f"Message queue consumer failed with exception [{e}].")
+            self.worker_exception = e
+            # wake up a blocked producer so that it can pick up the exception
+            self.not_full.set()
@@ -0,0 +1,154 @@
+import bisect
+import heapq
+from typing import List, Dict, Optional, Tuple
+
+# price level represented by the original price and quantity strings
+OrderBookLevel = Tuple[str, str]
+
+
+class OrderBookSide(object):
+    # the heap is rebuilt once it holds this many times more entries than there are levels
+    HEAP_COMPACTION_RATIO = 2
+    HEAP_COMPACTION_MIN_SIZE = 64
+    # the sorted top of the book is cached for this many times more levels than requested so that it does not have
+    # to be rebuilt after every removal of a top level
+    TOP_CACHE_RATIO = 2
+
+    def __init__(self, descending: bool) -> None:
+        self.descending = descending
+
+        # min-heap of sort keys with the best price on top, i.e. bid prices are negated. Removed levels are dropped
+        # from the heap lazily once they get on top
+        self.heap: List[float] = []
+        self.levels: Dict[float, OrderBookLevel] = {}
+
+        # sorted keys of the best levels (always a prefix of the whole sorted side) kept up to date by the updates.
+        # It is complete if it contains all levels, otherwise it holds at most top_capacity levels
+        self.top_keys: List[float] = []
+        self.top_capacity = 0
+        self.top_complete = True
+
+    def _get_key(self, price: str) -> float:
+        if self.descending:
+            return -float(price)
+        else:
+            return float(price)
+
+    def update(self, price: str, quantity: str) -> None:
+        key = self._get_key(price)
+
+        if float(quantity) == 0:
+            if self.levels.pop(key, None) is None:
+                return
+
+            top_keys = self.top_keys
+            if len(top_keys) > 0 and key <= top_keys[-1]:
+                del top_keys[bisect.bisect_left(top_keys, key)]
+
+            if len(self.heap) > OrderBookSide.HEAP_COMPACTION_RATIO * len(self.levels) + \
+                    OrderBookSide.HEAP_COMPACTION_MIN_SIZE:
+                self.heap = list(self.levels)
+                heapq.heapify(self.heap)
+        else:
+            if key not in self.levels:
+                heapq.heappush(self.heap, key)
+
+                # levels beyond the cached top are not known to follow right after it unless the cache is complete
+                top_keys = self.top_keys
+                if self.top_complete or (len(top_keys) > 0 and key < top_keys[-1]):
+                    bisect.insort(top_keys, key)
+                    if len(top_keys) > self.top_capacity:
+                        top_keys.pop()
+                        self.top_complete = False
+            self.levels[key] = (price, quantity)
+
+    def update_levels(self, levels: List[List[str]]) -> None:
+        for price, quantity in levels:
+            self.update(price, quantity)
+
+    def clear(self) -> None:
+        self.heap = []
+        self.levels = {}
+        self.top_keys = []
+        self.top_complete = True
+
+    def get_best(self) -> Optional[OrderBookLevel]:
+        heap = self.heap
+        while len(heap) > 0 and heap[0] not in self.levels:
+            heapq.heappop(heap)
+
+        if len(heap) == 0:
+            return None
+
+        return self.levels[heap[0]]
+
+    def get_top(self, depth: int) -> List[OrderBookLevel]:
+        # O(depth) from the cached top, the whole side is scanned only once the cache runs short of levels
+        if depth > len(self.top_keys) and not self.top_complete:
+            self.top_capacity = max(self.top_capacity, depth * OrderBookSide.TOP_CACHE_RATIO)
+            self.top_keys = heapq.nsmallest(self.top_capacity, self.levels)
+            self.top_complete = len(self.top_keys) == len(self.levels)
+
+        levels = self.levels
+        return [levels[key] for key in self.top_keys[:depth]]
+
+    def get_quantity(self, price: str) -> Optional[str]:
+        level = self.levels.get(self._get_key(price))
+        if level is None:
+            return None
+
+        return level[1]
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+
+class OrderBook(object):
+    def __init__(self, symbol: str = None) -> None:
+        self.symbol = symbol
+        self.last_update_id: Optional[int] = None
+
+        self.bids = OrderBookSide(descending = True)
+        self.asks = OrderBookSide(descending = False)
+
+    def load(self, bids: List[List[str]], asks: List[List[str]], last_update_id: int = None) -> None:
+        self.clear()
+        self.bids.update_levels(bids)
+        self.asks.update_levels(asks)
+        self.last_update_id = last_update_id
+
+    def update(self, bids: List[List[str]], asks: List[List[str]], last_update_id: int = None) -> None:
+        self.bids.update_levels(bids)
+        self.asks.update_levels(asks)
+        self.last_update_id = last_update_id
+
+    def clear(self) -> None:
+        self.bids.clear()
+        self.asks.clear()
+        self.last_update_id = None
+
+    def get_best_bid(self) -> Optional[OrderBookLevel]:
+        return self.bids.get_best()
+
+    def get_best_ask(self) -> Optional[OrderBookLevel]:
+        return self.asks.get_best()
+
+    def get_top_bids(self, depth: int) -> List[OrderBookLevel]:
+        return self.bids.get_top(depth)
+
+    def get_top_asks(self, depth: int) -> List[OrderBookLevel]:
+        return self.asks.get_top(depth)
+
+    def to_json(self, depth: int = None) -> dict:
+        return {
+            "symbol": self.symbol,
+            "lastUpdateId": self.last_update_id,
+            "bids": [list(level) for level in self.bids.get_top(depth if depth is not None else len(self.bids))],
+            "asks": [list(level) for level in self.asks.get_top(depth if depth is not None else len(self.asks))]
+        }
+
+    def __str__(self):
+        return f"OrderBook({self.symbol}, best bid {self.get_best_bid()}, best ask {self.get_best_ask()})"
+
+    def __repr__(self):
+        return self.__str__()
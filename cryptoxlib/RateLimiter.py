@@ -0,0 +1,150 @@
+import asyncio
+import enum
+import logging
+import time
+from typing import Callable, Dict, Hashable
+
+from cryptoxlib.exceptions import RateLimitException
+
+LOG = logging.getLogger(__name__)
+
+
+class RateLimitBehaviour(enum.Enum):
+    # requests wait until they fit into the limits
+    WAIT = enum.auto()
+    # requests which would exceed the limits are rejected immediately
+    FAIL_FAST = enum.auto()
+    # no client-side rate limiting
+    DISABLED = enum.auto()
+
+
+class RateLimitWindow(object):
+    """
+    Counter of a limit within a fixed time window. Windows are aligned to the wall clock, i.e. a 1 minute window
+    resets at the beginning of each minute, which corresponds to how exchanges report the usage.
+    """
+
+    def __init__(self, limit: int, interval_sec: float) -> None:
+        self.limit = limit
+        self.interval_sec = interval_sec
+
+        self.window_start = 0.0
+        self.used = 0
+
+    def _roll(self, now: float) -> None:
+        window_start = now - now % self.interval_sec
+        if window_start != self.window_start:
+            self.window_start = window_start
+            self.used = 0
+
+    def get_wait_time(self, cost: int, now: float) -> float:
+        self._roll(now)
+
+        if self.used + cost <= self.limit or cost > self.limit:
+            return 0.0
+
+        return self.window_start + self.interval_sec - now
+
+    def reserve(self, cost: int, now: float) -> None:
+        self._roll(now)
+        self.used += cost
+
+    def sync(self, used: int, now: float) -> None:
+        # usage reported by the exchange includes requests of other processes sharing the same IP/account but not
+        # requests still in flight, the higher of both values is kept
+        self._roll(now)
+        self.used = max(self.used, used)
+
+    def get_remaining(self, now: float = None) -> int:
+        self._roll(now if now is not None else time.time())
+
+        return max(self.limit - self.used, 0)
+
+
+class RateLimiter(object):
+    """
+    Tracks a set of named limit windows (e.g. request weight per minute, orders per 10 seconds). Requests declare
+    their cost per window and either wait until they fit into all windows or fail fast.
+    """
+
+    def __init__(self, windows: Dict[str, RateLimitWindow], behaviour: RateLimitBehaviour = RateLimitBehaviour.WAIT,
+                 max_wait_sec: float = None) -> None:
+        self.windows = windows
+        self.behaviour = behaviour
+        self.max_wait_sec = max_wait_sec
+
+        # set when the exchange explicitly requests to back off (e.g. HTTP 429 with Retry-After)
+        self.blocked_until = 0.0
+
+    def set_limit(self, name: str, limit: int, interval_sec: float) -> None:
+        window = self.windows.get(name)
+        if window is None or window.interval_sec != interval_sec:
+            self.windows[name] = RateLimitWindow(limit, interval_sec)
+        else:
+            window.limit = limit
+
+    def get_wait_time(self, costs: Dict[str, int], now: float) -> float:
+        wait_time = max(self.blocked_until - now, 0.0)
+        for name, cost in costs.items():
+            window = self.windows.get(name)
+            if window is not None and cost > 0:
+                wait_time = max(wait_time, window.get_wait_time(cost, now))
+
+        return wait_time
+
+    async def acquire(self, costs: Dict[str, int], behaviour: RateLimitBehaviour = None,
+                      max_wait_sec: float = None) -> None:
+        # limiters are typically shared by several clients, each of them can decide how to treat exhausted limits
+        if behaviour is None:
+            behaviour = self.behaviour
+        if max_wait_sec is None:
+            max_wait_sec = self.max_wait_sec
+
+        if behaviour == RateLimitBehaviour.DISABLED:
+            return
+
+        # checking and reserving the limits does not yield to the loop, i.e. it is atomic. Waiting requests do not
+        # hold up other ones, they sleep and re-check once the limits reset
+        start = time.time()
+        while True:
+            now = time.time()
+            wait_time = self.get_wait_time(costs, now)
+            if wait_time <= 0:
+                break
+
+            if behaviour == RateLimitBehaviour.FAIL_FAST or \
+                    (max_wait_sec is not None and now + wait_time - start > max_wait_sec):
+                raise RateLimitException(f"Request with cost {costs} would exceed rate limits, "
+                                         f"retry in {wait_time:.3f}s.", wait_time)
+
+            LOG.debug("Request with cost %s delayed by %.3fs due to rate limits.", costs, wait_time)
+            await asyncio.sleep(wait_time)
+
+        for name, cost in costs.items():
+            window = self.windows.get(name)
+            if window is not None:
+                window.reserve(cost, now)
+
+    def update(self, usage: Dict[str, int]) -> None:
+        now = time.time()
+        for name, used in usage.items():
+            window = self.windows.get(name)
+            if window is not None:
+                window.sync(used, now)
+
+    def block(self, period_sec: float) -> None:
+        LOG.warning(f"Rate limit exceeded, requests blocked for {period_sec}s.")
+        self.blocked_until = max(self.blocked_until, time.time() + period_sec)
+
+
+# limiters shared by all clients in the process, e.g. per IP address or per API key
+SHARED_RATE_LIMITERS: Dict[Hashable, RateLimiter] = {}
+
+
+def get_shared_rate_limiter(key: Hashable, factory: Callable[[], RateLimiter]) -> RateLimiter:
+    rate_limiter = SHARED_RATE_LIMITERS.get(key)
+    if rate_limiter is None:
+        rate_limiter = factory()
+        SHARED_RATE_LIMITERS[key] = rate_limiter
+
+    return rate_limiter
@@ -0,0 +1,58 @@
+import hmac
+import re
+from typing import Union
+from urllib.parse import urlencode
+
+# characters which are never percent-encoded, typical parameters (symbols, numbers, timestamps) consist only of these
+# (and of the separators)
+_is_unreserved = re.compile(r'[A-Za-z0-9_.~=&-]*').fullmatch
+
+
+class HmacSigner(object):
+    """
+    HMAC signer keyed with the secret only once. Every signature is calculated on a copy of the pre-keyed HMAC
+    context which saves encoding of the secret and the key schedule (inner and outer padding) on each request.
+
+    The signer can be transferred to other processes, the HMAC context is recreated from the secret.
+    """
+    def __init__(self, secret: Union[str, bytes], digest: str = 'sha256') -> None:
+        if isinstance(secret, str):
+            secret = secret.encode('utf-8')
+
+        self.secret = secret
+        self.digest = digest
+        self.hmac = hmac.new(self.secret, digestmod = self.digest)
+
+    def __getstate__(self):
+        return {'secret': self.secret, 'digest': self.digest}
+
+    def __setstate__(self, state):
+        self.__init__(state['secret'], state['digest'])
+
+    def sign(self, message: Union[str, bytes]) -> 'hmac.HMAC':
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+
+        m = self.hmac.copy()
+        m.update(message)
+
+        return m
+
+    def hexdigest(self, message: Union[str, bytes]) -> str:
+        return self.sign(message).hexdigest()
+
+
+def get_query_string(params: dict, sort: bool = False) -> str:
+    """
+    Builds a url-encoded query string equal to urlencode(params). The string is signed and sent as is, see
+    CryptoXLibClient._send_rest_call(...).
+    """
+    items = sorted(params.items()) if sort else params.items()
+
+    # fast path, nothing to encode unless the separators appear in the keys or values
+    query_string = '&'.join([f"{key}={val}" for key, val in items])
+    if (_is_unreserved(query_string) is not None and query_string.count('=') == len(params)
+            and query_string.count('&') == max(len(params) - 1, 0)):
+        return query_string
+
+    return urlencode(list(items))
@@ -0,0 +1,162 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from cryptoxlib.version_conversions import async_create_task
+
+LOG = logging.getLogger(__name__)
+
+
+class RestCacheEntry(object):
+    def __init__(self, value: Any, ttl_sec: float) -> None:
+        self.value = value
+        self.expires_at = time.monotonic() + ttl_sec
+
+
+class RestCache(object):
+    """
+    LRU cache of responses of reference-data REST endpoints (exchange info, instruments, currencies, ...). Endpoints
+    opt in via the @cached(ttl_sec = ...) decorator.
+
+    - max_size: max number of cached responses, the least recently used ones are evicted first
+    - stale_ttl_sec: period after expiration during which the stale response is still returned while it is being
+      refreshed in the background, None for no limit, 0 to always wait for the fresh response
+    - ttl_overrides: TTL per endpoint (method name) overriding the one declared by the endpoint
+    """
+    DEFAULT_MAX_SIZE = 256
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, stale_ttl_sec: Optional[float] = None,
+                 ttl_overrides: Dict[str, float] = None) -> None:
+        self.max_size = max_size
+        self.stale_ttl_sec = stale_ttl_sec
+        self.ttl_overrides = ttl_overrides if ttl_overrides is not None else {}
+
+        self.entries: 'OrderedDict[Hashable, RestCacheEntry]' = OrderedDict()
+        self.refresh_tasks: Dict[Hashable, asyncio.Task] = {}
+        # responses fetched before an invalidation must not be stored
+        self.generation = 0
+
+        self.hit_count = 0
+        self.stale_hit_count = 0
+        self.miss_count = 0
+
+    async def get(self, key: tuple, ttl_sec: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        # key[0] is the name of the endpoint
+        ttl_sec = self.ttl_overrides.get(key[0], ttl_sec)
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry.expires_at:
+                self.entries.move_to_end(key)
+                self.hit_count += 1
+                return entry.value
+
+            if self.stale_ttl_sec is None or now < entry.expires_at + self.stale_ttl_sec:
+                self.entries.move_to_end(key)
+                self.stale_hit_count += 1
+                self._refresh(key, ttl_sec, fetch, background = True)
+                return entry.value
+
+        self.miss_count += 1
+
+        # concurrent misses wait for the same fetch
+        return await asyncio.shield(self._refresh(key, ttl_sec, fetch, background = False))
+
+    def invalidate(self, endpoint: str = None) -> None:
+        """
+        Drops cached responses of the endpoint (method name) or the whole cache if no endpoint is provided.
+        """
+        self.generation += 1
+
+        if endpoint is None:
+            self.entries.clear()
+        else:
+            for key in [key for key in self.entries if key[0] == endpoint]:
+                del self.entries[key]
+
+    def get_stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "hits": self.hit_count,
+            "stale_hits": self.stale_hit_count,
+            "misses": self.miss_count
+        }
+
+    async def close(self) -> None:
+        for task in list(self.refresh_tasks.values()):
+            task.cancel()
+        self.refresh_tasks.clear()
+
+    def _refresh(self, key: tuple, ttl_sec: float, fetch: Callable[[], Awaitable[Any]],
+                 background: bool) -> asyncio.Task:
+        task = self.refresh_tasks.get(key)
+        if task is None:
+            task = async_create_task(self._fetch(key, ttl_sec, fetch, self.generation))
+            self.refresh_tasks[key] = task
+            task.add_done_callback(functools.partial(self._on_refresh_done, key, background))
+
+        return task
+
+    async def _fetch(self, key: tuple, ttl_sec: float, fetch: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        value = await fetch()
+
+        if generation == self.generation:
+            self.entries[key] = RestCacheEntry(value, ttl_sec)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last = False)
+
+        return value
+
+    def _on_refresh_done(self, key: tuple, background: bool, task: asyncio.Task) -> None:
+        if self.refresh_tasks.get(key) is task:
+            del self.refresh_tasks[key]
+
+        if task.cancelled():
+            return
+
+        # failures of background refreshes are not propagated, the stale response is kept. Failures of foreground
+        # fetches are raised to the callers
+        exception = task.exception()
+        if exception is not None and background:
+            LOG.warning(f"Refresh of cached REST response [{key[0]}] failed: {exception}")
+
+
+def cached(ttl_sec: float):
+    """
+    Marks a REST endpoint of a client as cacheable. Responses are cached only if the client has the cache enabled,
+    see CryptoXLibClient.enable_rest_cache(...). Cached responses are shared by all callers and must not be modified.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if self.rest_cache is None:
+                return await method(self, *args, **kwargs)
+
+            # arguments are normalized so that positional, keyword and default arguments result in the same key
+            bound_arguments = signature.bind(self, *args, **kwargs)
+            bound_arguments.apply_defaults()
+            arguments = [(name, sorted(value.items())
+                          if signature.parameters[name].kind == inspect.Parameter.VAR_KEYWORD else value)
+                         for name, value in list(bound_arguments.arguments.items())[1:]]
+
+            key = (method.__name__, repr(arguments))
+            return await self.rest_cache.get(key, ttl_sec, lambda: method(self, *args, **kwargs))
+
+        wrapper.rest_cache_ttl_sec = ttl_sec
+
+        return wrapper
+
+    return decorator
+
+
+def get_cached_endpoints(client_class: type) -> List[str]:
+    return [name for name in dir(client_class)
+            if getattr(getattr(client_class, name, None), 'rest_cache_ttl_sec', None) is not None]
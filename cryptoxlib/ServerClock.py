@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import math
+import statistics
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional
+
+from cryptoxlib.version_conversions import async_create_task
+
+LOG = logging.getLogger(__name__)
+
+
+class ClockSample(object):
+    def __init__(self, offset_ns: int, rtt_ns: int) -> None:
+        # offset of the server time from the monotonic clock
+        self.offset_ns = offset_ns
+        self.rtt_ns = rtt_ns
+
+
+class ServerClock(object):
+    """
+    Clock following the time of an exchange. The offset of the server time is estimated from the midpoint of the
+    round trip of time requests, the sample with the lowest round trip time wins as it carries the lowest uncertainty.
+    Timestamps are derived from the monotonic clock, i.e. they are not affected by adjustments of the local clock
+    between synchronizations, and never go backwards even if a synchronization moves the offset back.
+
+    - fetch_server_timestamp_ms: returns the current server time in ms, typically the time endpoint of the exchange
+    """
+    DEFAULT_SYNC_INTERVAL_SEC = 60
+    DEFAULT_SAMPLE_COUNT = 5
+    # number of samples used to estimate the jitter
+    MAX_SAMPLES = 50
+
+    def __init__(self, fetch_server_timestamp_ms: Callable[[], Awaitable[int]],
+                 sync_interval_sec: float = DEFAULT_SYNC_INTERVAL_SEC,
+                 sample_count: int = DEFAULT_SAMPLE_COUNT) -> None:
+        self.fetch_server_timestamp_ms = fetch_server_timestamp_ms
+        self.sync_interval_sec = sync_interval_sec
+        self.sample_count = sample_count
+
+        # local wall clock until the first synchronization
+        self.offset_ns = time.time_ns() - time.monotonic_ns()
+        self.best_sample: Optional[ClockSample] = None
+        self.samples: Deque[ClockSample] = deque(maxlen = ServerClock.MAX_SAMPLES)
+        self.sync_task: Optional[asyncio.Task] = None
+        self.last_timestamp_ms = 0
+
+    def __getstate__(self):
+        # copies in other processes keep the last offset but are not synchronized anymore
+        state = self.__dict__.copy()
+        state['fetch_server_timestamp_ms'] = None
+        state['sync_task'] = None
+
+        return state
+
+    def get_timestamp_ms(self) -> int:
+        # timestamps stall rather than step back when the offset decreases, e.g. nonces have to be increasing
+        timestamp_ms = (time.monotonic_ns() + self.offset_ns) // 1_000_000
+        if timestamp_ms < self.last_timestamp_ms:
+            return self.last_timestamp_ms
+
+        self.last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+
+    def get_offset_ms(self) -> float:
+        # positive if the server time is ahead of the local wall clock
+        return (self.offset_ns - (time.time_ns() - time.monotonic_ns())) / 1e6
+
+    def is_synchronized(self) -> bool:
+        return self.best_sample is not None
+
+    async def sample(self) -> ClockSample:
+        start_ns = time.monotonic_ns()
+        server_timestamp_ms = await self.fetch_server_timestamp_ms()
+        end_ns = time.monotonic_ns()
+
+        # the server time is assumed to correspond to the middle of the round trip
+        sample = ClockSample(offset_ns = server_timestamp_ms * 1_000_000 - (start_ns + end_ns) // 2,
+                             rtt_ns = end_ns - start_ns)
+        self.samples.append(sample)
+
+        return sample
+
+    async def sync(self) -> None:
+        best_sample = None
+        for _ in range(self.sample_count):
+            sample = await self.sample()
+            if best_sample is None or sample.rtt_ns < best_sample.rtt_ns:
+                best_sample = sample
+
+        self.best_sample = best_sample
+        self.offset_ns = best_sample.offset_ns
+
+        LOG.debug(f"Server clock synchronized, offset [{self.get_offset_ms():.3f} ms], "
+                  f"rtt [{best_sample.rtt_ns / 1e6:.3f} ms].")
+
+    def get_jitter_ms(self) -> Optional[float]:
+        if len(self.samples) < 2:
+            return None
+
+        return statistics.pstdev([sample.rtt_ns for sample in self.samples]) / 1e6
+
+    def get_recommended_recv_window_ms(self, safety_factor: float = 2.0, min_recv_window_ms: int = 100,
+                                       max_recv_window_ms: int = 60000) -> Optional[int]:
+        """
+        Suggests a receive window (e.g. binance's recvWindow) a request is very likely to fit in. A request is
+        late by the error of the offset (at most half of the round trip of the best sample) plus its own travel
+        time (half of the round trip, taken as the worst observed one plus 3 standard deviations).
+        """
+        if self.best_sample is None:
+            return None
+
+        max_rtt_ms = max(sample.rtt_ns for sample in self.samples) / 1e6
+        jitter_ms = self.get_jitter_ms() or 0.0
+        recv_window_ms = (self.best_sample.rtt_ns / 1e6 + max_rtt_ms + 6 * jitter_ms) / 2 * safety_factor
+
+        return int(min(max(math.ceil(recv_window_ms), min_recv_window_ms), max_recv_window_ms))
+
+    def start(self) -> None:
+        if self.sync_task is None:
+            self.sync_task = async_create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.sync_task is not None:
+            self.sync_task.cancel()
+            try:
+                await self.sync_task
+            except asyncio.CancelledError:
+                pass
+            self.sync_task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval_sec)
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # the last offset remains in use
+                LOG.warning(f"Server clock synchronization failed: {e}")
+
+
+def get_local_timestamp_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def get_timestamp_ms(server_clock: Optional[ServerClock] = None) -> int:
+    if server_clock is not None:
+        return server_clock.get_timestamp_ms()
+
+    return get_local_timestamp_ms()
@@ -0,0 +1,152 @@
+import ctypes
+import multiprocessing
+import struct
+from typing import Optional
+
+from cryptoxlib.exceptions import CryptoXLibException
+
+
+class SharedRingBuffer(object):
+    """
+    Single-producer single-consumer ring buffer of variable-length records placed in shared memory. Read and write
+    positions are monotonically increasing byte counters, each of them is modified by one side only. Positions are
+    published and picked up under a shared lock which orders the accesses to the records across processes. Each side
+    keeps its own copy of the position of the other side and refreshes it only when the copy indicates the buffer
+    is full (writer) or empty (reader).
+
+    The consumer can sleep until a record arrives, see prepare_wait(...). The producer then rings a doorbell (a pipe)
+    whose file descriptor can be watched by an event loop.
+
+    The buffer has to be handed over to the other process when the process is being spawned.
+    """
+    RECORD_HEADER = struct.Struct("<I")
+    # marks the end of the data in case the next record does not fit to the end of the buffer
+    WRAP_MARKER = 0xFFFFFFFF
+
+    def __init__(self, capacity: int, mp_context = None) -> None:
+        if mp_context is None:
+            mp_context = multiprocessing
+
+        self.capacity = capacity
+
+        self.buffer = mp_context.RawArray(ctypes.c_ubyte, capacity)
+        self.write_position = mp_context.RawValue(ctypes.c_uint64, 0)
+        self.read_position = mp_context.RawValue(ctypes.c_uint64, 0)
+        # set by the consumer before it goes to sleep waiting for new records
+        self.reader_waiting = mp_context.RawValue(ctypes.c_uint8, 0)
+        self.lock = mp_context.Lock()
+        self.doorbell_reader, self.doorbell_writer = mp_context.Pipe(duplex = False)
+
+        # last known positions of the other side, local to each process
+        self.known_read_position = 0
+        self.known_write_position = 0
+
+        self.view: Optional[memoryview] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['view'] = None
+        return state
+
+    def _get_view(self) -> memoryview:
+        if self.view is None:
+            self.view = memoryview(self.buffer).cast('B')
+
+        return self.view
+
+    def is_empty(self) -> bool:
+        with self.lock:
+            return self.read_position.value == self.write_position.value
+
+    def prepare_wait(self) -> bool:
+        """
+        Called by the consumer before it goes to sleep. Returns False if records are available, otherwise the next
+        write rings the doorbell.
+        """
+        with self.lock:
+            if self.read_position.value != self.write_position.value:
+                return False
+
+            self.reader_waiting.value = 1
+            return True
+
+    def get_doorbell_fileno(self) -> int:
+        return self.doorbell_reader.fileno()
+
+    def clear_doorbell(self) -> None:
+        while self.doorbell_reader.poll():
+            self.doorbell_reader.recv_bytes()
+
+    def write(self, payload: bytes) -> bool:
+        """
+        Returns False if there is not enough free space in the buffer at the moment.
+        """
+        header_size = SharedRingBuffer.RECORD_HEADER.size
+        record_size = header_size + len(payload)
+        if record_size > self.capacity:
+            raise CryptoXLibException(f"Record of size {record_size}B exceeds capacity of the ring buffer "
+                                      f"[{self.capacity}B].")
+
+        view = self._get_view()
+        write_position = self.write_position.value
+        offset = write_position % self.capacity
+
+        # records are never split, the rest of the buffer is skipped if the record does not fit
+        tail_size = self.capacity - offset
+        padding = tail_size if tail_size < record_size else 0
+
+        if write_position + padding + record_size - self.known_read_position > self.capacity:
+            with self.lock:
+                self.known_read_position = self.read_position.value
+            if write_position + padding + record_size - self.known_read_position > self.capacity:
+                return False
+
+        if padding > 0:
+            if tail_size >= header_size:
+                SharedRingBuffer.RECORD_HEADER.pack_into(view, offset, SharedRingBuffer.WRAP_MARKER)
+            write_position += padding
+            offset = 0
+
+        SharedRingBuffer.RECORD_HEADER.pack_into(view, offset, len(payload))
+        view[offset + header_size:offset + record_size] = payload
+
+        # publish the record only once it is completely written
+        with self.lock:
+            self.write_position.value = write_position + record_size
+            wake_reader = self.reader_waiting.value
+            self.reader_waiting.value = 0
+
+        if wake_reader:
+            self.doorbell_writer.send_bytes(b"\0")
+
+        return True
+
+    def read(self) -> Optional[bytes]:
+        """
+        Returns None if there is no record available.
+        """
+        read_position = self.read_position.value
+        if read_position == self.known_write_position:
+            with self.lock:
+                self.known_write_position = self.write_position.value
+            if read_position == self.known_write_position:
+                return None
+
+        header_size = SharedRingBuffer.RECORD_HEADER.size
+        view = self._get_view()
+        offset = read_position % self.capacity
+
+        tail_size = self.capacity - offset
+        if tail_size < header_size or \
+                SharedRingBuffer.RECORD_HEADER.unpack_from(view, offset)[0] == SharedRingBuffer.WRAP_MARKER:
+            read_position += tail_size
+            offset = 0
+
+        payload_size = SharedRingBuffer.RECORD_HEADER.unpack_from(view, offset)[0]
+        payload = bytes(view[offset + header_size:offset + header_size + payload_size])
+
+        # release the space only once the record has been copied out
+        with self.lock:
+            self.read_position.value = read_position + header_size + payload_size
+
+        return payload
@@ -0,0 +1,70 @@
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from cryptoxlib.version_conversions import async_create_task
+from cryptoxlib.exceptions import CryptoXLibException
+
+LOG = logging.getLogger(__name__)
+
+
+class ThrottledCallback(object):
+    """
+    Wraps a websocket callback and limits the rate at which it is invoked. Messages arriving faster than
+    the allowed rate are conflated per key and only the latest one is delivered once the interval elapses.
+    """
+
+    def __init__(self, callback: Callable[..., Any], max_rate_per_sec: float,
+                 key: Callable[[dict], Hashable] = None) -> None:
+        if max_rate_per_sec <= 0:
+            raise CryptoXLibException(f"Max rate [{max_rate_per_sec}] must be a positive number.")
+
+        self.callback = callback
+        self.min_interval_sec = 1.0 / max_rate_per_sec
+        self.key = key
+
+        self.last_call_tmstmp: Dict[Hashable, float] = {}
+        self.pending_args: Dict[Hashable, Tuple] = {}
+        self.flush_tasks: Set[asyncio.Task] = set()
+
+        self.throttled_count = 0
+
+    def __call__(self, *args) -> Any:
+        key = self.key(args[0]) if self.key is not None else None
+
+        now = time.monotonic()
+        elapsed = now - self.last_call_tmstmp.get(key, float("-inf"))
+        if elapsed >= self.min_interval_sec and key not in self.pending_args:
+            self.last_call_tmstmp[key] = now
+            return self.callback(*args)
+
+        # keep only the latest message and deliver it at the end of the current interval
+        if key in self.pending_args:
+            self.throttled_count += 1
+        else:
+            task = async_create_task(self._flush(key, self.min_interval_sec - elapsed))
+            self.flush_tasks.add(task)
+            task.add_done_callback(self.flush_tasks.discard)
+        self.pending_args[key] = args
+
+        return None
+
+    async def _flush(self, key: Optional[Hashable], delay_sec: float) -> None:
+        await asyncio.sleep(delay_sec)
+
+        args = self.pending_args.pop(key)
+        self.last_call_tmstmp[key] = time.monotonic()
+        try:
+            result = self.callback(*args)
+            if result is not None and inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            LOG.error(f"Throttled callback failed with exception [{e}].")
+
+    def cancel(self) -> None:
+        for task in list(self.flush_tasks):
+            task.cancel()
+
+        self.pending_args.clear()
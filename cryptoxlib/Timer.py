@@ -17,5 +17,6 @@ class Timer(object):
             self.start_tmstmp_ms = get_current_time_ms()
 
     def __exit__(self, type, value, traceback) -> None:
-        if self.active:
-            LOG.debug(f'Timer {self.name} finished. Took {round((get_current_time_ms() - self.start_tmstmp_ms), 3)} ms.')
\ No newline at end of file
+        if self.active and LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug('Timer %s finished. Took %s ms.', self.name,
+                      round((get_current_time_ms() - self.start_tmstmp_ms), 3))
\ No newline at end of file
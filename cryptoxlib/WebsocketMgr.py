@@ -1,14 +1,22 @@
 import websockets
-import json
 import logging
 import asyncio
+import contextlib
+import copy
 import ssl
 import aiohttp
 import enum
+import inspect
+import time
 from abc import ABC, abstractmethod
-from typing import List, Callable, Any, Optional, Union
+from typing import List, Callable, Any, Optional, Union, Dict, Hashable
 
+from cryptoxlib import json_codec
+from cryptoxlib import wire_trace
+from cryptoxlib import websocket_protocol
 from cryptoxlib.version_conversions import async_create_task
+from cryptoxlib.MessageQueue import MessageQueue, QueueOverflowPolicy
+from cryptoxlib.WebsocketRequestTracker import WebsocketRequestTracker
 from cryptoxlib.exceptions import CryptoXLibException, WebsocketReconnectionException, WebsocketClosed, WebsocketError
 
 LOG = logging.getLogger(__name__)
@@ -22,9 +30,40 @@ class WebsocketMgrMode(enum.Enum):
     CLOSING = enum.auto()
 
 
+class WebsocketTransport(enum.Enum):
+    # websockets library
+    FULL = enum.auto()
+    # aiohttp websocket client
+    AIOHTTP = enum.auto()
+    # lightweight client implemented directly over an asyncio protocol, see cryptoxlib.websocket_protocol
+    FAST = enum.auto()
+
+
+class CallbackDispatchMode(enum.Enum):
+    # callbacks are awaited one after another in the order of registration, no tasks are created
+    SEQUENTIAL = enum.auto()
+    # each callback is wrapped into a separate task and all of them are awaited together
+    CONCURRENT = enum.auto()
+
+
 class Websocket(ABC):
     def __init__(self):
-        pass
+        # identifies the websocket in wire traces
+        self.trace_id = None
+        # outbound frames are not wire traced while they carry credentials, see redacted_trace()
+        self.redact_outbound = False
+
+    @contextlib.contextmanager
+    def redacted_trace(self, redact: bool = True):
+        self.redact_outbound = redact
+        try:
+            yield
+        finally:
+            self.redact_outbound = False
+
+    def _trace_outbound(self, message: str) -> None:
+        wire_trace.tracer.trace(wire_trace.OUTBOUND, self.trace_id,
+                                wire_trace.REDACTED if self.redact_outbound else message)
 
     @abstractmethod
     async def connect(self):
@@ -83,12 +122,19 @@ class FullWebsocket(Websocket):
         if self.ws is None:
             raise CryptoXLibException("Websocket attempted to read data while connection not open.")
 
-        return await self.ws.recv()
+        message = await self.ws.recv()
+        if wire_trace.tracer.enabled:
+            wire_trace.tracer.trace(wire_trace.INBOUND, self.trace_id, message)
+
+        return message
 
     async def send(self, message: str):
         if self.ws is None:
             raise CryptoXLibException("Websocket attempted to send data while connection not open.")
 
+        if wire_trace.tracer.enabled:
+            self._trace_outbound(message)
+
         return await self.ws.send(message)
 
 
@@ -137,6 +183,8 @@ class AiohttpWebsocket(Websocket):
             if message.data == 'close cmd':
                 raise WebsocketClosed(f'Websocket was closed: {message.data}')
             else:
+                if wire_trace.tracer.enabled:
+                    wire_trace.tracer.trace(wire_trace.INBOUND, self.trace_id, message.data)
                 return message.data
         elif message.type == aiohttp.WSMsgType.CLOSED:
             raise WebsocketClosed(f'Websocket was closed: {message.data}')
@@ -147,31 +195,113 @@ class AiohttpWebsocket(Websocket):
         if self.ws is None:
             raise CryptoXLibException("Websocket attempted to send data while connection not open.")
 
+        if wire_trace.tracer.enabled:
+            self._trace_outbound(message)
+
         return await self.ws.send_str(message)
 
 
+class FastWebsocket(Websocket):
+    def __init__(self, websocket_uri: str, builtin_ping_interval: Optional[float] = 20,
+                 max_message_size: int = 2 ** 20, ssl_context: ssl.SSLContext = None):
+        super().__init__()
+
+        self.websocket_uri = websocket_uri
+        self.builtin_ping_interval = builtin_ping_interval
+        self.max_message_size = max_message_size
+        self.ssl_context = ssl_context
+
+        self.ws = None
+
+    async def connect(self):
+        if self.ws is not None:
+            raise CryptoXLibException("Websocket reattempted to make connection while previous one is still active.")
+
+        LOG.debug(f"Connecting to websocket {self.websocket_uri}")
+        self.ws = await websocket_protocol.connect(self.websocket_uri,
+                                                   ssl_context = self.ssl_context,
+                                                   max_message_size = self.max_message_size,
+                                                   ping_interval = self.builtin_ping_interval)
+
+    async def is_open(self):
+        return self.ws is not None
+
+    async def close(self):
+        if self.ws is None:
+            raise CryptoXLibException("Websocket attempted to close connection while connection not open.")
+
+        await self.ws.close()
+        self.ws = None
+
+    async def receive(self):
+        if self.ws is None:
+            raise CryptoXLibException("Websocket attempted to read data while connection not open.")
+
+        message = await self.ws.receive()
+        if wire_trace.tracer.enabled:
+            wire_trace.tracer.trace(wire_trace.INBOUND, self.trace_id, message)
+
+        return message
+
+    async def send(self, message: str):
+        if self.ws is None:
+            raise CryptoXLibException("Websocket attempted to send data while connection not open.")
+
+        if wire_trace.tracer.enabled:
+            self._trace_outbound(message)
+
+        return await self.ws.send(message)
+
+
 class WebsocketOutboundMessage(ABC):
     @abstractmethod
     def to_json(self):
         pass
 
+    def get_request_id(self) -> Optional[Hashable]:
+        # id under which the answer to the message is correlated, None if the answer cannot be correlated. Called
+        # after to_json() so that messages may generate a new id every time they are sent
+        return None
+
 
 class ClientWebsocketHandle(object):
-    def __init__(self, websocket: Websocket):
+    def __init__(self, websocket: Websocket, request_tracker: WebsocketRequestTracker = None):
         self.websocket = websocket
-
-    async def send(self, message: Union[str, dict, WebsocketOutboundMessage]):
+        self.request_tracker = request_tracker
+
+    async def send(self, message: Union[str, dict, WebsocketOutboundMessage],
+                   timeout_sec: float = None) -> Optional[asyncio.Future]:
+        """
+        Sends the message. If the websocket correlates answers of the message (e.g. order entry), a future resolved
+        with the acknowledgement is returned, otherwise None.
+        """
+        request_id = None
         if isinstance(message, str):
             pass
         elif isinstance(message, dict):
-            message = json.dumps(message)
+            message = json_codec.dumps(message)
         elif isinstance(message, WebsocketOutboundMessage):
-            message = json.dumps(message.to_json())
+            payload = message.to_json()
+            if self.request_tracker is not None:
+                request_id = message.get_request_id()
+            message = json_codec.dumps(payload)
         else:
             raise CryptoXLibException("Only string or JSON serializable objects can be sent over the websocket.")
 
-        LOG.debug(f"> {message}")
-        return await self.websocket.send(message)
+        LOG.debug("> %s", message)
+        if request_id is None:
+            await self.websocket.send(message)
+            return None
+
+        # registered before sending, the answer may arrive before send returns
+        future = self.request_tracker.register(request_id, timeout_sec)
+        try:
+            await self.websocket.send(message)
+        except BaseException:
+            self.request_tracker.unregister(request_id)
+            raise
+
+        return future
 
     async def receive(self):
         return await self.websocket.receive()
@@ -186,9 +316,14 @@ class WebsocketMessage(object):
 
 class Subscription(ABC):
     INTERNAL_SUBSCRIPTION_ID_SEQ = 0
+    DEFAULT_CALLBACK_DISPATCH_MODE = CallbackDispatchMode.SEQUENTIAL
+    # conflating queue holds at most one message per key, the size needs to cover all keys of the subscription
+    DEFAULT_CONFLATION_QUEUE_SIZE = 10000
 
     def __init__(self, callbacks: CallbacksType = None):
         self.callbacks = callbacks
+        self.callback_dispatch_mode: Optional[CallbackDispatchMode] = None
+        self.message_queue: Optional[MessageQueue] = None
 
         self.subscription_id = None
         self.internal_subscription_id = Subscription.INTERNAL_SUBSCRIPTION_ID_SEQ
@@ -218,27 +353,176 @@ class Subscription(ABC):
     async def initialize(self, **kwargs) -> None:
         pass
 
+    def detach(self) -> 'Subscription':
+        # copy of the subscription to be processed in another process, callbacks stay in this process. Nothing bound
+        # to this instance may leak into the copy, otherwise pickling the copy drags along this instance as well
+        subscription = copy.copy(self)
+        subscription.callbacks = None
+
+        if self.message_queue is not None:
+            conflation_key = self.message_queue.conflation_key
+            if getattr(conflation_key, '__self__', None) is self:
+                conflation_key = getattr(subscription, conflation_key.__name__)
+            subscription.message_queue = MessageQueue(self.message_queue.max_size, self.message_queue.overflow_policy,
+                                                      conflation_key)
+
+        return subscription
+
+    def requires_authentication(self) -> bool:
+        return False
+
+    def get_expected_message_rate(self) -> float:
+        # rough estimate of messages per second used to balance subscriptions across websocket connections
+        return 1.0
+
+    def get_websocket_uri_length(self) -> int:
+        # length the subscription contributes to the websocket URI (for exchanges passing subscriptions in the URI)
+        return 0
+
+    def set_message_queue(self, max_size: int, overflow_policy: QueueOverflowPolicy = QueueOverflowPolicy.BLOCK,
+                          conflation_key: Callable[[WebsocketMessage], Hashable] = None) -> None:
+        # messages are handed over to a bounded queue and processed by a dedicated worker so that slow callbacks
+        # do not hold up reading from the websocket
+        self.message_queue = MessageQueue(max_size, overflow_policy, conflation_key)
+
+    def set_conflation(self, max_size: int = DEFAULT_CONFLATION_QUEUE_SIZE) -> None:
+        # only the latest pending message per conflation key is delivered to the callbacks
+        self.set_message_queue(max_size, QueueOverflowPolicy.CONFLATE, self.get_conflation_key)
+
+    def get_conflation_key(self, message: WebsocketMessage) -> Hashable:
+        return self.internal_subscription_id
+
+    def get_queue_depth(self) -> int:
+        if self.message_queue is None:
+            return 0
+
+        return self.message_queue.get_depth()
+
+    def get_queue_dropped_count(self) -> int:
+        if self.message_queue is None:
+            return 0
+
+        return self.message_queue.dropped_count
+
+    async def dispatch_message(self, message: WebsocketMessage) -> None:
+        if self.message_queue is None:
+            await self.process_message(message)
+        else:
+            if not self.message_queue.is_running():
+                self.message_queue.start(self.process_message)
+            await self.message_queue.put(message)
+
+    async def close(self) -> None:
+        if self.message_queue is not None:
+            await self.message_queue.stop()
+
     async def process_message(self, message: WebsocketMessage) -> None:
         await self.process_callbacks(message)
 
+    def set_callback_dispatch_mode(self, callback_dispatch_mode: CallbackDispatchMode) -> None:
+        self.callback_dispatch_mode = callback_dispatch_mode
+
+    def get_callback_dispatch_mode(self) -> CallbackDispatchMode:
+        if self.callback_dispatch_mode is not None:
+            return self.callback_dispatch_mode
+
+        return Subscription.DEFAULT_CALLBACK_DISPATCH_MODE
+
     async def process_callbacks(self, message: WebsocketMessage) -> None:
-        if self.callbacks is not None:
-            tasks = []
-            for cb in self.callbacks:
-                # If message contains a websocket, then the websocket handle will be passed to the callbacks.
-                # This is useful for duplex websockets
-                if message.websocket is not None:
-                    tasks.append(async_create_task(cb(message.message, message.websocket)))
-                else:
-                    tasks.append(async_create_task(cb(message.message)))
-            await asyncio.gather(*tasks)
+        if self.callbacks is None:
+            return
+
+        if self.get_callback_dispatch_mode() == CallbackDispatchMode.CONCURRENT:
+            await self._process_callbacks_concurrently(message)
+        else:
+            await self._process_callbacks_sequentially(message)
+
+    def _call_callback(self, cb: Callable[..., Any], message: WebsocketMessage) -> Any:
+        # If message contains a websocket, then the websocket handle will be passed to the callbacks.
+        # This is useful for duplex websockets
+        if message.websocket is not None:
+            return cb(message.message, message.websocket)
+        else:
+            return cb(message.message)
+
+    async def _process_callbacks_sequentially(self, message: WebsocketMessage) -> None:
+        for cb in self.callbacks:
+            # synchronous callbacks are fully processed by the call itself
+            result = self._call_callback(cb, message)
+            if result is not None and inspect.isawaitable(result):
+                await result
+
+    async def _process_callbacks_concurrently(self, message: WebsocketMessage) -> None:
+        tasks = []
+        for cb in self.callbacks:
+            result = self._call_callback(cb, message)
+            if result is not None and inspect.isawaitable(result):
+                tasks.append(async_create_task(result))
+        await asyncio.gather(*tasks)
 
     def __eq__(self, other):
         return self.internal_subscription_id == other.internal_subscription_id
 
 
+class SubscriptionRegistry(object):
+    def __init__(self) -> None:
+        self.subscriptions_by_key: Dict[Hashable, List[Subscription]] = {}
+        self.keys_by_internal_id: Dict[int, Hashable] = {}
+
+    @staticmethod
+    def make_key(subscription_id: Any) -> Hashable:
+        # subscription ids are not required to be hashable (e.g. bitforex uses dictionaries), convert them
+        # into an equivalent immutable structure
+        if isinstance(subscription_id, dict):
+            return frozenset((key, SubscriptionRegistry.make_key(value)) for key, value in subscription_id.items())
+        elif isinstance(subscription_id, list):
+            return tuple(SubscriptionRegistry.make_key(value) for value in subscription_id)
+        else:
+            return subscription_id
+
+    def register(self, subscriptions: List[Subscription]) -> None:
+        for subscription in subscriptions:
+            if subscription.internal_subscription_id in self.keys_by_internal_id:
+                continue
+
+            key = SubscriptionRegistry.make_key(subscription.get_subscription_id())
+            self.subscriptions_by_key.setdefault(key, []).append(subscription)
+            self.keys_by_internal_id[subscription.internal_subscription_id] = key
+
+    def unregister(self, subscriptions: List[Subscription]) -> None:
+        for subscription in subscriptions:
+            key = self.keys_by_internal_id.pop(subscription.internal_subscription_id, None)
+            if key is None:
+                continue
+
+            remaining = [s for s in self.subscriptions_by_key[key]
+                         if s.internal_subscription_id != subscription.internal_subscription_id]
+            if len(remaining) > 0:
+                self.subscriptions_by_key[key] = remaining
+            else:
+                del self.subscriptions_by_key[key]
+
+    def rebuild(self, subscriptions: List[Subscription]) -> None:
+        self.clear()
+        self.register(subscriptions)
+
+    def clear(self) -> None:
+        self.subscriptions_by_key = {}
+        self.keys_by_internal_id = {}
+
+    def find(self, subscription_id: Any) -> Optional[Subscription]:
+        subscriptions = self.subscriptions_by_key.get(SubscriptionRegistry.make_key(subscription_id))
+        if subscriptions is None:
+            return None
+
+        # in case of several subscriptions sharing the same id, the first registered one takes precedence
+        return subscriptions[0]
+
+
 class WebsocketMgr(ABC):
     WEBSOCKET_MGR_ID_SEQ = 0
+    # transport used by all websocket managers unless set per manager, None for the default of each exchange
+    DEFAULT_TRANSPORT: Optional[WebsocketTransport] = None
 
     def __init__(self, websocket_uri: str, subscriptions: List[Subscription], builtin_ping_interval: Optional[float] = 20,
                  max_message_size: int = 2**20, periodic_timeout_sec: int = None, ssl_context = None,
@@ -252,12 +536,26 @@ class WebsocketMgr(ABC):
         self.auto_reconnect = auto_reconnect
         self.startup_delay_ms = startup_delay_ms
 
+        # limit of (un)subscription messages imposed by the exchange, None if unlimited
+        self.max_subscription_messages_per_sec: Optional[float] = None
+        self.next_subscription_message_tmstmp = 0.0
+
         self.id = WebsocketMgr.WEBSOCKET_MGR_ID_SEQ
         WebsocketMgr.WEBSOCKET_MGR_ID_SEQ += 1
 
         self.websocket = None
         self.mode: WebsocketMgrMode = WebsocketMgrMode.STOPPED
 
+        # correlation of answers to requests sent via client websocket handles, set by websockets supporting it
+        self.request_tracker: Optional[WebsocketRequestTracker] = None
+
+        # overrides the transport of the exchange, see set_transport(...)
+        self.transport: Optional[WebsocketTransport] = None
+
+        # subscription ids can be constructed only once subscriptions are initialized, therefore the registry
+        # is populated at startup (see run method)
+        self.subscription_registry = SubscriptionRegistry()
+
     @abstractmethod
     async def _process_message(self, websocket: Websocket, response: str) -> None:
         pass
@@ -271,6 +569,24 @@ class WebsocketMgr(ABC):
     def get_websocket(self) -> Websocket:
         return self.get_full_websocket()
 
+    def set_transport(self, transport: Optional[WebsocketTransport]) -> None:
+        self.transport = transport
+
+    @staticmethod
+    def set_default_transport(transport: Optional[WebsocketTransport]) -> None:
+        WebsocketMgr.DEFAULT_TRANSPORT = transport
+
+    def _create_websocket(self) -> Websocket:
+        transport = self.transport if self.transport is not None else WebsocketMgr.DEFAULT_TRANSPORT
+        if transport == WebsocketTransport.FULL:
+            return self.get_full_websocket()
+        elif transport == WebsocketTransport.AIOHTTP:
+            return self.get_aiohttp_websocket()
+        elif transport == WebsocketTransport.FAST:
+            return self.get_fast_websocket()
+        else:
+            return self.get_websocket()
+
     def get_full_websocket(self) -> Websocket:
         uri = self.websocket_uri + self.get_websocket_uri_variable_part()
         LOG.debug(f"Websocket URI: {uri}")
@@ -289,6 +605,18 @@ class WebsocketMgr(ABC):
                       max_message_size = self.max_message_size,
                       ssl_context = self.ssl_context)
 
+    def get_fast_websocket(self) -> Websocket:
+        uri = self.websocket_uri + self.get_websocket_uri_variable_part()
+        LOG.debug(f"Websocket URI: {uri}")
+
+        return FastWebsocket(websocket_uri = uri,
+                      builtin_ping_interval = self.builtin_ping_interval,
+                      max_message_size = self.max_message_size,
+                      ssl_context = self.ssl_context)
+
+    def get_client_websocket_handle(self, websocket: Websocket) -> ClientWebsocketHandle:
+        return ClientWebsocketHandle(websocket = websocket, request_tracker = self.request_tracker)
+
     async def validate_subscriptions(self, subscriptions: List[Subscription]) -> None:
         pass
 
@@ -301,19 +629,36 @@ class WebsocketMgr(ABC):
         await self.initialize_subscriptions(new_subscriptions)
 
         self.subscriptions += new_subscriptions
+        self.subscription_registry.register(new_subscriptions)
 
+        await self.throttle_subscription_message()
         await self.send_subscription_message(new_subscriptions)
 
+    async def throttle_subscription_message(self) -> None:
+        if self.max_subscription_messages_per_sec is None:
+            return
+
+        # every message reserves its own time slot so that concurrent callers are spread out as well
+        now = time.monotonic()
+        slot_tmstmp = max(now, self.next_subscription_message_tmstmp)
+        self.next_subscription_message_tmstmp = slot_tmstmp + 1.0 / self.max_subscription_messages_per_sec
+
+        if slot_tmstmp > now:
+            await asyncio.sleep(slot_tmstmp - now)
+
     async def send_subscription_message(self, subscriptions: List[Subscription]):
         subscription_messages = []
         for subscription in subscriptions:
             subscription_messages.append(subscription.get_subscription_message())
 
-        LOG.debug(f"> {subscription_messages}")
-        await self.websocket.send(json.dumps(subscription_messages))
+        LOG.debug("> %s", subscription_messages)
+        await self.websocket.send(json_codec.dumps(subscription_messages))
 
     async def unsubscribe(self, subscriptions: List[Subscription]):
         self.subscriptions = [subscription for subscription in self.subscriptions if subscription not in subscriptions]
+        self.subscription_registry.unregister(subscriptions)
+        await self.close_subscriptions(subscriptions)
+        await self.throttle_subscription_message()
         await self.send_unsubscription_message(subscriptions)
 
     async def send_unsubscription_message(self, subscriptions: List[Subscription]):
@@ -322,8 +667,15 @@ class WebsocketMgr(ABC):
     async def unsubscribe_all(self):
         subscriptions = self.subscriptions
         self.subscriptions = []
+        self.subscription_registry.clear()
+        await self.close_subscriptions(subscriptions)
+        await self.throttle_subscription_message()
         await self.send_unsubscription_message(subscriptions)
 
+    async def close_subscriptions(self, subscriptions: List[Subscription]) -> None:
+        for subscription in subscriptions:
+            await subscription.close()
+
     async def send_authentication_message(self):
         pass
 
@@ -337,13 +689,17 @@ class WebsocketMgr(ABC):
             await self.websocket.connect()
 
     async def main_loop(self):
-        await self.send_authentication_message()
+        with self.websocket.redacted_trace():
+            await self.send_authentication_message()
+        await self.throttle_subscription_message()
         await self.send_subscription_message(self.subscriptions)
 
         # start processing incoming messages
         while True:
             message = await self.websocket.receive()
-            LOG.debug(f"< {message}")
+            # avoid formatting of every received message unless debug logging is enabled
+            if LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug(f"< {message}")
 
             await self._process_message(self.websocket, message)
 
@@ -358,6 +714,7 @@ class WebsocketMgr(ABC):
 
         await self.validate_subscriptions(self.subscriptions)
         await self.initialize_subscriptions(self.subscriptions)
+        self.subscription_registry.rebuild(self.subscriptions)
 
         try:
             # main loop ensuring proper reconnection if required
@@ -370,7 +727,8 @@ class WebsocketMgr(ABC):
                         await asyncio.sleep(self.startup_delay_ms / 1000.0)
                         LOG.debug(f"[{self.id}] Websocket initiation delayed by {self.startup_delay_ms}ms.")
 
-                        self.websocket = self.get_websocket()
+                        self.websocket = self._create_websocket()
+                        self.websocket.trace_id = self.id
                         await self.websocket.connect()
 
                         done, pending = await asyncio.wait(
@@ -418,18 +776,26 @@ class WebsocketMgr(ABC):
                         if await self.websocket.is_open():
                             LOG.debug(f"[{self.id}] Closing websocket connection.")
                             await self.websocket.close()
+
+                    # answers of requests sent over the closed connection will not arrive
+                    if self.request_tracker is not None and self.request_tracker.has_pending_requests():
+                        self.request_tracker.fail_all(WebsocketClosed("Websocket was closed before the request "
+                                                                      "was answered."))
         except asyncio.CancelledError:
             LOG.warning(f"[{self.id}] The websocket was requested to be cancelled.")
         except Exception as e:
             LOG.error(f"[{self.id}] An exception [{e}] occurred. The websocket manager will be closed.")
             self._print_subscriptions()
+            wire_trace.tracer.dump(f"websocket manager [{self.id}] failed")
             raise
+        finally:
+            await self.close_subscriptions(self.subscriptions)
 
     async def publish_message(self, message: WebsocketMessage) -> None:
-        for subscription in self.subscriptions:
-            if subscription.get_subscription_id() == message.subscription_id:
-                await subscription.process_message(message)
-                return
+        subscription = self.subscription_registry.find(message.subscription_id)
+        if subscription is not None:
+            await subscription.dispatch_message(message)
+            return
 
         LOG.warning(f"[{self.id}] Websocket message with subscription id {message.subscription_id} did not identify any subscription!")
 
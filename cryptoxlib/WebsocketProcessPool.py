@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import multiprocessing
+import pickle
+from typing import Any, Dict, List, Optional
+
+from cryptoxlib.SharedRingBuffer import SharedRingBuffer
+from cryptoxlib.WebsocketMgr import Subscription, WebsocketMessage, ClientWebsocketHandle
+from cryptoxlib.exceptions import CryptoXLibException
+from cryptoxlib.version_conversions import async_run, async_create_task
+
+LOG = logging.getLogger(__name__)
+
+# record types exchanged between a worker and the parent process
+RECORD_MESSAGE = 0
+RECORD_ERROR = 1
+
+
+class UnavailableWebsocketHandle(ClientWebsocketHandle):
+    """
+    Passed to callbacks of duplex subscriptions processed in a worker process. The websocket lives in the worker
+    process and therefore cannot be used to send messages from the parent process.
+    """
+
+    def __init__(self):
+        super().__init__(websocket = None)
+
+    async def send(self, message):
+        raise CryptoXLibException("Websocket handle is not available for subscriptions processed in worker processes.")
+
+    async def receive(self):
+        raise CryptoXLibException("Websocket handle is not available for subscriptions processed in worker processes.")
+
+
+class WorkerMessageForwarder(object):
+    # pause between attempts to write into a full ring buffer
+    FULL_BUFFER_BACKOFF_SEC = 0.001
+
+    def __init__(self, ring_buffer: SharedRingBuffer) -> None:
+        self.ring_buffer = ring_buffer
+
+    def get_callback(self, internal_subscription_id: int):
+        def forward(message: Any, websocket: ClientWebsocketHandle = None):
+            return self.forward(RECORD_MESSAGE, internal_subscription_id, message, websocket is not None)
+
+        return forward
+
+    def forward(self, record_type: int, internal_subscription_id: Optional[int], message: Any,
+                has_websocket: bool = False):
+        payload = pickle.dumps((record_type, internal_subscription_id, message, has_websocket),
+                               protocol = pickle.HIGHEST_PROTOCOL)
+
+        if self.ring_buffer.write(payload):
+            return None
+
+        # the parent process does not keep up, hold up the websocket until there is space in the buffer
+        return self._forward_when_free(payload)
+
+    async def _forward_when_free(self, payload: bytes) -> None:
+        while not self.ring_buffer.write(payload):
+            await asyncio.sleep(WorkerMessageForwarder.FULL_BUFFER_BACKOFF_SEC)
+
+
+def run_worker(client, subscriptions: List[List[Subscription]], ring_buffer: SharedRingBuffer, stop_event,
+               websocket_start_time_interval_ms: int) -> None:
+    async_run(_run_worker(client, subscriptions, ring_buffer, stop_event, websocket_start_time_interval_ms))
+
+
+async def _run_worker(client, subscriptions: List[List[Subscription]], ring_buffer: SharedRingBuffer, stop_event,
+                      websocket_start_time_interval_ms: int) -> None:
+    forwarder = WorkerMessageForwarder(ring_buffer)
+
+    for set_subscriptions in subscriptions:
+        for subscription in set_subscriptions:
+            subscription.callbacks = [forwarder.get_callback(subscription.internal_subscription_id)]
+        client.compose_subscriptions(set_subscriptions)
+
+    loop = asyncio.get_event_loop()
+    websockets_task = async_create_task(client.start_websockets(websocket_start_time_interval_ms))
+    stop_task = loop.run_in_executor(None, stop_event.wait)
+
+    try:
+        done, pending = await asyncio.wait([websockets_task, stop_task], return_when = asyncio.FIRST_COMPLETED)
+        if websockets_task in done:
+            websockets_task.result()
+        else:
+            await client.shutdown_websockets()
+            await websockets_task
+    except Exception as e:
+        result = forwarder.forward(RECORD_ERROR, None, f"{type(e).__name__}: {e}")
+        if result is not None:
+            await result
+    finally:
+        # release the thread waiting for the stop event
+        stop_event.set()
+        await client.close()
+
+
+class WebsocketWorker(object):
+    def __init__(self, id: int, subscriptions: List[List[Subscription]], ring_buffer_size: int, mp_context) -> None:
+        self.id = id
+        self.subscriptions = subscriptions
+
+        self.ring_buffer = SharedRingBuffer(ring_buffer_size, mp_context)
+        self.stop_event = mp_context.Event()
+        self.process = None
+
+
+class WebsocketProcessPool(object):
+    """
+    Runs subscription sets in worker processes. Each worker takes care of the websocket transport, message decoding
+    and processing by the subscriptions, the results are handed over to the callbacks in the parent process
+    through a shared memory ring buffer.
+    """
+    DEFAULT_RING_BUFFER_SIZE = 2**24
+    # max period after which a dead worker is detected even if no messages arrive
+    LIVENESS_CHECK_INTERVAL_SEC = 1
+    # used on event loops which do not support watching file descriptors
+    POLL_INTERVAL_SEC = 0.001
+    # time given to a worker to stop gracefully before it is terminated
+    STOP_TIMEOUT_SEC = 5
+
+    def __init__(self, client, process_count: int, ring_buffer_size: int = DEFAULT_RING_BUFFER_SIZE) -> None:
+        if process_count < 1:
+            raise CryptoXLibException(f"Number of worker processes [{process_count}] must be a positive number.")
+
+        self.client = client
+        self.process_count = process_count
+        self.ring_buffer_size = ring_buffer_size
+
+        self.workers: List[WebsocketWorker] = []
+        self.subscriptions: Dict[int, Subscription] = {}
+        self.closing = False
+        self.fd_watching_supported = True
+
+    async def run(self, subscriptions: List[List[Subscription]], websocket_start_time_interval_ms: int = 0) -> None:
+        # worker processes are spawned rather than forked in order not to inherit the running event loop
+        mp_context = multiprocessing.get_context("spawn")
+
+        # subscription sets are distributed evenly among the workers
+        worker_subscriptions = [[] for _ in range(min(self.process_count, len(subscriptions)))]
+        for i, set_subscriptions in enumerate(subscriptions):
+            worker_subscriptions[i % len(worker_subscriptions)].append(set_subscriptions)
+
+        for set_subscriptions in subscriptions:
+            for subscription in set_subscriptions:
+                self.subscriptions[subscription.internal_subscription_id] = subscription
+
+        for id, worker_sets in enumerate(worker_subscriptions):
+            worker = WebsocketWorker(id, worker_sets, self.ring_buffer_size, mp_context)
+            worker.process = mp_context.Process(
+                target = run_worker,
+                args = (self.client._get_websocket_worker_client([s for set_subscriptions in worker_sets
+                                                                  for s in set_subscriptions]),
+                        [[s.detach() for s in set_subscriptions]
+                         for set_subscriptions in worker_sets],
+                        worker.ring_buffer, worker.stop_event, websocket_start_time_interval_ms),
+                name = f"cryptoxlib-websocket-worker-{id}",
+                daemon = True)
+            worker.process.start()
+            LOG.info(f"Websocket worker [{id}] started with pid {worker.process.pid}.")
+            self.workers.append(worker)
+
+        tasks = [async_create_task(self._consume(worker)) for worker in self.workers]
+        try:
+            done, pending = await asyncio.wait(tasks, return_when = asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        except Exception as e:
+            LOG.error(f"Unrecoverable exception occurred while processing messages from worker processes: {e}")
+            await self.shutdown()
+            raise
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await self._stop_workers()
+
+    async def shutdown(self) -> None:
+        self.closing = True
+        for worker in self.workers:
+            worker.stop_event.set()
+
+    async def _stop_workers(self) -> None:
+        loop = asyncio.get_event_loop()
+        for worker in self.workers:
+            worker.stop_event.set()
+
+        for worker in self.workers:
+            await loop.run_in_executor(None, worker.process.join, WebsocketProcessPool.STOP_TIMEOUT_SEC)
+            if worker.process.is_alive():
+                LOG.warning(f"Websocket worker [{worker.id}] did not stop in time and is being terminated.")
+                worker.process.terminate()
+                await loop.run_in_executor(None, worker.process.join)
+
+    async def _consume(self, worker: WebsocketWorker) -> None:
+        while True:
+            payload = worker.ring_buffer.read()
+            if payload is None:
+                if not worker.process.is_alive():
+                    # pick up records written right before the worker exited
+                    if not worker.ring_buffer.is_empty():
+                        continue
+
+                    if self.closing or worker.stop_event.is_set():
+                        LOG.info(f"Websocket worker [{worker.id}] stopped.")
+                        return
+
+                    raise CryptoXLibException(f"Websocket worker [{worker.id}] exited unexpectedly with exit code "
+                                              f"{worker.process.exitcode}.")
+
+                await self._wait_for_records(worker)
+                continue
+
+            record_type, internal_subscription_id, message, has_websocket = pickle.loads(payload)
+            if record_type == RECORD_ERROR:
+                raise CryptoXLibException(f"Websocket worker [{worker.id}] failed with exception [{message}].")
+
+            subscription = self.subscriptions[internal_subscription_id]
+            await subscription.process_callbacks(WebsocketMessage(
+                subscription_id = subscription.subscription_id,
+                message = message,
+                websocket = UnavailableWebsocketHandle() if has_websocket else None))
+
+    async def _wait_for_records(self, worker: WebsocketWorker) -> None:
+        ring_buffer = worker.ring_buffer
+
+        if not ring_buffer.prepare_wait():
+            return
+
+        if self.fd_watching_supported:
+            loop = asyncio.get_event_loop()
+            doorbell_rung = loop.create_future()
+            try:
+                loop.add_reader(ring_buffer.get_doorbell_fileno(),
+                                lambda: doorbell_rung.done() or doorbell_rung.set_result(None))
+            except NotImplementedError:
+                self.fd_watching_supported = False
+            else:
+                try:
+                    await asyncio.wait_for(doorbell_rung, timeout = WebsocketProcessPool.LIVENESS_CHECK_INTERVAL_SEC)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    loop.remove_reader(ring_buffer.get_doorbell_fileno())
+
+                ring_buffer.clear_doorbell()
+                return
+
+        await asyncio.sleep(WebsocketProcessPool.POLL_INTERVAL_SEC)
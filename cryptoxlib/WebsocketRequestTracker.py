@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Hashable, List, Optional, Sequence
+
+from cryptoxlib.LatencyStats import LatencyStats
+from cryptoxlib.exceptions import CryptoXLibException, WebsocketRequestRejected, WebsocketRequestTimeout
+
+LOG = logging.getLogger(__name__)
+
+
+class PendingRequest(object):
+    def __init__(self, future: asyncio.Future, sent_tmstmp: float, timeout_handle: asyncio.TimerHandle) -> None:
+        self.future = future
+        self.sent_tmstmp = sent_tmstmp
+        self.timeout_handle = timeout_handle
+
+
+class WebsocketRequestTracker(object):
+    """
+    Correlates requests sent over a websocket (e.g. order entry) with their acknowledgements. Each request is
+    represented by a future resolved with the acknowledgement, failed with WebsocketRequestRejected if the request is
+    rejected or with WebsocketRequestTimeout if no answer arrives in time. Latencies between sending a request and
+    receiving its answer are recorded.
+    """
+    DEFAULT_TIMEOUT_SEC = 10
+
+    def __init__(self, timeout_sec: float = DEFAULT_TIMEOUT_SEC,
+                 latency_window_size: int = LatencyStats.DEFAULT_WINDOW_SIZE) -> None:
+        self.timeout_sec = timeout_sec
+
+        self.pending_requests: Dict[Hashable, PendingRequest] = {}
+        self.latency_stats = LatencyStats(latency_window_size)
+        self.reject_count = 0
+        self.timeout_count = 0
+
+    def register(self, request_id: Hashable, timeout_sec: float = None) -> asyncio.Future:
+        if request_id in self.pending_requests:
+            raise CryptoXLibException(f"Websocket request [{request_id}] is already pending.")
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        # callers are free to ignore the result (fire-and-forget), failures are then not reported as unretrieved
+        future.add_done_callback(_consume_exception)
+
+        timeout_handle = loop.call_later(timeout_sec if timeout_sec is not None else self.timeout_sec,
+                                         self._expire, request_id)
+        self.pending_requests[request_id] = PendingRequest(future, time.monotonic(), timeout_handle)
+
+        return future
+
+    def unregister(self, request_id: Hashable) -> None:
+        # the request could not be sent
+        request = self.pending_requests.pop(request_id, None)
+        if request is not None:
+            request.timeout_handle.cancel()
+            request.future.cancel()
+
+    def resolve(self, request_id: Hashable, response: dict) -> bool:
+        request = self._pop(request_id)
+        if request is None:
+            return False
+
+        if not request.future.done():
+            request.future.set_result(response)
+
+        return True
+
+    def reject(self, request_id: Hashable, response: dict) -> bool:
+        request = self._pop(request_id)
+        if request is None:
+            return False
+
+        self.reject_count += 1
+        if not request.future.done():
+            request.future.set_exception(WebsocketRequestRejected(f"Websocket request [{request_id}] rejected. "
+                                                                  f"Response [{response}]", response))
+
+        return True
+
+    def fail_all(self, exception: Exception) -> None:
+        # e.g. when the connection is lost, the answers would never arrive
+        pending_requests = self.pending_requests
+        self.pending_requests = {}
+
+        for request in pending_requests.values():
+            request.timeout_handle.cancel()
+            if not request.future.done():
+                request.future.set_exception(exception)
+
+    def has_pending_requests(self) -> bool:
+        return len(self.pending_requests) > 0
+
+    def get_latency_stats(self) -> dict:
+        stats = self.latency_stats.get_stats()
+        stats['reject_count'] = self.reject_count
+        stats['timeout_count'] = self.timeout_count
+
+        return stats
+
+    def get_latency_histogram(self, bounds_sec: Sequence[float] = LatencyStats.DEFAULT_HISTOGRAM_BOUNDS_SEC) -> List[int]:
+        return self.latency_stats.get_histogram(bounds_sec)
+
+    def _pop(self, request_id: Hashable) -> Optional[PendingRequest]:
+        request = self.pending_requests.pop(request_id, None)
+        if request is not None:
+            request.timeout_handle.cancel()
+            self.latency_stats.record(time.monotonic() - request.sent_tmstmp)
+
+        return request
+
+    def _expire(self, request_id: Hashable) -> None:
+        request = self.pending_requests.pop(request_id, None)
+        if request is None:
+            return
+
+        LOG.warning(f"Websocket request [{request_id}] has not been answered in time.")
+        self.timeout_count += 1
+        self.latency_stats.record_error()
+        if not request.future.done():
+            request.future.set_exception(WebsocketRequestTimeout(f"Websocket request [{request_id}] timed out."))
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
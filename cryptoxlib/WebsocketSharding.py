@@ -0,0 +1,104 @@
+import math
+import logging
+from typing import List, Optional
+
+from cryptoxlib.WebsocketMgr import Subscription
+from cryptoxlib.exceptions import CryptoXLibException
+
+LOG = logging.getLogger(__name__)
+
+
+class ShardingLimits(object):
+    def __init__(self, max_subscriptions: int = None, max_uri_length: int = None,
+                 max_subscription_messages_per_sec: float = None) -> None:
+        self.max_subscriptions = max_subscriptions
+        self.max_uri_length = max_uri_length
+        self.max_subscription_messages_per_sec = max_subscription_messages_per_sec
+
+
+class Shard(object):
+    def __init__(self, limits: ShardingLimits, subscriptions: List[Subscription] = None) -> None:
+        self.limits = limits
+
+        self.subscriptions: List[Subscription] = []
+        self.uri_length = 0
+        self.message_rate = 0.0
+
+        if subscriptions is not None:
+            for subscription in subscriptions:
+                self.add(subscription)
+
+    def fits(self, subscription: Subscription) -> bool:
+        if self.limits.max_subscriptions is not None and len(self.subscriptions) >= self.limits.max_subscriptions:
+            return False
+
+        if self.limits.max_uri_length is not None and \
+                self.uri_length + subscription.get_websocket_uri_length() > self.limits.max_uri_length:
+            return False
+
+        return True
+
+    def add(self, subscription: Subscription) -> None:
+        self.subscriptions.append(subscription)
+        self.uri_length += subscription.get_websocket_uri_length()
+        self.message_rate += subscription.get_expected_message_rate()
+
+
+class SubscriptionSharder(object):
+    def __init__(self, limits: ShardingLimits) -> None:
+        self.limits = limits
+
+    def split(self, subscriptions: List[Subscription]) -> List[List[Subscription]]:
+        if len(subscriptions) == 0:
+            return [[]]
+
+        shard_count = 1
+        if self.limits.max_subscriptions is not None:
+            shard_count = max(shard_count, math.ceil(len(subscriptions) / self.limits.max_subscriptions))
+        if self.limits.max_uri_length is not None:
+            uri_length = sum(subscription.get_websocket_uri_length() for subscription in subscriptions)
+            shard_count = max(shard_count, math.ceil(uri_length / self.limits.max_uri_length))
+
+        shards = [Shard(self.limits) for _ in range(shard_count)]
+
+        # subscriptions with the highest expected message rate are placed first to balance the load across shards
+        for subscription in sorted(subscriptions, key = lambda s: s.get_expected_message_rate(), reverse = True):
+            shard = self._find_shard(shards, subscription)
+            if shard is None:
+                shard = Shard(self.limits)
+                shards.append(shard)
+            shard.add(subscription)
+
+        # preserve the original order of subscriptions within a shard
+        order = {subscription.internal_subscription_id: i for i, subscription in enumerate(subscriptions)}
+        split_subscriptions = [sorted(shard.subscriptions, key = lambda s: order[s.internal_subscription_id])
+                               for shard in shards if len(shard.subscriptions) > 0]
+
+        if len(split_subscriptions) > 1:
+            LOG.info(f"Subscriptions split into {len(split_subscriptions)} shards of sizes "
+                     f"{[len(shard) for shard in split_subscriptions]}.")
+
+        return split_subscriptions
+
+    def assign(self, shards_subscriptions: List[List[Subscription]],
+               new_subscriptions: List[Subscription]) -> List[List[Subscription]]:
+        shards = [Shard(self.limits, subscriptions) for subscriptions in shards_subscriptions]
+        assigned_subscriptions = [[] for _ in shards]
+
+        for subscription in new_subscriptions:
+            shard = self._find_shard(shards, subscription)
+            if shard is None:
+                raise CryptoXLibException(f"Subscription {subscription.get_subscription_id()} does not fit into any "
+                                          f"existing websocket connection.")
+            shard.add(subscription)
+            assigned_subscriptions[shards.index(shard)].append(subscription)
+
+        return assigned_subscriptions
+
+    @staticmethod
+    def _find_shard(shards: List[Shard], subscription: Subscription) -> Optional[Shard]:
+        candidates = [shard for shard in shards if shard.fits(subscription)]
+        if len(candidates) == 0:
+            return None
+
+        return min(candidates, key = lambda shard: shard.message_rate)
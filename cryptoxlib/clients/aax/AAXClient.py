@@ -31,7 +31,7 @@ class AAXClient(CryptoXLibClient):
         return self.REST_API_URI
 
     def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None,
-                      headers: dict = None) -> None:
+                      headers: dict = None, signature_data: dict = None) -> None:
         timestamp = self._get_current_timestamp_ms()
 
         signature_string = f"{timestamp}:{rest_call_type.value}/v2/{resource}"
@@ -40,20 +40,22 @@ class AAXClient(CryptoXLibClient):
         if params is not None:
             signature_string += json.dumps(params)
 
-        LOG.debug(f"Signature input string: {signature_string}")
+        LOG.debug("Signature input string: %s", signature_string)
         signature = hmac.new(self.sec_key.encode('utf-8'), signature_string.encode('utf-8'), hashlib.sha256).hexdigest()
 
         headers['X-ACCESS-KEY'] = self.api_key
         headers['X-ACCESS-NONCE'] = str(timestamp)
         headers['X-ACCESS-SIGN'] = signature
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
         if str(status_code)[0] != '2':
             raise AAXRestException(status_code, body)
 
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
-        return AAXWebsocket(subscriptions, self.api_key, self.sec_key, ssl_context)
+        return AAXWebsocket(subscriptions, self.api_key, self.sec_key, ssl_context = ssl_context,
+                            timestamp_source = self._get_current_timestamp_ms)
 
     async def get_exchange_info(self) -> dict:
         return await self._create_get("instruments")
@@ -1,11 +1,11 @@
-import json
 import logging
-import datetime
 import hashlib
 import hmac
 from abc import abstractmethod
 from typing import List, Callable, Any, Union, Optional
 
+from cryptoxlib import json_codec
+from cryptoxlib.ServerClock import get_local_timestamp_ms
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.aax import enums
@@ -20,7 +20,8 @@ class AAXWebsocket(WebsocketMgr):
     WEBSOCKET_URI = "wss://stream.aax.com/"
 
     def __init__(self, subscriptions: List[Subscription], api_key: str = None, sec_key: str = None, user_id: str = None,
-                 ssl_context = None) -> None:
+                 ssl_context = None,
+                 timestamp_source: Callable[[], int] = None) -> None:
         super().__init__(websocket_uri = self.WEBSOCKET_URI, subscriptions = subscriptions,
                          ssl_context = ssl_context,
                          builtin_ping_interval = None,
@@ -29,6 +30,8 @@ class AAXWebsocket(WebsocketMgr):
 
         self.api_key = api_key
         self.sec_key = sec_key
+        # timestamps of authentication messages follow the exchange time if available
+        self.timestamp_source = timestamp_source if timestamp_source is not None else get_local_timestamp_ms
 
     def get_websocket(self) -> Websocket:
         return self.get_aiohttp_websocket()
@@ -42,12 +45,12 @@ class AAXWebsocket(WebsocketMgr):
 
         if requires_authentication:
             handshake_message = '{"event":"#handshake","cid":1}'
-            LOG.debug(f"> {handshake_message}")
+            LOG.debug("> %s", handshake_message)
             await self.websocket.send(handshake_message)
             handshake_response = await self.websocket.receive()
-            LOG.debug(f"< {handshake_response}")
+            LOG.debug("< %s", handshake_response)
 
-            timestamp_ms = int(datetime.datetime.now(tz = datetime.timezone.utc).timestamp() * 1000)
+            timestamp_ms = self.timestamp_source()
             signature_string = f"{timestamp_ms}:{self.api_key}"
             signature = hmac.new(self.sec_key.encode('utf-8'), signature_string.encode('utf-8'),
                                  hashlib.sha256).hexdigest()
@@ -61,11 +64,11 @@ class AAXWebsocket(WebsocketMgr):
                 }
             }
 
-            LOG.debug(f"> {authentication_message}")
-            await self.websocket.send(json.dumps(authentication_message))
+            LOG.debug("> %s", authentication_message)
+            await self.websocket.send(json_codec.dumps(authentication_message))
 
-            message = json.loads(await self.websocket.receive())
-            LOG.debug(f"< {message}")
+            message = json_codec.loads(await self.websocket.receive())
+            LOG.debug("< %s", message)
 
             if 'data' in message and 'isAuthenticated' in message['data'] and message['data']['isAuthenticated'] is True:
                 LOG.info(f"Websocket authenticated successfully.")
@@ -74,8 +77,8 @@ class AAXWebsocket(WebsocketMgr):
 
     async def send_subscription_message(self, subscriptions: List[Subscription]):
         for subscription in subscriptions:
-            LOG.debug(f"> {subscription.get_subscription_message()}")
-            await self.websocket.send(json.dumps(subscription.get_subscription_message()))
+            LOG.debug("> %s", subscription.get_subscription_message())
+            await self.websocket.send(json_codec.dumps(subscription.get_subscription_message()))
 
     async def validate_subscriptions(self, subscriptions: List[Subscription]) -> None:
         pass
@@ -86,11 +89,11 @@ class AAXWebsocket(WebsocketMgr):
     async def _process_message(self, websocket: Websocket, message: str) -> None:
         if message == '#1':
             pong = '#2'
-            LOG.debug(f"> {pong}")
+            LOG.debug("> %s", pong)
             await websocket.send(pong)
             return
 
-        message = json.loads(message)
+        message = json_codec.loads(message)
 
         if message['e'] == 'empty':
             pass
@@ -1,12 +1,14 @@
 import ssl
 import logging
 import json
+import re
 import hmac
 import hashlib
 from multidict import CIMultiDictProxy
 from typing import List, Optional
 
 from cryptoxlib.CryptoXLibClient import CryptoXLibClient, RestCallType
+from cryptoxlib.LazyJson import LazyJson
 from cryptoxlib.clients.bibox import enums
 from cryptoxlib.clients.bibox.exceptions import BiboxException
 from cryptoxlib.clients.bibox.functions import map_pair
@@ -20,6 +22,8 @@ LOG = logging.getLogger(__name__)
 
 class BiboxClient(CryptoXLibClient):
     REST_API_URI = "https://api.bibox.com/v1/"
+    # errors are reported in the body of successful responses
+    ERROR_PATTERN = re.compile(rb'"error"')
 
     def __init__(self, api_key: str = None, sec_key: str = None, api_trace_log: bool = False,
                  ssl_context: ssl.SSLContext = None) -> None:
@@ -31,7 +35,7 @@ class BiboxClient(CryptoXLibClient):
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         cmds = data['cmds']
 
         signature = hmac.new(self.sec_key.encode('utf-8'), cmds.encode('utf-8'), hashlib.md5).hexdigest()
@@ -39,9 +43,14 @@ class BiboxClient(CryptoXLibClient):
         data['apikey'] = self.api_key
         data['sign'] = signature
 
-        LOG.debug(f"Signed data: {data}")
+        LOG.debug("Signed data: %s", data)
+
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
+        # lazily decoded bodies are decoded only if an error is reported
+        if isinstance(body, LazyJson) and not body.matches_prefix(BiboxClient.ERROR_PATTERN):
+            return
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
         if body is not None and 'error' in body:
             raise BiboxException(f"BiboxException: status [{status_code}], response [{body}]")
 
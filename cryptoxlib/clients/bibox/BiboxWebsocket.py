@@ -10,6 +10,7 @@ import websockets
 from abc import abstractmethod
 from typing import List, Callable, Any, Optional
 
+from cryptoxlib import json_codec
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.bibox.functions import map_pair
@@ -32,21 +33,22 @@ class BiboxWebsocket(WebsocketMgr):
 
     async def send_subscription_message(self, subscriptions: List[Subscription]):
         for subscription in subscriptions:
-            subscription_message = json.dumps(
+            subscription_message = json_codec.dumps(
                 subscription.get_subscription_message(api_key = self.api_key, sec_key = self.sec_key))
 
-            LOG.debug(f"> {subscription_message}")
-            await self.websocket.send(subscription_message)
+            LOG.debug("> %s", subscription_message)
+            with self.websocket.redacted_trace(subscription.requires_authentication()):
+                await self.websocket.send(subscription_message)
 
     async def _process_message(self, websocket: Websocket, message: str) -> None:
-        messages = json.loads(message)
+        messages = json_codec.loads(message)
 
         if "ping" in messages:
             pong_message = {
                 "pong": messages['ping']
             }
-            LOG.debug(f"> {pong_message}")
-            await websocket.send(json.dumps(pong_message))
+            LOG.debug("> %s", pong_message)
+            await websocket.send(json_codec.dumps(pong_message))
         elif 'error' in messages:
             raise BiboxException(f"BiboxException: Bibox error received: {message}")
         else:
@@ -55,7 +57,7 @@ class BiboxWebsocket(WebsocketMgr):
                     data = message['data']
                     if 'binary' in message and message['binary'] == '1':
                         data = zlib.decompress(base64.b64decode(data), zlib.MAX_WBITS | 32)
-                        message['data'] = json.loads(data.decode("utf-8"))
+                        message['data'] = json_codec.loads(data)
                     await self.publish_message(WebsocketMessage(subscription_id = message['channel'], message = message))
                 else:
                     LOG.warning(f"No data element received: {message}")
@@ -122,6 +124,9 @@ class UserDataSubscription(BiboxSubscription):
     def __init__(self, callbacks: Optional[List[Callable[[dict], Any]]] = None):
         super().__init__(callbacks)
 
+    def requires_authentication(self) -> bool:
+        return True
+
     def get_channel_name(self):
         return "bibox_sub_spot_ALL_ALL_login"
 
@@ -30,7 +30,7 @@ class BiboxEuropeClient(CryptoXLibClient):
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         cmds = data['cmds']
 
         signature = hmac.new(self.sec_key.encode('utf-8'), cmds.encode('utf-8'), hashlib.md5).hexdigest()
@@ -38,16 +38,16 @@ class BiboxEuropeClient(CryptoXLibClient):
         data['apikey'] = self.api_key
         data['sign'] = signature
 
-        LOG.debug(f"Signed data: {data}")
+        LOG.debug("Signed data: %s", data)
 
-    @staticmethod
-    def _get_headers():
+    def _get_headers(self):
         return {
-            'X-Ca-Nonce': str(CryptoXLibClient._get_current_timestamp_ms()),
+            'X-Ca-Nonce': str(self._get_current_timestamp_ms()),
             'Content-Type': 'application/json'
         }
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
         if str(status_code)[0] != "2":
             raise BiboxEuropeException(f"BiboxEuropeException: status [{status_code}], response [{body}]")
 
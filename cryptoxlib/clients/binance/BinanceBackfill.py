@@ -0,0 +1,356 @@
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from cryptoxlib.exceptions import CryptoXLibException, RateLimitException
+from cryptoxlib.clients.binance import enums
+from cryptoxlib.clients.binance.BinanceFuturesClient import BinanceCOINMFuturesClient
+from cryptoxlib.clients.binance.functions import extract_symbol, get_interval_ms
+from cryptoxlib.clients.binance.types import PairSymbolType
+from cryptoxlib.version_conversions import async_create_task
+
+LOG = logging.getLogger(__name__)
+
+
+class BackfillDataset(ABC):
+    """
+    Historical dataset of a Binance client which can be downloaded by time windows. Requests are subject to the
+    client's rate limiter, i.e. the backfill stays within the weight budget of the API.
+    """
+
+    def __init__(self, client, name: str, window_ms: int, limit: int) -> None:
+        self.client = client
+        self.name = name
+        self.window_ms = window_ms
+        self.limit = limit
+
+    @abstractmethod
+    async def fetch_window(self, symbol: PairSymbolType, start_tmstmp_ms: int, end_tmstmp_ms: int) -> List[Any]:
+        pass
+
+
+class TimePagedDataset(BackfillDataset):
+    """
+    Dataset whose pages are requested by start time only.
+    """
+
+    @abstractmethod
+    async def _fetch_page(self, symbol: PairSymbolType, start_tmstmp_ms: int, end_tmstmp_ms: int) -> List[Any]:
+        pass
+
+    @abstractmethod
+    def get_item_tmstmp(self, item: Any) -> int:
+        pass
+
+    async def fetch_window(self, symbol: PairSymbolType, start_tmstmp_ms: int, end_tmstmp_ms: int) -> List[Any]:
+        # a window may contain more items than fit into a single page
+        items = []
+        while True:
+            page = await self._fetch_page(symbol, start_tmstmp_ms, end_tmstmp_ms)
+            items.extend(page)
+
+            if len(page) < self.limit:
+                return items
+
+            start_tmstmp_ms = self.get_item_tmstmp(page[-1]) + 1
+            if start_tmstmp_ms > end_tmstmp_ms:
+                return items
+
+
+class CandlestickDataset(TimePagedDataset):
+    def __init__(self, client, interval: enums.Interval, limit: int = 1000) -> None:
+        super().__init__(client, f"klines_{interval.value}", limit * get_interval_ms(interval), limit)
+        self.interval = interval
+
+    async def _fetch_page(self, symbol: PairSymbolType, start_tmstmp_ms: int, end_tmstmp_ms: int) -> List[Any]:
+        response = await self.client.get_candlesticks(symbol, interval = self.interval, limit = self.limit,
+                                                      start_tmstmp_ms = start_tmstmp_ms,
+                                                      end_tmstmp_ms = end_tmstmp_ms)
+        return response['response']
+
+    def get_item_tmstmp(self, item: Any) -> int:
+        return item[0]
+
+
+class AggregateTradeDataset(BackfillDataset):
+    # the exchange limits the time range of a single request to one hour
+    MAX_WINDOW_MS = 60 * 60 * 1000
+
+    def __init__(self, client, window_ms: int = MAX_WINDOW_MS, limit: int = 1000) -> None:
+        super().__init__(client, "aggTrades", window_ms, limit)
+
+    async def fetch_window(self, symbol: PairSymbolType, start_tmstmp_ms: int, end_tmstmp_ms: int) -> List[Any]:
+        # trades with the same timestamp could be split across pages, therefore subsequent pages are requested by id
+        response = await self.client.get_aggregate_trades(symbol, limit = self.limit,
+                                                          start_tmstmp_ms = start_tmstmp_ms,
+                                                          end_tmstmp_ms = end_tmstmp_ms)
+        page = response['response']
+        items = list(page)
+        while len(page) == self.limit:
+            response = await self.client.get_aggregate_trades(symbol, limit = self.limit, from_id = page[-1]['a'] + 1)
+            page = [trade for trade in response['response'] if trade['T'] <= end_tmstmp_ms]
+            items.extend(page)
+
+        return items
+
+
+class FundingRateDataset(TimePagedDataset):
+    FUNDING_INTERVAL_MS = 8 * 60 * 60 * 1000
+
+    def __init__(self, client, limit: int = 1000) -> None:
+        super().__init__(client, "fundingRate", limit * FundingRateDataset.FUNDING_INTERVAL_MS, limit)
+
+    async def _fetch_page(self, symbol: PairSymbolType, start_tmstmp_ms: int, end_tmstmp_ms: int) -> List[Any]:
+        # COIN-M API takes the symbol (e.g. BTCUSD_PERP) rather than a pair
+        if isinstance(self.client, BinanceCOINMFuturesClient):
+            symbol = extract_symbol(symbol)
+
+        response = await self.client.get_fund_rate_history(symbol, limit = self.limit,
+                                                           start_tmstmp_ms = start_tmstmp_ms,
+                                                           end_tmstmp_ms = end_tmstmp_ms)
+        return response['response']
+
+    def get_item_tmstmp(self, item: Any) -> int:
+        return item['fundingTime']
+
+
+class OpenInterestDataset(TimePagedDataset):
+    """
+    Note that the exchange provides open interest history for the last 30 days only.
+    """
+
+    def __init__(self, client, interval: enums.Interval, contract_type: enums.ContractType = None,
+                 limit: int = 500) -> None:
+        super().__init__(client, f"openInterestHist_{interval.value}", limit * get_interval_ms(interval), limit)
+        self.interval = interval
+        self.contract_type = contract_type
+
+    async def _fetch_page(self, symbol: PairSymbolType, start_tmstmp_ms: int, end_tmstmp_ms: int) -> List[Any]:
+        # COIN-M API requires contract type in addition
+        kwargs = {} if self.contract_type is None else {'contract_type': self.contract_type}
+        response = await self.client.get_open_interest_hist(symbol, interval = self.interval, limit = self.limit,
+                                                            start_tmstmp_ms = start_tmstmp_ms,
+                                                            end_tmstmp_ms = end_tmstmp_ms, **kwargs)
+        return response['response']
+
+    def get_item_tmstmp(self, item: Any) -> int:
+        return item['timestamp']
+
+
+class BackfillJob(object):
+    def __init__(self, dataset: BackfillDataset, symbol: PairSymbolType, start_tmstmp_ms: int,
+                 end_tmstmp_ms: int) -> None:
+        self.dataset = dataset
+        self.symbol = symbol
+        self.start_tmstmp_ms = start_tmstmp_ms
+        self.end_tmstmp_ms = end_tmstmp_ms
+
+        self.key = f"{dataset.name}:{extract_symbol(symbol)}"
+
+
+class BackfillWindow(object):
+    def __init__(self, job: BackfillJob, start_tmstmp_ms: int, end_tmstmp_ms: int) -> None:
+        self.job = job
+        self.start_tmstmp_ms = start_tmstmp_ms
+        self.end_tmstmp_ms = end_tmstmp_ms
+
+
+class BackfillSink(ABC):
+    """
+    Receives windows of each job in chronological order. A window is checkpointed only once it was written.
+    """
+
+    @abstractmethod
+    async def write(self, window: BackfillWindow, items: List[Any]) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class CallbackBackfillSink(BackfillSink):
+    def __init__(self, callback: Callable[[BackfillWindow, List[Any]], Awaitable[None]]) -> None:
+        self.callback = callback
+
+    async def write(self, window: BackfillWindow, items: List[Any]) -> None:
+        await self.callback(window, items)
+
+
+class JsonLinesBackfillSink(BackfillSink):
+    """
+    Appends items of each job as JSON lines to <directory>/<dataset>_<symbol>.jsonl.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.files = {}
+
+    async def write(self, window: BackfillWindow, items: List[Any]) -> None:
+        file = self.files.get(window.job.key)
+        if file is None:
+            os.makedirs(self.directory, exist_ok = True)
+            file = open(os.path.join(self.directory, window.job.key.replace(':', '_') + ".jsonl"), "a")
+            self.files[window.job.key] = file
+
+        for item in items:
+            file.write(json.dumps(item) + "\n")
+        file.flush()
+
+    async def close(self) -> None:
+        for file in self.files.values():
+            file.close()
+        self.files = {}
+
+
+class BackfillCheckpointStore(object):
+    """
+    Keeps the end of the last written window of each job in memory, see FileBackfillCheckpointStore for
+    a persistent variant. Checkpoints are stored together with the start of the job's range and apply only to jobs
+    starting at the same time, i.e. a job with a different range is downloaded from its start.
+    """
+
+    def __init__(self) -> None:
+        # key -> [start of the job, end of the last written window]
+        self.checkpoints: Dict[str, List[int]] = {}
+
+    def get(self, key: str, start_tmstmp_ms: int) -> Optional[int]:
+        checkpoint = self.checkpoints.get(key)
+        if checkpoint is None or checkpoint[0] != start_tmstmp_ms:
+            return None
+
+        return checkpoint[1]
+
+    def set(self, key: str, start_tmstmp_ms: int, end_tmstmp_ms: int) -> None:
+        self.checkpoints[key] = [start_tmstmp_ms, end_tmstmp_ms]
+
+
+class FileBackfillCheckpointStore(BackfillCheckpointStore):
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+
+        if os.path.exists(path):
+            with open(path) as file:
+                self.checkpoints = json.load(file)
+
+    def set(self, key: str, start_tmstmp_ms: int, end_tmstmp_ms: int) -> None:
+        super().set(key, start_tmstmp_ms, end_tmstmp_ms)
+
+        # written atomically in order not to lose the checkpoints if the process is killed
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.checkpoints, file)
+        os.replace(tmp_path, self.path)
+
+
+class BinanceBackfill(object):
+    """
+    Downloads historical datasets for many symbols at once. Each job is split into time windows which are fetched
+    concurrently (up to `concurrency` windows across all jobs, up to `max_parallel_jobs` jobs at once), failed windows
+    are retried and windows of each job are handed over to the sink in chronological order. Jobs resume from
+    the checkpoint of the last written window.
+
+    Request weight is controlled by the rate limiter of the client, see BinanceCommonClient.set_rate_limit_behaviour.
+    """
+    DEFAULT_CONCURRENCY = 8
+    DEFAULT_MAX_RETRIES = 5
+    DEFAULT_RETRY_DELAY_SEC = 1
+
+    def __init__(self, sink: BackfillSink, checkpoint_store: BackfillCheckpointStore = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, max_retries: int = DEFAULT_MAX_RETRIES,
+                 retry_delay_sec: float = DEFAULT_RETRY_DELAY_SEC, max_parallel_jobs: int = None) -> None:
+        if concurrency < 1:
+            raise CryptoXLibException(f"Concurrency [{concurrency}] must be a positive number.")
+
+        self.sink = sink
+        self.checkpoint_store = checkpoint_store if checkpoint_store is not None else BackfillCheckpointStore()
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_delay_sec = retry_delay_sec
+        # bounds the number of downloaded windows held in memory while waiting for their predecessors
+        self.max_parallel_jobs = max_parallel_jobs if max_parallel_jobs is not None else concurrency
+
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.job_semaphore: Optional[asyncio.Semaphore] = None
+
+    async def run(self, jobs: List[BackfillJob]) -> None:
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.job_semaphore = asyncio.Semaphore(self.max_parallel_jobs)
+
+        try:
+            results = await asyncio.gather(*[self._run_job(job) for job in jobs], return_exceptions = True)
+        finally:
+            await self.sink.close()
+
+        failed_jobs = [(job.key, result) for job, result in zip(jobs, results) if isinstance(result, BaseException)]
+        if len(failed_jobs) > 0:
+            raise CryptoXLibException(f"Backfill of {len(failed_jobs)} job(s) failed, rerun to resume from the last "
+                                      f"checkpoint: {failed_jobs}")
+
+    def get_windows(self, job: BackfillJob) -> List[BackfillWindow]:
+        start_tmstmp_ms = job.start_tmstmp_ms
+        checkpoint = self.checkpoint_store.get(job.key, job.start_tmstmp_ms)
+        if checkpoint is not None:
+            start_tmstmp_ms = max(start_tmstmp_ms, checkpoint + 1)
+
+        windows = []
+        while start_tmstmp_ms <= job.end_tmstmp_ms:
+            end_tmstmp_ms = min(start_tmstmp_ms + job.dataset.window_ms - 1, job.end_tmstmp_ms)
+            windows.append(BackfillWindow(job, start_tmstmp_ms, end_tmstmp_ms))
+            start_tmstmp_ms = end_tmstmp_ms + 1
+
+        return windows
+
+    async def _run_job(self, job: BackfillJob) -> None:
+        async with self.job_semaphore:
+            await self._download_job(job)
+
+    async def _download_job(self, job: BackfillJob) -> None:
+        windows = deque(self.get_windows(job))
+        LOG.info(f"Backfill of [{job.key}] started, {len(windows)} window(s) to download.")
+
+        # at most `concurrency` windows of a job are held in memory while waiting for the preceding ones
+        pending: Deque[asyncio.Task] = deque()
+        try:
+            while len(windows) > 0 or len(pending) > 0:
+                while len(windows) > 0 and len(pending) < self.concurrency:
+                    pending.append(async_create_task(self._fetch_window(windows.popleft())))
+
+                window, items = await pending.popleft()
+                await self.sink.write(window, items)
+                self.checkpoint_store.set(job.key, job.start_tmstmp_ms, window.end_tmstmp_ms)
+        except Exception as e:
+            LOG.error(f"Backfill of [{job.key}] failed: {e}")
+            raise
+        finally:
+            for task in pending:
+                task.cancel()
+
+        LOG.info(f"Backfill of [{job.key}] finished.")
+
+    async def _fetch_window(self, window: BackfillWindow) -> tuple:
+        attempt = 0
+        while True:
+            try:
+                async with self.semaphore:
+                    items = await window.job.dataset.fetch_window(window.job.symbol, window.start_tmstmp_ms,
+                                                                  window.end_tmstmp_ms)
+                return window, items
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+
+                delay = self.retry_delay_sec * 2 ** (attempt - 1)
+                if isinstance(e, RateLimitException) and e.retry_after_sec is not None:
+                    delay = max(delay, e.retry_after_sec)
+
+                LOG.warning(f"Window [{window.start_tmstmp_ms}, {window.end_tmstmp_ms}] of [{window.job.key}] failed "
+                            f"({e}), retry {attempt}/{self.max_retries} in {delay}s.")
+                await asyncio.sleep(delay)
@@ -1,14 +1,24 @@
+import asyncio
 import ssl
+import time
 import logging
-from typing import List, Optional
+import aiohttp
+from typing import AsyncIterator, Dict, List, Optional
 
-from cryptoxlib.CryptoXLibClient import CryptoXLibClient
+from cryptoxlib.CryptoXLibClient import CryptoXLibClient, RestCallType, ContentType
+from cryptoxlib.RestCache import cached
+from cryptoxlib.LatencyStats import LatencyStats
+from cryptoxlib.hedging import send_hedged, TRANSPORT_ERRORS
 from cryptoxlib.clients.binance.BinanceCommonClient import BinanceCommonClient
-from cryptoxlib.clients.binance import enums
-from cryptoxlib.clients.binance.functions import map_pair
+from cryptoxlib.clients.binance.BinanceClusterSelector import BinanceClusterSelector
+from cryptoxlib.clients.binance import enums, rate_limits
+from cryptoxlib.clients.binance.functions import map_pair, get_interval_ms
 from cryptoxlib.Pair import Pair
+from cryptoxlib.pagination import paginate, paginate_concurrently, get_time_windows
 from cryptoxlib.WebsocketMgr import WebsocketMgr, Subscription
+from cryptoxlib.WebsocketSharding import ShardingLimits
 from cryptoxlib.clients.binance.BinanceWebsocket import BinanceWebsocket, BinanceTestnetWebsocket
+from cryptoxlib.clients.binance.exceptions import BinanceException, BinanceRestException
 
 LOG = logging.getLogger(__name__)
 
@@ -16,25 +26,218 @@ LOG = logging.getLogger(__name__)
 class BinanceClient(BinanceCommonClient):
     API_V3 = "api/v3/"
     SAPI_V1 = "sapi/v1/"
+    # max number of items of history endpoints
+    MAX_PAGE_SIZE = 1000
 
     def __init__(self, api_key: str = None, sec_key: str = None, api_trace_log: bool = False,
                  api_cluster: enums.APICluster = enums.APICluster.CLUSTER_DEFAULT,
                  ssl_context: ssl.SSLContext = None) -> None:
         super().__init__(api_key = api_key, sec_key = sec_key, api_trace_log = api_trace_log, ssl_context = ssl_context)
 
-        self.rest_api_uri = f"https://{api_cluster.value}.binance.com/"
+        self.api_cluster = api_cluster
+        self.rest_api_uri = self.get_cluster_rest_api_uri(api_cluster)
+
+        # latencies of REST calls per API cluster
+        self.cluster_latency_stats: Dict[enums.APICluster, LatencyStats] = {}
+
+        # hedged GET calls, see enable_hedged_requests(...)
+        self.hedge_clusters: Optional[List[enums.APICluster]] = None
+        self.hedge_percentile = 95
+        self.hedge_min_samples = 20
+        self.hedge_default_delay_sec = 0.5
+        self.hedged_request_count = 0
+        self.hedged_request_win_count = 0
+
+        # runtime switching of the API cluster, see enable_cluster_selection(...)
+        self.cluster_selector: Optional[BinanceClusterSelector] = None
+
+    async def close(self) -> None:
+        if self.cluster_selector is not None:
+            await self.cluster_selector.stop()
+
+        await super().close()
 
     def _get_rest_api_uri(self) -> str:
         return self.rest_api_uri
 
+    @staticmethod
+    def get_cluster_rest_api_uri(api_cluster: enums.APICluster) -> str:
+        return f"https://{api_cluster.value}.binance.com/"
+
+    def set_api_cluster(self, api_cluster: enums.APICluster) -> None:
+        self.api_cluster = api_cluster
+        self.rest_api_uri = self.get_cluster_rest_api_uri(api_cluster)
+
+    async def enable_cluster_selection(self, api_clusters: List[enums.APICluster] = None,
+                                       probe_interval_sec: float = BinanceClusterSelector.DEFAULT_PROBE_INTERVAL_SEC,
+                                       alpha: float = 0.3, hysteresis: float = 0.2,
+                                       error_penalty_sec: float = 1.0) -> BinanceClusterSelector:
+        """
+        Pings api_clusters (all clusters by default) every probe_interval_sec and switches the client to the cluster
+        with the best moving average of ping RTT and error rate. The current cluster is replaced only if the best one
+        is better by more than hysteresis (relative). The first probe is done before the method returns.
+        """
+        if self.cluster_selector is None:
+            cluster_selector = BinanceClusterSelector(self, api_clusters = api_clusters,
+                                                      probe_interval_sec = probe_interval_sec, alpha = alpha,
+                                                      hysteresis = hysteresis, error_penalty_sec = error_penalty_sec)
+            await cluster_selector.probe()
+            cluster_selector.start()
+
+            self.cluster_selector = cluster_selector
+
+        return self.cluster_selector
+
+    async def disable_cluster_selection(self) -> None:
+        # the client stays at the currently selected cluster
+        if self.cluster_selector is not None:
+            await self.cluster_selector.stop()
+            self.cluster_selector = None
+
+    def enable_hedged_requests(self, api_clusters: List[enums.APICluster] = None, percentile: float = 95,
+                               min_samples: int = 20, default_delay_sec: float = 0.5) -> None:
+        """
+        GET calls which are not answered by the client's API cluster within the given percentile of its recent
+        latencies are sent to another cluster too and the first answer wins. The other cluster is the one with the
+        lowest latency among api_clusters (all clusters by default). Until min_samples latencies of the client's
+        cluster are known, calls are hedged after default_delay_sec.
+
+        Hedged calls consume the request weight twice in the worst case.
+        """
+        self.hedge_clusters = list(api_clusters) if api_clusters is not None else list(enums.APICluster)
+        self.hedge_percentile = percentile
+        self.hedge_min_samples = min_samples
+        self.hedge_default_delay_sec = default_delay_sec
+
+    def disable_hedged_requests(self) -> None:
+        self.hedge_clusters = None
+
+    def get_cluster_latency_stats(self) -> Dict[enums.APICluster, dict]:
+        return {api_cluster: stats.get_stats() for api_cluster, stats in self.cluster_latency_stats.items()}
+
+    def get_hedged_request_stats(self) -> dict:
+        return {
+            "hedged_request_count": self.hedged_request_count,
+            # number of hedged calls answered by the other cluster first
+            "hedged_request_win_count": self.hedged_request_win_count
+        }
+
+    def _get_cluster_latency_stats(self, api_cluster: enums.APICluster) -> LatencyStats:
+        stats = self.cluster_latency_stats.get(api_cluster)
+        if stats is None:
+            stats = LatencyStats()
+            self.cluster_latency_stats[api_cluster] = stats
+
+        return stats
+
+    def _get_hedge_delay_sec(self) -> float:
+        stats = self._get_cluster_latency_stats(self.api_cluster)
+        if stats.get_sample_count() < self.hedge_min_samples:
+            return self.hedge_default_delay_sec
+
+        return stats.get_percentile(self.hedge_percentile)
+
+    def _get_hedge_cluster(self) -> Optional[enums.APICluster]:
+        best_cluster = None
+        best_latency_sec = None
+        for api_cluster in self.hedge_clusters:
+            if api_cluster == self.api_cluster:
+                continue
+
+            # clusters without any samples are tried first to gather their latencies
+            latency_sec = self._get_cluster_latency_stats(api_cluster).get_percentile(self.hedge_percentile) or 0.0
+            if best_cluster is None or latency_sec < best_latency_sec:
+                best_cluster = api_cluster
+                best_latency_sec = latency_sec
+
+        return best_cluster
+
+    async def _send_rest_call(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signed: bool = False,
+                              api_variable_path: str = None, content_type: ContentType = ContentType.JSON,
+                              timeout: aiohttp.ClientTimeout = None, rest_api_uri: str = None,
+                              rate_limited: bool = True) -> dict:
+        if rest_api_uri is not None:
+            return await super()._send_rest_call(rest_call_type, resource, data, params, headers, signed,
+                                                 api_variable_path, content_type, timeout, rest_api_uri, rate_limited)
+
+        def send(api_cluster: enums.APICluster, rest_api_uri: str = None, record_cancelled: bool = False):
+            # each request is signed separately, i.e. the parameters must not be shared
+            return self._send_cluster_rest_call(api_cluster, record_cancelled, rate_limited, rest_call_type, resource,
+                                                data, dict(params) if params is not None else {}, headers, signed,
+                                                api_variable_path, content_type, timeout, rest_api_uri)
+
+        hedge_cluster = None
+        if self.hedge_clusters is not None and rest_call_type == RestCallType.GET:
+            hedge_cluster = self._get_hedge_cluster()
+
+        if hedge_cluster is None:
+            return await send(self.api_cluster)
+
+        async def send_hedge():
+            self.hedged_request_count += 1
+            return await send(hedge_cluster, self.get_cluster_rest_api_uri(hedge_cluster))
+
+        # the primary request cancelled because the hedge answered first still counts into the latencies
+        response, hedge_won = await send_hedged(lambda: send(self.api_cluster, record_cancelled = True), send_hedge,
+                                                self._get_hedge_delay_sec())
+        if hedge_won:
+            self.hedged_request_win_count += 1
+
+        return response
+
+    async def _send_cluster_rest_call(self, api_cluster: enums.APICluster, record_cancelled: bool, rate_limited: bool,
+                                      rest_call_type: RestCallType, resource: str, data: dict, params: dict,
+                                      headers: dict, signed: bool, api_variable_path: str, content_type: ContentType,
+                                      timeout: aiohttp.ClientTimeout, rest_api_uri: str) -> dict:
+        # the latency covers the HTTP exchange only, not the wait for the rate limits
+        if rate_limited:
+            await self._acquire_rest_rate_limit(rest_call_type, resource, api_variable_path, params, data)
+
+        stats = self._get_cluster_latency_stats(api_cluster)
+        start_sec = time.monotonic()
+        try:
+            response = await super()._send_rest_call(rest_call_type, resource, data, params, headers, signed,
+                                                     api_variable_path, content_type, timeout, rest_api_uri,
+                                                     rate_limited = False)
+        except BinanceRestException as e:
+            if e.status_code >= 500:
+                stats.record_error()
+            else:
+                stats.record(time.monotonic() - start_sec)
+            raise
+        except TRANSPORT_ERRORS:
+            stats.record_error()
+            raise
+        except asyncio.CancelledError:
+            # the request took at least as long as it was pending
+            if record_cancelled:
+                stats.record(time.monotonic() - start_sec)
+            raise
+
+        stats.record(time.monotonic() - start_sec)
+
+        return response
+
+    def _get_rate_limit_profile(self) -> Optional[rate_limits.BinanceRateLimitProfile]:
+        return rate_limits.SPOT
+
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
         return BinanceWebsocket(subscriptions = subscriptions, binance_client = self, api_key = self.api_key,
                                 sec_key = self.sec_key, ssl_context = ssl_context)
 
+    def _get_websocket_sharding_limits(self) -> Optional[ShardingLimits]:
+        return ShardingLimits(max_subscriptions = BinanceWebsocket.MAX_STREAMS,
+                              max_uri_length = BinanceWebsocket.MAX_URI_LENGTH,
+                              max_subscription_messages_per_sec = BinanceWebsocket.MAX_SUBSCRIPTION_MESSAGES_PER_SEC)
+
+    async def _send_warmup_request(self) -> None:
+        await self._send_rest_call(RestCallType.GET, "ping", api_variable_path = BinanceClient.API_V3)
+
     async def ping(self) -> dict:
         return await self._create_get("ping", api_variable_path = BinanceClient.API_V3)
 
+    @cached(ttl_sec = 300)
     async def get_exchange_info(self, pairs: List[Pair] = None) -> dict:
         resource_path = "exchangeInfo"
 
@@ -92,6 +295,29 @@ class BinanceClient(BinanceCommonClient):
 
         return await self._create_get("aggTrades", params = params, api_variable_path = BinanceClient.API_V3)
 
+    def iter_aggregate_trades(self, pair: Pair, from_id: int = None, start_tmstmp_ms: int = None,
+                              end_tmstmp_ms: int = None, page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[dict]:
+        """
+        Iterates over aggregate trades starting with from_id or start_tmstmp_ms, pages are requested by fromId.
+        """
+        async def fetch_page(cursor: Optional[int]) -> dict:
+            if cursor is None:
+                return await self.get_aggregate_trades(pair, limit = page_size, from_id = from_id,
+                                                       start_tmstmp_ms = start_tmstmp_ms if from_id is None else None)
+
+            return await self.get_aggregate_trades(pair, limit = page_size, from_id = cursor)
+
+        def get_items(response: dict) -> List[dict]:
+            if end_tmstmp_ms is None:
+                return response['response']
+
+            return [trade for trade in response['response'] if trade['T'] <= end_tmstmp_ms]
+
+        def get_next_cursor(response: dict, trades: List[dict]) -> Optional[int]:
+            return trades[-1]['a'] + 1 if len(trades) == page_size else None
+
+        return paginate(fetch_page, get_items, get_next_cursor)
+
     async def get_candlesticks(self, pair: Pair, limit: int = None, interval: enums.Interval = None,
                                start_tmstmp_ms: int = None, end_tmstmp_ms: int = None) -> dict:
         params = CryptoXLibClient._clean_request_params({
@@ -106,6 +332,24 @@ class BinanceClient(BinanceCommonClient):
 
         return await self._create_get("klines", params = params, api_variable_path = BinanceClient.API_V3)
 
+    def iter_candlesticks(self, pair: Pair, interval: enums.Interval, start_tmstmp_ms: int, end_tmstmp_ms: int = None,
+                          page_size: int = MAX_PAGE_SIZE, concurrency: int = 4) -> AsyncIterator[list]:
+        """
+        Iterates over candlesticks in the time range, the range is split into windows of page_size candlesticks which
+        are fetched concurrently.
+        """
+        if end_tmstmp_ms is None:
+            end_tmstmp_ms = self._get_current_timestamp_ms()
+
+        async def fetch_page(window: tuple) -> dict:
+            return await self.get_candlesticks(pair, limit = page_size, interval = interval,
+                                               start_tmstmp_ms = window[0], end_tmstmp_ms = window[1])
+
+        return paginate_concurrently(fetch_page, lambda response: response['response'],
+                                     get_time_windows(start_tmstmp_ms, end_tmstmp_ms,
+                                                      page_size * get_interval_ms(interval)),
+                                     concurrency = concurrency)
+
     async def get_average_price(self, pair: Pair) -> dict:
         params = CryptoXLibClient._clean_request_params({
             "symbol": map_pair(pair)
@@ -260,6 +504,23 @@ class BinanceClient(BinanceCommonClient):
 
         return await self._create_get("allOrders", params = params, headers = self._get_header(), signed = True, api_variable_path = BinanceClient.API_V3)
 
+    def iter_all_orders(self, pair: Pair, order_id: int = None, start_tmstmp_ms: int = None,
+                        page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[dict]:
+        """
+        Iterates over orders starting with order_id or start_tmstmp_ms, pages are requested by orderId.
+        """
+        async def fetch_page(cursor: Optional[int]) -> dict:
+            if cursor is None:
+                return await self.get_all_orders(pair, order_id = order_id, limit = page_size,
+                                                 start_tmstmp_ms = start_tmstmp_ms if order_id is None else None)
+
+            return await self.get_all_orders(pair, order_id = cursor, limit = page_size)
+
+        def get_next_cursor(response: dict, orders: List[dict]) -> Optional[int]:
+            return orders[-1]['orderId'] + 1 if len(orders) == page_size else None
+
+        return paginate(fetch_page, lambda response: response['response'], get_next_cursor)
+
     async def create_oco_order(self, pair: Pair, side: enums.OrderSide,
                                quantity: str,
                                price: str,
@@ -367,6 +628,23 @@ class BinanceClient(BinanceCommonClient):
 
         return await self._create_get("myTrades", params = params, headers = self._get_header(), signed = True, api_variable_path = BinanceClient.API_V3)
 
+    def iter_account_trades(self, pair: Pair, from_id: int = None, start_tmstmp_ms: int = None,
+                            page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[dict]:
+        """
+        Iterates over account trades starting with from_id or start_tmstmp_ms, pages are requested by fromId.
+        """
+        async def fetch_page(cursor: Optional[int]) -> dict:
+            if cursor is None:
+                return await self.get_account_trades(pair, limit = page_size, from_id = from_id,
+                                                     start_tmstmp_ms = start_tmstmp_ms if from_id is None else None)
+
+            return await self.get_account_trades(pair, limit = page_size, from_id = cursor)
+
+        def get_next_cursor(response: dict, trades: List[dict]) -> Optional[int]:
+            return trades[-1]['id'] + 1 if len(trades) == page_size else None
+
+        return paginate(fetch_page, lambda response: response['response'], get_next_cursor)
+
     async def get_spot_listen_key(self):
         return await self._create_post("userDataStream", headers = self._get_header(), api_variable_path = BinanceClient.API_V3)
 
@@ -2012,6 +2290,19 @@ class BinanceTestnetClient(BinanceClient):
     def _get_rest_api_uri(self) -> str:
         return BinanceTestnetClient.REST_API_URI
 
+    def enable_hedged_requests(self, api_clusters: List[enums.APICluster] = None, percentile: float = 95,
+                               min_samples: int = 20, default_delay_sec: float = 0.5) -> None:
+        raise BinanceException("Testnet does not provide API clusters.")
+
+    async def enable_cluster_selection(self, api_clusters: List[enums.APICluster] = None,
+                                       probe_interval_sec: float = BinanceClusterSelector.DEFAULT_PROBE_INTERVAL_SEC,
+                                       alpha: float = 0.3, hysteresis: float = 0.2,
+                                       error_penalty_sec: float = 1.0) -> BinanceClusterSelector:
+        raise BinanceException("Testnet does not provide API clusters.")
+
+    def _get_rate_limit_profile(self) -> Optional[rate_limits.BinanceRateLimitProfile]:
+        return rate_limits.SPOT_TESTNET
+
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
         return BinanceTestnetWebsocket(subscriptions = subscriptions, binance_client = self, api_key = self.api_key,
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from cryptoxlib.CryptoXLibClient import RestCallType
+from cryptoxlib.exceptions import RateLimitException
+from cryptoxlib.version_conversions import async_create_task
+from cryptoxlib.clients.binance import enums
+
+LOG = logging.getLogger(__name__)
+
+
+class ClusterHealth(object):
+    def __init__(self) -> None:
+        # exponentially weighted moving averages of successful ping RTTs and of the error rate (0 - 1)
+        self.rtt_sec: Optional[float] = None
+        self.error_rate = 0.0
+        self.probe_count = 0
+
+    def update(self, rtt_sec: Optional[float], alpha: float) -> None:
+        self.probe_count += 1
+
+        self.error_rate += alpha * ((1.0 if rtt_sec is None else 0.0) - self.error_rate)
+        if rtt_sec is not None:
+            self.rtt_sec = rtt_sec if self.rtt_sec is None else self.rtt_sec + alpha * (rtt_sec - self.rtt_sec)
+
+    def get_score(self, error_penalty_sec: float) -> float:
+        # lower is better, clusters which never answered are never selected
+        if self.rtt_sec is None:
+            return math.inf
+
+        return self.rtt_sec + self.error_rate * error_penalty_sec
+
+
+class BinanceClusterSelector(object):
+    """
+    Periodically pings all API clusters and switches the client to the best one, i.e. the one with the lowest RTT
+    increased by a penalty proportional to its error rate. The client switches only if the best cluster is better than
+    the current one by more than the hysteresis (relative), which prevents flapping between clusters of similar latency.
+    """
+    DEFAULT_PROBE_INTERVAL_SEC = 30
+
+    def __init__(self, client, api_clusters: List[enums.APICluster] = None,
+                 probe_interval_sec: float = DEFAULT_PROBE_INTERVAL_SEC, probe_timeout_sec: float = 5,
+                 alpha: float = 0.3, hysteresis: float = 0.2, error_penalty_sec: float = 1.0) -> None:
+        self.client = client
+        self.api_clusters = list(api_clusters) if api_clusters is not None else list(enums.APICluster)
+        self.probe_interval_sec = probe_interval_sec
+        self.probe_timeout_sec = probe_timeout_sec
+        self.probe_timeout = aiohttp.ClientTimeout(total = probe_timeout_sec)
+        self.alpha = alpha
+        self.hysteresis = hysteresis
+        self.error_penalty_sec = error_penalty_sec
+
+        self.cluster_health: Dict[enums.APICluster, ClusterHealth] = {
+            api_cluster: ClusterHealth() for api_cluster in self.api_clusters
+        }
+        self.switch_count = 0
+        self.probe_task: Optional[asyncio.Task] = None
+
+    def __getstate__(self):
+        # copies in other processes keep the selected cluster but do not probe anymore
+        state = self.__dict__.copy()
+        state['probe_task'] = None
+
+        return state
+
+    async def _probe_cluster(self, api_cluster: enums.APICluster) -> None:
+        # pings count into the rate limits like any other call but the wait for the limits is not part of the RTT.
+        # A probe which cannot be sent in time says nothing about the cluster and is skipped
+        try:
+            await asyncio.wait_for(self.client._acquire_rest_rate_limit(RestCallType.GET, "ping", self.client.API_V3,
+                                                                        {}, None),
+                                   timeout = self.probe_timeout_sec)
+        except (asyncio.TimeoutError, RateLimitException):
+            LOG.debug(f"Ping of API cluster [{api_cluster.name}] skipped due to rate limits.")
+            return
+
+        start_sec = time.monotonic()
+        try:
+            await asyncio.wait_for(
+                self.client._send_rest_call(RestCallType.GET, "ping", api_variable_path = self.client.API_V3,
+                                            timeout = self.probe_timeout,
+                                            rest_api_uri = self.client.get_cluster_rest_api_uri(api_cluster),
+                                            rate_limited = False),
+                timeout = self.probe_timeout_sec)
+            rtt_sec = time.monotonic() - start_sec
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOG.debug(f"Ping of API cluster [{api_cluster.name}] failed: {e}")
+            rtt_sec = None
+
+        self.cluster_health[api_cluster].update(rtt_sec, self.alpha)
+
+    async def probe(self) -> None:
+        await asyncio.gather(*[self._probe_cluster(api_cluster) for api_cluster in self.api_clusters])
+
+        self._select_cluster()
+
+    def _select_cluster(self) -> None:
+        scores = {api_cluster: health.get_score(self.error_penalty_sec)
+                  for api_cluster, health in self.cluster_health.items()}
+        best_cluster = min(scores, key = scores.get)
+
+        current_cluster = self.client.api_cluster
+        current_score = scores.get(current_cluster, math.inf)
+        if best_cluster != current_cluster and scores[best_cluster] < current_score * (1 - self.hysteresis):
+            LOG.info(f"Switching API cluster from [{current_cluster.name}] to [{best_cluster.name}], "
+                     f"score [{current_score:.4f}] -> [{scores[best_cluster]:.4f}].")
+            self.client.set_api_cluster(best_cluster)
+            self.switch_count += 1
+
+    def get_cluster_health(self) -> Dict[enums.APICluster, dict]:
+        return {
+            api_cluster: {
+                "rtt_sec": health.rtt_sec,
+                "error_rate": health.error_rate,
+                "probe_count": health.probe_count,
+                "score": health.get_score(self.error_penalty_sec)
+            } for api_cluster, health in self.cluster_health.items()
+        }
+
+    def start(self) -> None:
+        if self.probe_task is None:
+            self.probe_task = async_create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.probe_task is not None:
+            self.probe_task.cancel()
+            try:
+                await self.probe_task
+            except asyncio.CancelledError:
+                pass
+            self.probe_task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.probe_interval_sec)
+            try:
+                await self.probe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                LOG.warning(f"Probing of API clusters failed: {e}")
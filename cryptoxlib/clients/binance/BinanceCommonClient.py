@@ -1,46 +1,165 @@
 import ssl
 import logging
-import hmac
-import hashlib
+from urllib.parse import urlencode
 from multidict import CIMultiDictProxy
 from typing import Optional
 
 from cryptoxlib.CryptoXLibClient import CryptoXLibClient, RestCallType
+from cryptoxlib.RequestSigner import HmacSigner, get_query_string
+from cryptoxlib.RateLimiter import RateLimiter, RateLimitBehaviour, get_shared_rate_limiter
+from cryptoxlib.clients.binance import rate_limits
 from cryptoxlib.clients.binance.exceptions import BinanceRestException
 
 LOG = logging.getLogger(__name__)
 
 
 class BinanceCommonClient(CryptoXLibClient):
+    # back-off period if the exchange does not specify one
+    DEFAULT_RETRY_AFTER_SEC = 60
+    # cached headers carry the API key
+    CREDENTIAL_ATTRIBUTES = CryptoXLibClient.CREDENTIAL_ATTRIBUTES + ('header', 'form_header')
+
     def __init__(self, api_key: str = None, sec_key: str = None, api_trace_log: bool = False,
                  ssl_context: ssl.SSLContext = None) -> None:
         super().__init__(api_trace_log, ssl_context)
 
         self.api_key = api_key
         self.sec_key = sec_key
+        self.signer = HmacSigner(sec_key) if sec_key is not None else None
+        # headers are static, the cached dicts are shared by all calls
+        self.header: Optional[dict] = None
+        self.form_header: Optional[dict] = None
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
-        params_string = ""
-        data_string = ""
+        self.rate_limit_behaviour = RateLimitBehaviour.WAIT
+        self.rate_limit_max_wait_sec: Optional[float] = None
 
-        if params is not None and len(params) > 0:
-            params_string = '&'.join([f"{key}={val}" for key, val in params.items()])
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
+        query_string = get_query_string(params)
+        data_string = ""
 
+        # data are sent url-encoded in the request body, the signature is calculated from the same string
         if data is not None and len(data) > 0:
-            data_string = '&'.join(["{}={}".format(param[0], param[1]) for param in data])
+            data_string = urlencode(data)
+
+        params['signature'] = self.signer.hexdigest(query_string + data_string)
 
-        m = hmac.new(self.sec_key.encode('utf-8'), (params_string + data_string).encode('utf-8'), hashlib.sha256)
+        # the signature is appended last to the exact query string it was calculated from
+        if len(query_string) > 0:
+            query_string += '&'
+        signature_data['query_string'] = query_string + 'signature=' + params['signature']
 
-        params['signature'] = m.hexdigest()
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
+        self._update_rate_limits(status_code, headers)
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
         if str(status_code)[0] != '2':
             raise BinanceRestException(status_code, body)
 
+    async def _fetch_server_timestamp_ms(self) -> int:
+        return (await self.get_time())['response']['serverTime']
+
+    def _get_rate_limit_profile(self) -> Optional[rate_limits.BinanceRateLimitProfile]:
+        # clients of particular APIs override this method, None disables client-side rate limiting
+        return None
+
+    def set_rate_limit_behaviour(self, behaviour: RateLimitBehaviour, max_wait_sec: float = None) -> None:
+        """
+        Rate limits are tracked per API and IP address (request weight) and per API key (orders), i.e. they are shared
+        by all clients of the process. The behaviour applies to the calls of this client only.
+
+        - behaviour: wait until the call fits into the limits, fail fast with RateLimitException or disable the limiter
+        - max_wait_sec: calls which would have to wait longer fail with RateLimitException
+        """
+        self.rate_limit_behaviour = behaviour
+        self.rate_limit_max_wait_sec = max_wait_sec
+
+    def get_weight_rate_limiter(self) -> Optional[RateLimiter]:
+        profile = self._get_rate_limit_profile()
+        if profile is None:
+            return None
+
+        return get_shared_rate_limiter(("binance", profile.name), profile.create_weight_rate_limiter)
+
+    def get_order_rate_limiter(self) -> Optional[RateLimiter]:
+        profile = self._get_rate_limit_profile()
+        if profile is None:
+            return None
+
+        return get_shared_rate_limiter(("binance", profile.name, self.api_key), profile.create_order_rate_limiter)
+
+    async def update_rate_limits(self) -> None:
+        """
+        Replaces the default limits with the ones currently published by the exchangeInfo endpoint.
+        """
+        weight_rate_limiter = self.get_weight_rate_limiter()
+        if weight_rate_limiter is None:
+            return
+
+        exchange_info = await self.get_exchange_info()
+        weight_limits, order_limits = rate_limits.parse_exchange_info_limits(exchange_info['response'])
+
+        for name, (limit, interval_sec) in weight_limits.items():
+            weight_rate_limiter.set_limit(name, limit, interval_sec)
+
+        order_rate_limiter = self.get_order_rate_limiter()
+        for name, (limit, interval_sec) in order_limits.items():
+            order_rate_limiter.set_limit(name, limit, interval_sec)
+
+    async def _acquire_rest_rate_limit(self, rest_call_type: RestCallType, resource: str, api_variable_path: str = None,
+                                       params: dict = None, data: dict = None) -> None:
+        if self.rate_limit_behaviour == RateLimitBehaviour.DISABLED:
+            return
+
+        profile = self._get_rate_limit_profile()
+        if profile is None:
+            return
+
+        # some resources carry the query string in the resource path
+        path = (api_variable_path or "") + resource.split("?", 1)[0]
+        if data is not None:
+            params = {**params, **data} if params is not None else data
+
+        weight_rate_limiter = self.get_weight_rate_limiter()
+        weight = profile.get_weight(rest_call_type.value, path, params)
+        await weight_rate_limiter.acquire(rate_limits.get_weight_costs(weight_rate_limiter, weight),
+                                          self.rate_limit_behaviour, self.rate_limit_max_wait_sec)
+
+        order_count = profile.get_order_count(rest_call_type.value, path, params)
+        if order_count > 0:
+            order_rate_limiter = self.get_order_rate_limiter()
+            await order_rate_limiter.acquire(rate_limits.get_order_costs(order_rate_limiter, order_count),
+                                             self.rate_limit_behaviour, self.rate_limit_max_wait_sec)
+
+    def _update_rate_limits(self, status_code: int, headers: 'CIMultiDictProxy[str]') -> None:
+        weight_rate_limiter = self.get_weight_rate_limiter()
+        if weight_rate_limiter is None or headers is None:
+            return
+
+        weight_usage, order_usage = rate_limits.parse_usage_headers(headers)
+        if len(weight_usage) > 0:
+            weight_rate_limiter.update(weight_usage)
+        if len(order_usage) > 0:
+            self.get_order_rate_limiter().update(order_usage)
+
+        # 429 - rate limit exceeded, 418 - IP banned for repeatedly exceeding the limits
+        if status_code in (429, 418):
+            retry_after = headers.get("Retry-After")
+            weight_rate_limiter.block(float(retry_after) if retry_after is not None else
+                                      BinanceCommonClient.DEFAULT_RETRY_AFTER_SEC)
+
+    def _get_form_header(self):
+        # the header is not set automatically for url-encoded request bodies
+        if self.form_header is None:
+            self.form_header = dict(self._get_header())
+            self.form_header['Content-Type'] = "application/x-www-form-urlencoded"
+
+        return self.form_header
+
     def _get_header(self):
-        header = {
-            'Accept': 'application/json',
-            "X-MBX-APIKEY": self.api_key
-        }
+        if self.header is None:
+            self.header = {
+                'Accept': 'application/json',
+                "X-MBX-APIKEY": self.api_key
+            }
 
-        return header
\ No newline at end of file
+        return self.header
@@ -1,7 +1,7 @@
-import json
 import logging
 from typing import List, Any
 
+from cryptoxlib import json_codec
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket, CallbacksType
 
 LOG = logging.getLogger(__name__)
@@ -9,6 +9,8 @@ LOG = logging.getLogger(__name__)
 
 class BinanceCommonWebsocket(WebsocketMgr):
     SUBSCRIPTION_ID = 0
+    # all streams are listed in the connection URI, keep it within a length accepted by the server
+    MAX_URI_LENGTH = 8000
 
     def __init__(self, subscriptions: List[Subscription], binance_client, api_key: str = None, sec_key: str = None,
                  websocket_uri: str = None, builtin_ping_interval: float = 20, periodic_timeout_sec: int = None,
@@ -45,8 +47,8 @@ class BinanceCommonWebsocket(WebsocketMgr):
             "id": BinanceCommonWebsocket.SUBSCRIPTION_ID
         }
 
-        LOG.debug(f"> {subscription_message}")
-        await self.websocket.send(json.dumps(subscription_message))
+        LOG.debug("> %s", subscription_message)
+        await self.websocket.send(json_codec.dumps(subscription_message))
 
     async def send_unsubscription_message(self, subscriptions: List[Subscription]):
         BinanceCommonWebsocket.SUBSCRIPTION_ID += 1
@@ -59,8 +61,8 @@ class BinanceCommonWebsocket(WebsocketMgr):
             "id": BinanceCommonWebsocket.SUBSCRIPTION_ID
         }
 
-        LOG.debug(f"> {subscription_message}")
-        await self.websocket.send(json.dumps(subscription_message))
+        LOG.debug("> %s", subscription_message)
+        await self.websocket.send(json_codec.dumps(subscription_message))
 
     @staticmethod
     def _is_subscription_confirmation(response):
@@ -73,7 +75,7 @@ class BinanceCommonWebsocket(WebsocketMgr):
         if message is None:
             return
 
-        message = json.loads(message)
+        message = json_codec.loads(message)
 
         if self._is_subscription_confirmation(message):
             LOG.info(f"Subscription updated for id: {message['id']}")
@@ -83,6 +85,9 @@ class BinanceCommonWebsocket(WebsocketMgr):
 
 
 class BinanceSubscription(Subscription):
+    # listen keys are known only once the subscription is initialized
+    LISTEN_KEY_LENGTH = 64
+
     def __init__(self, callbacks: CallbacksType = None):
         super().__init__(callbacks)
 
@@ -96,6 +101,25 @@ class BinanceSubscription(Subscription):
     def construct_subscription_id(self) -> Any:
         return self.get_channel_name()
 
+    def requires_authentication(self) -> bool:
+        return self.is_authenticated() or self.is_isolated_margin_authenticated() or \
+               self.is_cross_margin_authenticated()
+
+    def get_expected_message_rate(self) -> float:
+        # user data streams carry only account updates
+        if self.requires_authentication():
+            return 0.1
+
+        return super().get_expected_message_rate()
+
+    def get_websocket_uri_length(self) -> int:
+        channel_name = self.get_channel_name()
+        if channel_name is None:
+            return BinanceSubscription.LISTEN_KEY_LENGTH + 1
+
+        # channel name and the separator
+        return len(channel_name) + 1
+
     def is_authenticated(self) -> bool:
         return False
 
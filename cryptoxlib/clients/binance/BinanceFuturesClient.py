@@ -1,16 +1,20 @@
 import ssl
+import json
 import logging
 from typing import List, Optional
 
-from cryptoxlib.CryptoXLibClient import CryptoXLibClient
+from cryptoxlib.CryptoXLibClient import CryptoXLibClient, RestCallType, ContentType
+from cryptoxlib.RestCache import cached
 from cryptoxlib.clients.binance.BinanceCommonClient import BinanceCommonClient
-from cryptoxlib.clients.binance.BinanceFuturesWebsocket import BinanceUSDSMFuturesWebsocket, \
+from cryptoxlib.clients.binance.BinanceOrderBatcher import BinanceOrderBatcher
+from cryptoxlib.clients.binance.BinanceFuturesWebsocket import BinanceFuturesWebsocket, BinanceUSDSMFuturesWebsocket, \
     BinanceUSDSMFuturesTestnetWebsocket, BinanceCOINMFuturesWebsocket, BinanceCOINMFuturesTestnetWebsocket
-from cryptoxlib.clients.binance import enums
+from cryptoxlib.clients.binance import enums, rate_limits
 from cryptoxlib.clients.binance.functions import map_pair, extract_symbol
 from cryptoxlib.clients.binance.types import PairSymbolType
 from cryptoxlib.Pair import Pair
 from cryptoxlib.WebsocketMgr import WebsocketMgr, Subscription
+from cryptoxlib.WebsocketSharding import ShardingLimits
 
 LOG = logging.getLogger(__name__)
 
@@ -20,6 +24,8 @@ class BinanceFuturesClient(BinanceCommonClient):
                  ssl_context: ssl.SSLContext = None) -> None:
         super().__init__(api_key = api_key, sec_key = sec_key, api_trace_log = api_trace_log, ssl_context = ssl_context)
 
+        self.order_batcher: Optional[BinanceOrderBatcher] = None
+
     def get_api_v1(self) -> str:
         pass
 
@@ -29,9 +35,18 @@ class BinanceFuturesClient(BinanceCommonClient):
     def get_api_futures(self) -> str:
         pass
 
+    def _get_websocket_sharding_limits(self) -> Optional[ShardingLimits]:
+        return ShardingLimits(max_subscriptions = BinanceFuturesWebsocket.MAX_STREAMS,
+                              max_uri_length = BinanceFuturesWebsocket.MAX_URI_LENGTH,
+                              max_subscription_messages_per_sec = BinanceFuturesWebsocket.MAX_SUBSCRIPTION_MESSAGES_PER_SEC)
+
+    async def _send_warmup_request(self) -> None:
+        await self._send_rest_call(RestCallType.GET, "ping", api_variable_path = self.get_api_v1())
+
     async def ping(self) -> dict:
         return await self._create_get("ping", api_variable_path = self.get_api_v1())
 
+    @cached(ttl_sec = 300)
     async def get_exchange_info(self) -> dict:
         return await self._create_get("exchangeInfo", api_variable_path = self.get_api_v1())
 
@@ -164,21 +179,24 @@ class BinanceFuturesClient(BinanceCommonClient):
         return await self._create_get("positionSide/dual", headers = self._get_header(), params = params, signed = True,
                                        api_variable_path = self.get_api_v1())
 
-    async def create_order(self, symbol: PairSymbolType, side: enums.OrderSide, type: enums.OrderType,
-                           position_side: enums.PositionSide = None,
-                           quantity: str = None,
-                           price: str = None,
-                           stop_price: str = None,
-                           time_in_force: enums.TimeInForce = None,
-                           new_client_order_id: str = None,
-                           reduce_only: bool = None,
-                           close_position: bool = None,
-                           activation_price: str = None,
-                           callback_rate: str = None,
-                           working_type: enums.WorkingType = None,
-                           price_protect: bool = None,
-                           new_order_response_type: enums.OrderResponseType = None,
-                           recv_window_ms: int = None) -> dict:
+    @staticmethod
+    def get_order_params(symbol: PairSymbolType, side: enums.OrderSide, type: enums.OrderType,
+                         position_side: enums.PositionSide = None,
+                         quantity: str = None,
+                         price: str = None,
+                         stop_price: str = None,
+                         time_in_force: enums.TimeInForce = None,
+                         new_client_order_id: str = None,
+                         reduce_only: bool = None,
+                         close_position: bool = None,
+                         activation_price: str = None,
+                         callback_rate: str = None,
+                         working_type: enums.WorkingType = None,
+                         price_protect: bool = None,
+                         new_order_response_type: enums.OrderResponseType = None) -> dict:
+        """
+        Parameters of a new order as used by create_order, create_batch_orders and create_order_from_params.
+        """
         params = CryptoXLibClient._clean_request_params({
             "symbol": extract_symbol(symbol),
             "side": side.value,
@@ -188,9 +206,7 @@ class BinanceFuturesClient(BinanceCommonClient):
             "stopPrice": stop_price,
             "newClientOrderId": new_client_order_id,
             "activationPrice": activation_price,
-            "callbackRate": callback_rate,
-            "recvWindow": recv_window_ms,
-            "timestamp": self._get_current_timestamp_ms()
+            "callbackRate": callback_rate
         })
 
         if price_protect is not None:
@@ -214,9 +230,123 @@ class BinanceFuturesClient(BinanceCommonClient):
         if new_order_response_type is not None:
             params['newOrderRespType'] = new_order_response_type.value
 
+        return params
+
+    async def create_order(self, symbol: PairSymbolType, side: enums.OrderSide, type: enums.OrderType,
+                           position_side: enums.PositionSide = None,
+                           quantity: str = None,
+                           price: str = None,
+                           stop_price: str = None,
+                           time_in_force: enums.TimeInForce = None,
+                           new_client_order_id: str = None,
+                           reduce_only: bool = None,
+                           close_position: bool = None,
+                           activation_price: str = None,
+                           callback_rate: str = None,
+                           working_type: enums.WorkingType = None,
+                           price_protect: bool = None,
+                           new_order_response_type: enums.OrderResponseType = None,
+                           recv_window_ms: int = None) -> dict:
+        params = BinanceFuturesClient.get_order_params(symbol, side, type, position_side, quantity, price, stop_price,
+                                                       time_in_force, new_client_order_id, reduce_only, close_position,
+                                                       activation_price, callback_rate, working_type, price_protect,
+                                                       new_order_response_type)
+
+        # batches share a single receive window, orders with a custom one are placed separately
+        if self.order_batcher is not None and recv_window_ms is None:
+            return await self.order_batcher.submit(params)
+
+        return await self.create_order_from_params(params, recv_window_ms)
+
+    async def create_order_from_params(self, order: dict, recv_window_ms: int = None) -> dict:
+        params = CryptoXLibClient._clean_request_params({
+            **order,
+            "recvWindow": recv_window_ms,
+            "timestamp": self._get_current_timestamp_ms()
+        })
+
         return await self._create_post("order", params = params, headers = self._get_header(), signed = True,
                                        api_variable_path = self.get_api_v1())
 
+    async def create_batch_orders(self, orders: List[dict], recv_window_ms: int = None) -> dict:
+        """
+        Places up to 5 orders at once, orders are built via get_order_params(...). The response contains a list of
+        results in the order of the orders, rejected orders are reported as {"code": ..., "msg": ...}.
+        """
+        data = CryptoXLibClient._clean_request_params({
+            "batchOrders": json.dumps(orders, separators = (',', ':')),
+            "recvWindow": recv_window_ms,
+            "timestamp": self._get_current_timestamp_ms()
+        })
+
+        return await self._create_post("batchOrders", data = data, headers = self._get_form_header(), signed = True,
+                                       api_variable_path = self.get_api_v1(), content_type = ContentType.URL_ENCODED)
+
+    async def cancel_batch_orders(self, symbol: PairSymbolType, order_ids: List[int] = None,
+                                  orig_client_order_ids: List[str] = None, recv_window_ms: int = None) -> dict:
+        data = CryptoXLibClient._clean_request_params({
+            "symbol": extract_symbol(symbol),
+            "recvWindow": recv_window_ms,
+            "timestamp": self._get_current_timestamp_ms()
+        })
+
+        if order_ids is not None:
+            data['orderIdList'] = json.dumps(order_ids, separators = (',', ':'))
+
+        if orig_client_order_ids is not None:
+            data['origClientOrderIdList'] = json.dumps(orig_client_order_ids, separators = (',', ':'))
+
+        return await self._create_delete("batchOrders", data = data, headers = self._get_form_header(), signed = True,
+                                         api_variable_path = self.get_api_v1(), content_type = ContentType.URL_ENCODED)
+
+    @staticmethod
+    def get_modify_order_params(symbol: PairSymbolType, side: enums.OrderSide, quantity: str, price: str,
+                                order_id: int = None, orig_client_order_id: str = None) -> dict:
+        return CryptoXLibClient._clean_request_params({
+            "symbol": extract_symbol(symbol),
+            "side": side.value,
+            "quantity": quantity,
+            "price": price,
+            "orderId": order_id,
+            "origClientOrderId": orig_client_order_id
+        })
+
+    async def modify_order(self, symbol: PairSymbolType, side: enums.OrderSide, quantity: str, price: str,
+                           order_id: int = None, orig_client_order_id: str = None,
+                           recv_window_ms: int = None) -> dict:
+        params = CryptoXLibClient._clean_request_params({
+            **BinanceFuturesClient.get_modify_order_params(symbol, side, quantity, price, order_id,
+                                                           orig_client_order_id),
+            "recvWindow": recv_window_ms,
+            "timestamp": self._get_current_timestamp_ms()
+        })
+
+        return await self._create_put("order", params = params, headers = self._get_header(), signed = True,
+                                      api_variable_path = self.get_api_v1())
+
+    async def modify_batch_orders(self, orders: List[dict], recv_window_ms: int = None) -> dict:
+        """
+        Modifies up to 5 limit orders at once, orders are built via get_modify_order_params(...).
+        """
+        data = CryptoXLibClient._clean_request_params({
+            "batchOrders": json.dumps(orders, separators = (',', ':')),
+            "recvWindow": recv_window_ms,
+            "timestamp": self._get_current_timestamp_ms()
+        })
+
+        return await self._create_put("batchOrders", data = data, headers = self._get_form_header(), signed = True,
+                                      api_variable_path = self.get_api_v1(), content_type = ContentType.URL_ENCODED)
+
+    def enable_order_batching(self, window_sec: float = 0,
+                              max_batch_size: int = BinanceOrderBatcher.MAX_BATCH_SIZE) -> None:
+        """
+        Orders created via create_order within the window are placed in batches, see BinanceOrderBatcher.
+        """
+        self.order_batcher = BinanceOrderBatcher(self, window_sec = window_sec, max_batch_size = max_batch_size)
+
+    def disable_order_batching(self) -> None:
+        self.order_batcher = None
+
     async def get_order(self, symbol: PairSymbolType, order_id: int = None, orig_client_order_id: int = None,
                         recv_window_ms: int = None) -> dict:
         params = CryptoXLibClient._clean_request_params({
@@ -416,6 +546,9 @@ class BinanceUSDSMFuturesClient(BinanceFuturesClient):
     def _get_rest_api_uri(self) -> str:
         return BinanceUSDSMFuturesClient.REST_API_URI
 
+    def _get_rate_limit_profile(self) -> Optional[rate_limits.BinanceRateLimitProfile]:
+        return rate_limits.USDS_M_FUTURES
+
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
         return BinanceUSDSMFuturesWebsocket(subscriptions = subscriptions, binance_client = self, api_key = self.api_key,
@@ -663,6 +796,9 @@ class BinanceUSDSMFuturesTestnetClient(BinanceUSDSMFuturesClient):
     def _get_rest_api_uri(self) -> str:
         return BinanceUSDSMFuturesTestnetClient.REST_API_URI
 
+    def _get_rate_limit_profile(self) -> Optional[rate_limits.BinanceRateLimitProfile]:
+        return rate_limits.USDS_M_FUTURES_TESTNET
+
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
         return BinanceUSDSMFuturesTestnetWebsocket(subscriptions = subscriptions, binance_client = self,
@@ -683,6 +819,9 @@ class BinanceCOINMFuturesClient(BinanceFuturesClient):
     def _get_rest_api_uri(self) -> str:
         return BinanceCOINMFuturesClient.REST_API_URI
 
+    def _get_rate_limit_profile(self) -> Optional[rate_limits.BinanceRateLimitProfile]:
+        return rate_limits.COIN_M_FUTURES
+
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
         return BinanceCOINMFuturesWebsocket(subscriptions = subscriptions, binance_client = self, api_key = self.api_key,
@@ -919,6 +1058,9 @@ class BinanceCOINMFuturesTestnetClient(BinanceCOINMFuturesClient):
     def _get_rest_api_uri(self) -> str:
         return BinanceCOINMFuturesTestnetClient.REST_API_URI
 
+    def _get_rate_limit_profile(self) -> Optional[rate_limits.BinanceRateLimitProfile]:
+        return rate_limits.COIN_M_FUTURES_TESTNET
+
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
         return BinanceCOINMFuturesTestnetWebsocket(subscriptions = subscriptions, binance_client = self,
@@ -1,11 +1,13 @@
 import logging
-from typing import List
+from typing import List, Hashable
 
-from cryptoxlib.WebsocketMgr import Subscription, CallbacksType, Websocket
+from cryptoxlib.WebsocketMgr import Subscription, CallbacksType, Websocket, WebsocketMessage
 from cryptoxlib.Pair import Pair
+from cryptoxlib.OrderBook import OrderBook
 from cryptoxlib.clients.binance.exceptions import BinanceException
 from cryptoxlib.clients.binance.functions import map_ws_pair, extract_ws_symbol
 from cryptoxlib.clients.binance.BinanceCommonWebsocket import BinanceCommonWebsocket, BinanceSubscription
+from cryptoxlib.clients.binance.BinanceOrderBook import BinanceOrderBookMgr
 from cryptoxlib.clients.binance import enums
 from cryptoxlib.clients.binance.types import PairSymbolType
 
@@ -13,6 +15,9 @@ LOG = logging.getLogger(__name__)
 
 
 class BinanceFuturesWebsocket(BinanceCommonWebsocket):
+    MAX_STREAMS = 200
+    MAX_SUBSCRIPTION_MESSAGES_PER_SEC = 10
+
     def __init__(self, subscriptions: List[Subscription], binance_client, api_key: str = None, sec_key: str = None,
                  websocket_uri: str = None, builtin_ping_interval: float = None, periodic_timeout_sec: int = None,
                  ssl_context = None) -> None:
@@ -90,6 +95,9 @@ class AggregateTradeSubscription(BinanceSubscription):
 
         self.symbol = extract_ws_symbol(symbol)
 
+    def get_expected_message_rate(self) -> float:
+        return 5.0
+
     def get_channel_name(self):
         return f"{self.symbol}@aggTrade"
 
@@ -133,6 +141,9 @@ class CandlestickSubscription(BinanceSubscription):
         self.interval = interval
         self.symbol = extract_ws_symbol(symbol)
 
+    def get_expected_message_rate(self) -> float:
+        return 0.5
+
     def get_channel_name(self):
         return f"{self.symbol}@kline_{self.interval.value}"
 
@@ -215,9 +226,16 @@ class OrderBookTickerSubscription(BinanceSubscription):
     def __init__(self, callbacks: CallbacksType = None):
         super().__init__(callbacks)
 
+    # updates of all symbols
+    def get_expected_message_rate(self) -> float:
+        return 1000.0
+
     def get_channel_name(self):
         return "!bookTicker"
 
+    def get_conflation_key(self, message: WebsocketMessage) -> Hashable:
+        return message.message['data']['s']
+
 
 class OrderBookSymbolTickerSubscription(BinanceSubscription):
     def __init__(self, symbol: PairSymbolType, callbacks: CallbacksType = None):
@@ -225,6 +243,9 @@ class OrderBookSymbolTickerSubscription(BinanceSubscription):
 
         self.symbol = extract_ws_symbol(symbol)
 
+    def get_expected_message_rate(self) -> float:
+        return 20.0
+
     def get_channel_name(self):
         return f"{self.symbol}@bookTicker"
 
@@ -265,6 +286,9 @@ class DepthSubscription(BinanceSubscription):
         self.level = level
         self.frequency = frequency
 
+    def get_expected_message_rate(self) -> float:
+        return 1000.0 / self.frequency
+
     def get_channel_name(self):
         if self.level == DepthSubscription.DEFAULT_LEVEL:
             level_str = ""
@@ -279,6 +303,54 @@ class DepthSubscription(BinanceSubscription):
         return f"{self.symbol}@depth{level_str}{frequency_str}"
 
 
+class OrderBookSubscription(DepthSubscription):
+    """
+    Maintains a local order book synchronized from a REST snapshot and the diff depth stream. Callbacks receive
+    the maintained OrderBook or, if changes_only is set, a dictionary with the changed levels.
+    """
+
+    def __init__(self, symbol: PairSymbolType, frequency: int = DepthSubscription.DEFAULT_FREQUENCY,
+                 snapshot_limit: enums.DepthLimit = enums.DepthLimit.L_1000, changes_only: bool = False,
+                 callbacks: CallbacksType = None):
+        super().__init__(symbol, level = DepthSubscription.DEFAULT_LEVEL, frequency = frequency, callbacks = callbacks)
+
+        self.snapshot_limit = snapshot_limit
+        self.changes_only = changes_only
+
+        self.binance_client = None
+        self.order_book_mgr = BinanceOrderBookMgr(self.symbol.upper(), self._get_snapshot, futures = True)
+
+    async def initialize(self, **kwargs):
+        self.binance_client = kwargs['binance_client']
+        self.order_book_mgr.reset()
+
+    def detach(self) -> 'OrderBookSubscription':
+        # the copy maintains its own order book and fetches snapshots through its own client
+        subscription = super().detach()
+        subscription.binance_client = None
+        subscription.order_book_mgr = BinanceOrderBookMgr(self.symbol.upper(), subscription._get_snapshot, futures = True)
+
+        return subscription
+
+    async def _get_snapshot(self) -> dict:
+        response = await self.binance_client.get_orderbook(self.symbol.upper(), limit = self.snapshot_limit)
+        return response['response']
+
+    def get_order_book(self) -> OrderBook:
+        return self.order_book_mgr.order_book
+
+    async def process_message(self, message: WebsocketMessage) -> None:
+        events = self.order_book_mgr.process_event(message.message['data'])
+        if events is not None:
+            await self.process_callbacks(WebsocketMessage(subscription_id = message.subscription_id,
+                                                          message = self.order_book_mgr.get_update(events, self.changes_only),
+                                                          websocket = message.websocket))
+
+    async def close(self) -> None:
+        self.order_book_mgr.close()
+        await super().close()
+
+
 class BlvtSubscription(BinanceSubscription):
     def __init__(self, pair: Pair, callbacks: CallbacksType = None):
         super().__init__(callbacks)
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from cryptoxlib.clients.binance.exceptions import BinanceException, BinanceRestException
+from cryptoxlib.version_conversions import async_create_task
+
+LOG = logging.getLogger(__name__)
+
+
+class BinanceOrderBatcher(object):
+    """
+    Collects orders submitted within a short time window and places them via the batchOrders endpoint. Each caller
+    receives the result of its own order in the same format as returned by create_order or an exception in case
+    the order was rejected.
+
+    - window_sec: period for which orders are collected after the first one, 0 to collect orders submitted within
+      the same iteration of the event loop (e.g. via asyncio.gather)
+    """
+    MAX_BATCH_SIZE = 5
+
+    def __init__(self, client, window_sec: float = 0, max_batch_size: int = MAX_BATCH_SIZE) -> None:
+        self.client = client
+        self.window_sec = window_sec
+        self.max_batch_size = min(max_batch_size, BinanceOrderBatcher.MAX_BATCH_SIZE)
+
+        self.pending: List[Tuple[dict, asyncio.Future]] = []
+        self.flush_handle: Optional[asyncio.Handle] = None
+
+        self.batch_count = 0
+        self.order_count = 0
+
+    async def submit(self, order: dict) -> dict:
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self.pending.append((order, future))
+        self.order_count += 1
+
+        if len(self.pending) >= self.max_batch_size:
+            self._flush()
+        elif self.flush_handle is None:
+            if self.window_sec > 0:
+                self.flush_handle = loop.call_later(self.window_sec, self._flush)
+            else:
+                self.flush_handle = loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        batch = self.pending
+        self.pending = []
+        if len(batch) > 0:
+            self.batch_count += 1
+            async_create_task(self._place(batch))
+
+    async def _place(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        try:
+            # a single order is placed via the order endpoint which has lower weight
+            if len(batch) == 1:
+                order, future = batch[0]
+                response = await self.client.create_order_from_params(order)
+                if not future.done():
+                    future.set_result(response)
+                return
+
+            response = await self.client.create_batch_orders([order for order, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        results = response['response']
+        for i, (order, future) in enumerate(batch):
+            if future.done():
+                continue
+
+            if i >= len(results):
+                future.set_exception(BinanceException(f"Missing result of batch order [{order}]."))
+                continue
+
+            result = results[i]
+
+            # rejected orders are reported in place of the order, e.g. {"code": -2022, "msg": "ReduceOnly rejected"}
+            if 'code' in result and 'orderId' not in result:
+                future.set_exception(BinanceRestException(response['status_code'], result))
+            else:
+                future.set_result({
+                    "status_code": response['status_code'],
+                    "headers": response['headers'],
+                    "response": result
+                })
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, List, Optional
+
+from cryptoxlib.OrderBook import OrderBook
+from cryptoxlib.version_conversions import async_create_task
+
+LOG = logging.getLogger(__name__)
+
+
+class BinanceOrderBookMgr(object):
+    """
+    Maintains a local order book from a snapshot and a stream of depth diffs following the procedure described in
+    https://binance-docs.github.io/apidocs/spot/en/#how-to-manage-a-local-order-book-correctly
+    """
+    MAX_BUFFER_SIZE = 1000
+
+    def __init__(self, symbol: str, get_snapshot: Callable[[], Awaitable[dict]], futures: bool = False) -> None:
+        self.get_snapshot = get_snapshot
+        self.futures = futures
+
+        self.order_book = OrderBook(symbol)
+        self.buffer = deque(maxlen = BinanceOrderBookMgr.MAX_BUFFER_SIZE)
+        self.snapshot_task: Optional[asyncio.Task] = None
+        self.snapshot: Optional[dict] = None
+        self.synchronized = False
+        self.resync_count = 0
+
+    def reset(self) -> None:
+        self.order_book.clear()
+        self.buffer.clear()
+        self.synchronized = False
+        self.snapshot = None
+        if self.snapshot_task is not None:
+            self.snapshot_task.cancel()
+            self.snapshot_task = None
+
+    def process_event(self, event: dict) -> Optional[List[dict]]:
+        """
+        Returns list of diffs applied to the order book or None if the book is not synchronized yet. The list
+        is empty in case the book has been just (re)synchronized from a snapshot.
+        """
+        if self.synchronized:
+            if self._is_consecutive(event):
+                self._apply(event)
+                return [event]
+
+            LOG.warning(f"Order book {self.order_book.symbol} out of sequence (last update id "
+                        f"{self.order_book.last_update_id}, event {event['U']}-{event['u']}). Resynchronizing.")
+            self.reset()
+            self.resync_count += 1
+
+        self.buffer.append(event)
+
+        if self.snapshot_task is not None and self.snapshot_task.done():
+            snapshot_task = self.snapshot_task
+            self.snapshot_task = None
+
+            if snapshot_task.cancelled() or snapshot_task.exception() is not None:
+                LOG.error(f"Order book {self.order_book.symbol} snapshot could not be retrieved "
+                          f"[{None if snapshot_task.cancelled() else snapshot_task.exception()}]. Retrying.")
+            else:
+                self.snapshot = snapshot_task.result()
+
+        if self.snapshot is not None:
+            if self._synchronize():
+                return []
+
+        if self.snapshot is None and self.snapshot_task is None:
+            self.snapshot_task = async_create_task(self.get_snapshot())
+
+        return None
+
+    def get_update(self, events: List[dict], changes_only: bool) -> Any:
+        if not changes_only:
+            return self.order_book
+
+        if len(events) == 0:
+            update = self.order_book.to_json()
+            update['snapshot'] = True
+        else:
+            event = events[0]
+            update = {
+                "symbol": self.order_book.symbol,
+                "lastUpdateId": event['u'],
+                "eventTime": event['E'],
+                "bids": event['b'],
+                "asks": event['a'],
+                "snapshot": False
+            }
+
+        return update
+
+    def close(self) -> None:
+        self.reset()
+
+    def _synchronize(self) -> bool:
+        last_update_id = self.snapshot['lastUpdateId']
+
+        # drop events already included in the snapshot
+        if self.futures:
+            events = [event for event in self.buffer if event['u'] >= last_update_id]
+        else:
+            events = [event for event in self.buffer if event['u'] > last_update_id]
+
+        # the snapshot is ahead of all buffered events, wait for further events
+        if len(events) == 0:
+            return False
+
+        # the snapshot is older than the buffered events, a new snapshot is required
+        if not self._is_bridging(events[0], last_update_id):
+            self.snapshot = None
+            return False
+
+        self.order_book.load(self.snapshot['bids'], self.snapshot['asks'], last_update_id)
+        self._apply(events[0])
+        for event in events[1:]:
+            if not self._is_consecutive(event):
+                self.order_book.clear()
+                self.snapshot = None
+                return False
+            self._apply(event)
+
+        self.buffer.clear()
+        self.snapshot = None
+        self.synchronized = True
+        LOG.debug(f"Order book {self.order_book.symbol} synchronized at update id {self.order_book.last_update_id}.")
+
+        return True
+
+    def _is_bridging(self, event: dict, last_update_id: int) -> bool:
+        if self.futures:
+            return event['U'] <= last_update_id <= event['u']
+        else:
+            return event['U'] <= last_update_id + 1 <= event['u']
+
+    def _is_consecutive(self, event: dict) -> bool:
+        if self.futures:
+            return event['pu'] == self.order_book.last_update_id
+        else:
+            return event['U'] == self.order_book.last_update_id + 1
+
+    def _apply(self, event: dict) -> None:
+        self.order_book.update(event['b'], event['a'], event['u'])
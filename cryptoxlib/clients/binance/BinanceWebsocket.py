@@ -1,13 +1,15 @@
 import logging
-from typing import List
+from typing import List, Hashable
 
-from cryptoxlib.WebsocketMgr import Subscription, CallbacksType, Websocket
+from cryptoxlib.WebsocketMgr import Subscription, CallbacksType, Websocket, WebsocketMessage
 from cryptoxlib.Pair import Pair
+from cryptoxlib.OrderBook import OrderBook
 from cryptoxlib.clients.binance.BinanceCommonWebsocket import BinanceCommonWebsocket
 from cryptoxlib.clients.binance.BinanceCommonWebsocket import BinanceSubscription
 from cryptoxlib.clients.binance.exceptions import BinanceException
-from cryptoxlib.clients.binance.functions import map_ws_pair
-from cryptoxlib.clients.binance.enums import Interval
+from cryptoxlib.clients.binance.BinanceOrderBook import BinanceOrderBookMgr
+from cryptoxlib.clients.binance.functions import map_ws_pair, map_pair
+from cryptoxlib.clients.binance.enums import Interval, DepthLimit
 
 LOG = logging.getLogger(__name__)
 
@@ -15,6 +17,8 @@ LOG = logging.getLogger(__name__)
 class BinanceWebsocket(BinanceCommonWebsocket):
     WEBSOCKET_URI = "wss://stream.binance.com:9443/"
     LISTEN_KEY_REFRESH_INTERVAL_SEC = 1800
+    MAX_STREAMS = 1024
+    MAX_SUBSCRIPTION_MESSAGES_PER_SEC = 5
 
     def __init__(self, subscriptions: List[Subscription], binance_client, api_key: str = None, sec_key: str = None,
                  ssl_context = None) -> None:
@@ -61,9 +65,16 @@ class OrderBookTickerSubscription(BinanceSubscription):
     def __init__(self, callbacks: CallbacksType = None):
         super().__init__(callbacks)
 
+    # updates of all symbols
+    def get_expected_message_rate(self) -> float:
+        return 1000.0
+
     def get_channel_name(self):
         return "!bookTicker"
 
+    def get_conflation_key(self, message: WebsocketMessage) -> Hashable:
+        return message.message['data']['s']
+
 
 class OrderBookSymbolTickerSubscription(BinanceSubscription):
     def __init__(self, pair: Pair, callbacks: CallbacksType = None):
@@ -71,6 +82,9 @@ class OrderBookSymbolTickerSubscription(BinanceSubscription):
 
         self.pair = pair
 
+    def get_expected_message_rate(self) -> float:
+        return 20.0
+
     def get_channel_name(self):
         return f"{map_ws_pair(self.pair)}@bookTicker"
 
@@ -81,6 +95,9 @@ class TradeSubscription(BinanceSubscription):
 
         self.pair = pair
 
+    def get_expected_message_rate(self) -> float:
+        return 10.0
+
     def get_channel_name(self):
         return map_ws_pair(self.pair) + "@trade"
 
@@ -91,6 +108,9 @@ class AggregateTradeSubscription(BinanceSubscription):
 
         self.pair = pair
 
+    def get_expected_message_rate(self) -> float:
+        return 5.0
+
     def get_channel_name(self):
         return map_ws_pair(self.pair) + "@aggTrade"
 
@@ -102,6 +122,9 @@ class CandlestickSubscription(BinanceSubscription):
         self.pair = pair
         self.interval = interval
 
+    def get_expected_message_rate(self) -> float:
+        return 0.5
+
     def get_channel_name(self):
         return f"{map_ws_pair(self.pair)}@kline_{self.interval.value}"
 
@@ -182,6 +205,9 @@ class DepthSubscription(BinanceSubscription):
         self.level = level
         self.frequency = frequency
 
+    def get_expected_message_rate(self) -> float:
+        return 1000.0 / self.frequency
+
     def get_channel_name(self):
         if self.level == DepthSubscription.DEFAULT_LEVEL:
             level_str = ""
@@ -193,4 +219,52 @@ class DepthSubscription(BinanceSubscription):
         else:
             frequency_str = f"@{self.frequency}ms"
 
-        return f"{map_ws_pair(self.pair)}@depth{level_str}{frequency_str}"
\ No newline at end of file
+        return f"{map_ws_pair(self.pair)}@depth{level_str}{frequency_str}"
+
+
+class OrderBookSubscription(DepthSubscription):
+    """
+    Maintains a local order book synchronized from a REST snapshot and the diff depth stream. Callbacks receive
+    the maintained OrderBook or, if changes_only is set, a dictionary with the changed levels.
+    """
+
+    def __init__(self, pair: Pair, frequency: int = DepthSubscription.DEFAULT_FREQUENCY,
+                 snapshot_limit: DepthLimit = DepthLimit.L_1000, changes_only: bool = False,
+                 callbacks: CallbacksType = None):
+        super().__init__(pair, level = DepthSubscription.DEFAULT_LEVEL, frequency = frequency, callbacks = callbacks)
+
+        self.snapshot_limit = snapshot_limit
+        self.changes_only = changes_only
+
+        self.binance_client = None
+        self.order_book_mgr = BinanceOrderBookMgr(map_pair(pair), self._get_snapshot)
+
+    async def initialize(self, **kwargs):
+        self.binance_client = kwargs['binance_client']
+        self.order_book_mgr.reset()
+
+    def detach(self) -> 'OrderBookSubscription':
+        # the copy maintains its own order book and fetches snapshots through its own client
+        subscription = super().detach()
+        subscription.binance_client = None
+        subscription.order_book_mgr = BinanceOrderBookMgr(map_pair(self.pair), subscription._get_snapshot)
+
+        return subscription
+
+    async def _get_snapshot(self) -> dict:
+        response = await self.binance_client.get_orderbook(self.pair, limit = self.snapshot_limit)
+        return response['response']
+
+    def get_order_book(self) -> OrderBook:
+        return self.order_book_mgr.order_book
+
+    async def process_message(self, message: WebsocketMessage) -> None:
+        events = self.order_book_mgr.process_event(message.message['data'])
+        if events is not None:
+            await self.process_callbacks(WebsocketMessage(subscription_id = message.subscription_id,
+                                                          message = self.order_book_mgr.get_update(events, self.changes_only),
+                                                          websocket = message.websocket))
+
+    async def close(self) -> None:
+        self.order_book_mgr.close()
+        await super().close()
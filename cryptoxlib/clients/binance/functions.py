@@ -1,6 +1,16 @@
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.binance.types import PairSymbolType
 from cryptoxlib.clients.binance.exceptions import BinanceException
+from cryptoxlib.clients.binance import enums
+
+INTERVAL_UNIT_MS = {
+    'm': 60 * 1000,
+    'h': 60 * 60 * 1000,
+    'd': 24 * 60 * 60 * 1000,
+    'w': 7 * 24 * 60 * 60 * 1000,
+    # shortest month, i.e. a time window never contains more candles than expected
+    'M': 28 * 24 * 60 * 60 * 1000
+}
 
 
 def map_pair(pair: Pair) -> str:
@@ -22,3 +32,7 @@ def extract_symbol(symbol: PairSymbolType) -> str:
 
 def extract_ws_symbol(symbol: PairSymbolType) -> str:
     return extract_symbol(symbol).lower()
+
+
+def get_interval_ms(interval: enums.Interval) -> int:
+    return int(interval.value[:-1]) * INTERVAL_UNIT_MS[interval.value[-1]]
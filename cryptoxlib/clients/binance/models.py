@@ -0,0 +1,66 @@
+from typing import List, Union
+
+from cryptoxlib import models
+from cryptoxlib import json_codec
+from cryptoxlib.models import Trade, Candlestick, BookLevel, OrderUpdate
+
+# Decoders of binance payloads (REST and websocket) into the compact models, see cryptoxlib.models. Payloads of the
+# spot and futures APIs share the field names.
+
+
+def decode_aggregate_trade(message: dict) -> Trade:
+    # aggTrades endpoint or aggTrade stream
+    return Trade(message.get('s'), message['a'], message['p'], message['q'], message['T'], message['m'])
+
+
+def decode_trade(message: dict) -> Trade:
+    # trade stream
+    if 't' in message:
+        return Trade(message['s'], message['t'], message['p'], message['q'], message['T'], message['m'])
+
+    # trades and historicalTrades endpoints
+    return Trade(None, message['id'], message['price'], message['qty'], message['time'],
+                 message.get('isBuyerMaker'))
+
+
+def decode_candlestick(candlestick: Union[list, dict]) -> Candlestick:
+    # klines endpoint
+    if isinstance(candlestick, list):
+        return Candlestick(candlestick[0], candlestick[1], candlestick[2], candlestick[3], candlestick[4],
+                           candlestick[5], candlestick[6], candlestick[7], candlestick[8])
+
+    # kline stream, either the whole event or its "k" object
+    if 'k' in candlestick:
+        candlestick = candlestick['k']
+
+    return Candlestick(candlestick['t'], candlestick['o'], candlestick['h'], candlestick['l'], candlestick['c'],
+                       candlestick['v'], candlestick['T'], candlestick['q'], candlestick['n'])
+
+
+def decode_execution_report(message: dict) -> OrderUpdate:
+    # executionReport event of the user data stream
+    return OrderUpdate(message['s'], message['i'], message['c'], message['S'], message['o'], message['X'],
+                       message['x'], message['p'], message['q'], message['z'], message['L'], message['l'],
+                       message['E'])
+
+
+def decode_book_levels(depth: dict) -> List[BookLevel]:
+    # depth endpoint or (partial) depth stream
+    bids = depth['bids'] if 'bids' in depth else depth['b']
+    asks = depth['asks'] if 'asks' in depth else depth['a']
+
+    return models.get_book_levels(bids, 'BUY') + models.get_book_levels(asks, 'SELL')
+
+
+def loads_aggregate_trades(data: Union[str, bytes]) -> List[Trade]:
+    # raw body of the aggTrades endpoint, e.g. LazyJson.raw
+    return models.loads(data, decode_aggregate_trade)
+
+
+def loads_trades(data: Union[str, bytes]) -> List[Trade]:
+    return models.loads(data, decode_trade)
+
+
+def loads_candlesticks(data: Union[str, bytes]) -> List[Candlestick]:
+    # candlesticks are arrays, not objects
+    return [decode_candlestick(candlestick) for candlestick in json_codec.loads(data)]
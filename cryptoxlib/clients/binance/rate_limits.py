@@ -0,0 +1,262 @@
+import json
+import re
+from typing import Callable, Dict, List, Tuple, Union
+from multidict import CIMultiDictProxy
+
+from cryptoxlib.RateLimiter import RateLimiter, RateLimitWindow, RateLimitBehaviour
+
+# weight of a request is either constant or derived from the request parameters
+WeightType = Union[int, Callable[[dict], int]]
+# (REST method, path relative to the API root, e.g. "api/v3/depth") -> weight
+WeightTableType = Dict[Tuple[str, str], WeightType]
+# window name -> (limit, interval in seconds)
+LimitsType = Dict[str, Tuple[int, int]]
+
+DEFAULT_WEIGHT = 1
+
+REQUEST_WEIGHT = "REQUEST_WEIGHT"
+RAW_REQUESTS = "RAW_REQUESTS"
+ORDERS = "ORDERS"
+
+INTERVAL_SEC = {
+    'S': 1,
+    'M': 60,
+    'H': 3600,
+    'D': 86400
+}
+
+USAGE_HEADER_RE = re.compile(r"^X-MBX-(USED-WEIGHT|ORDER-COUNT)-(\d+)([SMHD])$", re.IGNORECASE)
+
+
+def by_limit(default_limit: int, weights: List[Tuple[int, int]]) -> Callable[[dict], int]:
+    """
+    Weight depending on the "limit" parameter, weights are (max limit, weight) pairs in ascending order.
+    """
+    def get_weight(params: dict) -> int:
+        limit = int(params.get('limit', default_limit))
+        for max_limit, weight in weights:
+            if limit <= max_limit:
+                return weight
+
+        return weights[-1][1]
+
+    return get_weight
+
+
+def by_symbol(with_symbol: int, without_symbol: int) -> Callable[[dict], int]:
+    """
+    Weight depending on whether the request is limited to a single symbol.
+    """
+    def get_weight(params: dict) -> int:
+        return with_symbol if 'symbol' in params else without_symbol
+
+    return get_weight
+
+
+def batch_size(params: dict) -> int:
+    batch_orders = params.get('batchOrders')
+    if batch_orders is None:
+        return 1
+
+    if isinstance(batch_orders, str):
+        batch_orders = json.loads(batch_orders)
+
+    return len(batch_orders)
+
+
+def get_window_name(rate_limit_type: str, interval_num: int, interval: str) -> str:
+    # the same naming is used by the exchangeInfo endpoint and by the usage headers, e.g. REQUEST_WEIGHT_1M
+    return f"{rate_limit_type}_{interval_num}{interval[0].upper()}"
+
+
+class BinanceRateLimitProfile(object):
+    """
+    Request weights and default limits of a Binance API. Limits are refreshed from the response headers and
+    optionally from the exchangeInfo endpoint.
+    """
+
+    def __init__(self, name: str, weights: WeightTableType, orders: WeightTableType, weight_limits: LimitsType,
+                 order_limits: LimitsType) -> None:
+        self.name = name
+        self.weights = weights
+        self.orders = orders
+        self.weight_limits = weight_limits
+        self.order_limits = order_limits
+
+    def create_weight_rate_limiter(self, behaviour: RateLimitBehaviour = RateLimitBehaviour.WAIT) -> RateLimiter:
+        return RateLimiter({name: RateLimitWindow(limit, interval_sec)
+                            for name, (limit, interval_sec) in self.weight_limits.items()}, behaviour)
+
+    def create_order_rate_limiter(self, behaviour: RateLimitBehaviour = RateLimitBehaviour.WAIT) -> RateLimiter:
+        return RateLimiter({name: RateLimitWindow(limit, interval_sec)
+                            for name, (limit, interval_sec) in self.order_limits.items()}, behaviour)
+
+    def get_weight(self, method: str, path: str, params: dict) -> int:
+        return BinanceRateLimitProfile._get_weight(self.weights, method, path, params, DEFAULT_WEIGHT)
+
+    def get_order_count(self, method: str, path: str, params: dict) -> int:
+        return BinanceRateLimitProfile._get_weight(self.orders, method, path, params, 0)
+
+    @staticmethod
+    def _get_weight(table: WeightTableType, method: str, path: str, params: dict, default: int) -> int:
+        weight = table.get((method, path), default)
+        if callable(weight):
+            weight = weight(params if params is not None else {})
+
+        return weight
+
+
+def get_weight_costs(rate_limiter: RateLimiter, weight: int) -> Dict[str, int]:
+    return {name: weight if name.startswith(REQUEST_WEIGHT) else 1 for name in rate_limiter.windows}
+
+
+def get_order_costs(rate_limiter: RateLimiter, order_count: int) -> Dict[str, int]:
+    return {name: order_count for name in rate_limiter.windows}
+
+
+def parse_usage_headers(headers: 'CIMultiDictProxy[str]') -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Returns usage of the weight and order windows reported in the X-MBX-USED-WEIGHT-* and X-MBX-ORDER-COUNT-* headers.
+    """
+    weight_usage = {}
+    order_usage = {}
+    for header, value in headers.items():
+        match = USAGE_HEADER_RE.match(header)
+        if match is None:
+            continue
+
+        usage_type, interval_num, interval = match.groups()
+        if usage_type.upper() == "USED-WEIGHT":
+            weight_usage[get_window_name(REQUEST_WEIGHT, int(interval_num), interval)] = int(value)
+        else:
+            order_usage[get_window_name(ORDERS, int(interval_num), interval)] = int(value)
+
+    return weight_usage, order_usage
+
+
+def parse_exchange_info_limits(exchange_info: dict) -> Tuple[LimitsType, LimitsType]:
+    """
+    Returns the weight and order limits listed in the response of the exchangeInfo endpoint.
+    """
+    weight_limits = {}
+    order_limits = {}
+    for rate_limit in exchange_info.get('rateLimits', []):
+        name = get_window_name(rate_limit['rateLimitType'], rate_limit['intervalNum'], rate_limit['interval'])
+        interval_sec = rate_limit['intervalNum'] * INTERVAL_SEC[rate_limit['interval'][0].upper()]
+        if rate_limit['rateLimitType'] == ORDERS:
+            order_limits[name] = (rate_limit['limit'], interval_sec)
+        else:
+            weight_limits[name] = (rate_limit['limit'], interval_sec)
+
+    return weight_limits, order_limits
+
+
+SPOT_WEIGHTS: WeightTableType = {
+    ("GET", "api/v3/depth"): by_limit(100, [(100, 1), (500, 5), (1000, 10), (5000, 50)]),
+    ("GET", "api/v3/historicalTrades"): 5,
+    ("GET", "api/v3/exchangeInfo"): 10,
+    ("GET", "api/v3/ticker/24hr"): by_symbol(1, 40),
+    ("GET", "api/v3/ticker/price"): by_symbol(1, 2),
+    ("GET", "api/v3/ticker/bookTicker"): by_symbol(1, 2),
+    ("GET", "api/v3/order"): 2,
+    ("GET", "api/v3/openOrders"): by_symbol(3, 40),
+    ("GET", "api/v3/allOrders"): 10,
+    ("GET", "api/v3/orderList"): 2,
+    ("GET", "api/v3/allOrderList"): 10,
+    ("GET", "api/v3/openOrderList"): 3,
+    ("GET", "api/v3/account"): 10,
+    ("GET", "api/v3/myTrades"): 10,
+}
+
+SPOT_ORDERS: WeightTableType = {
+    ("POST", "api/v3/order"): 1,
+    ("POST", "api/v3/order/oco"): 2,
+}
+
+SPOT_WEIGHT_LIMITS: LimitsType = {
+    "REQUEST_WEIGHT_1M": (1200, 60),
+    "RAW_REQUESTS_5M": (6100, 300),
+}
+
+SPOT_ORDER_LIMITS: LimitsType = {
+    "ORDERS_10S": (50, 10),
+    "ORDERS_1D": (160000, 86400),
+}
+
+FUTURES_KLINES_WEIGHT = by_limit(500, [(99, 1), (499, 2), (1000, 5), (1500, 10)])
+
+
+def _get_futures_weights(api_v1: str, api_v2: str) -> WeightTableType:
+    return {
+        ("GET", api_v1 + "depth"): by_limit(500, [(50, 2), (100, 5), (500, 10), (1000, 20)]),
+        ("GET", api_v1 + "historicalTrades"): 20,
+        ("GET", api_v1 + "aggTrades"): 20,
+        ("GET", api_v1 + "klines"): FUTURES_KLINES_WEIGHT,
+        ("GET", api_v1 + "continuousKlines"): FUTURES_KLINES_WEIGHT,
+        ("GET", api_v1 + "indexPriceKlines"): FUTURES_KLINES_WEIGHT,
+        ("GET", api_v1 + "markPriceKlines"): FUTURES_KLINES_WEIGHT,
+        ("GET", api_v1 + "ticker/24hr"): by_symbol(1, 40),
+        ("GET", api_v1 + "ticker/price"): by_symbol(1, 2),
+        ("GET", api_v1 + "ticker/bookTicker"): by_symbol(1, 2),
+        ("GET", api_v1 + "allForceOrders"): by_symbol(20, 50),
+        ("GET", api_v1 + "openOrders"): by_symbol(1, 40),
+        ("GET", api_v1 + "allOrders"): 5,
+        ("GET", api_v1 + "userTrades"): 5,
+        ("GET", api_v1 + "income"): 30,
+        ("GET", api_v1 + "account"): 5,
+        ("GET", api_v1 + "balance"): 5,
+        ("GET", api_v1 + "positionRisk"): 5,
+        ("GET", api_v2 + "account"): 5,
+        ("GET", api_v2 + "balance"): 5,
+        ("GET", api_v2 + "positionRisk"): 5,
+        ("POST", api_v1 + "batchOrders"): 5,
+        ("PUT", api_v1 + "batchOrders"): 5,
+        ("DELETE", api_v1 + "batchOrders"): 1,
+    }
+
+
+def _get_futures_orders(api_v1: str) -> WeightTableType:
+    return {
+        ("POST", api_v1 + "order"): 1,
+        ("POST", api_v1 + "batchOrders"): batch_size,
+        ("PUT", api_v1 + "order"): 1,
+        ("PUT", api_v1 + "batchOrders"): batch_size,
+    }
+
+
+USDS_M_FUTURES_WEIGHTS = _get_futures_weights("fapi/v1/", "fapi/v2/")
+USDS_M_FUTURES_ORDERS = _get_futures_orders("fapi/v1/")
+
+USDS_M_FUTURES_WEIGHT_LIMITS: LimitsType = {
+    "REQUEST_WEIGHT_1M": (2400, 60),
+}
+
+USDS_M_FUTURES_ORDER_LIMITS: LimitsType = {
+    "ORDERS_10S": (300, 10),
+    "ORDERS_1M": (1200, 60),
+}
+
+COIN_M_FUTURES_WEIGHTS = _get_futures_weights("dapi/v1/", "dapi/v2/")
+COIN_M_FUTURES_ORDERS = _get_futures_orders("dapi/v1/")
+
+COIN_M_FUTURES_WEIGHT_LIMITS: LimitsType = {
+    "REQUEST_WEIGHT_1M": (2400, 60),
+}
+
+COIN_M_FUTURES_ORDER_LIMITS: LimitsType = {
+    "ORDERS_1M": (1200, 60),
+}
+
+SPOT = BinanceRateLimitProfile("spot", SPOT_WEIGHTS, SPOT_ORDERS, SPOT_WEIGHT_LIMITS, SPOT_ORDER_LIMITS)
+SPOT_TESTNET = BinanceRateLimitProfile("spot_testnet", SPOT_WEIGHTS, SPOT_ORDERS, SPOT_WEIGHT_LIMITS,
+                                       SPOT_ORDER_LIMITS)
+USDS_M_FUTURES = BinanceRateLimitProfile("usds_m_futures", USDS_M_FUTURES_WEIGHTS, USDS_M_FUTURES_ORDERS,
+                                         USDS_M_FUTURES_WEIGHT_LIMITS, USDS_M_FUTURES_ORDER_LIMITS)
+USDS_M_FUTURES_TESTNET = BinanceRateLimitProfile("usds_m_futures_testnet", USDS_M_FUTURES_WEIGHTS,
+                                                 USDS_M_FUTURES_ORDERS, USDS_M_FUTURES_WEIGHT_LIMITS,
+                                                 USDS_M_FUTURES_ORDER_LIMITS)
+COIN_M_FUTURES = BinanceRateLimitProfile("coin_m_futures", COIN_M_FUTURES_WEIGHTS, COIN_M_FUTURES_ORDERS,
+                                         COIN_M_FUTURES_WEIGHT_LIMITS, COIN_M_FUTURES_ORDER_LIMITS)
+COIN_M_FUTURES_TESTNET = BinanceRateLimitProfile("coin_m_futures_testnet", COIN_M_FUTURES_WEIGHTS,
+                                                 COIN_M_FUTURES_ORDERS, COIN_M_FUTURES_WEIGHT_LIMITS,
+                                                 COIN_M_FUTURES_ORDER_LIMITS)
@@ -1,11 +1,12 @@
 import ssl
 import logging
-import hmac
-import hashlib
+import re
 from multidict import CIMultiDictProxy
 from typing import List, Tuple, Optional
 
 from cryptoxlib.CryptoXLibClient import CryptoXLibClient, RestCallType
+from cryptoxlib.LazyJson import LazyJson
+from cryptoxlib.RequestSigner import HmacSigner, get_query_string
 from cryptoxlib.clients.bitforex import enums
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.bitforex.exceptions import BitforexRestException
@@ -19,6 +20,8 @@ LOG = logging.getLogger(__name__)
 class BitforexClient(CryptoXLibClient):
     REST_API_VERSION_URI = "/api/v1/"
     REST_API_URI = "https://api.bitforex.com" + REST_API_VERSION_URI
+    # errors are reported in the body of successful responses
+    ERROR_PATTERN = re.compile(rb'"success"\s*:\s*false')
 
     def __init__(self, api_key: str = None, sec_key: str = None, api_trace_log: bool = False,
                  ssl_context: ssl.SSLContext = None) -> None:
@@ -26,28 +29,31 @@ class BitforexClient(CryptoXLibClient):
 
         self.api_key = api_key
         self.sec_key = sec_key
+        self.signer = HmacSigner(sec_key) if sec_key is not None else None
 
     def _get_rest_api_uri(self) -> str:
         return BitforexClient.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         params['accessKey'] = self.api_key
 
-        params_string = ""
+        # parameters are signed in alphabetical order, the same query string is sent in the request
+        query_string = get_query_string(params, sort = True)
         data_string = ""
 
-        if params is not None:
-            params_string = BitforexClient.REST_API_VERSION_URI + resource + '?'
-            params_string += '&'.join([f"{key}={val}" for key, val in sorted(params.items())])
-
         if data is not None:
             data_string = '&'.join(["{}={}".format(param[0], param[1]) for param in data])
 
-        m = hmac.new(self.sec_key.encode('utf-8'), (params_string + data_string).encode('utf-8'), hashlib.sha256)
+        params['signData'] = self.signer.hexdigest(BitforexClient.REST_API_VERSION_URI + resource + '?' + query_string + data_string)
+
+        signature_data['query_string'] = query_string + '&signData=' + params['signData']
 
-        params['signData'] = m.hexdigest()
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
+        # lazily decoded bodies are decoded only if an error is reported
+        if isinstance(body, LazyJson) and not body.matches_prefix(BitforexClient.ERROR_PATTERN):
+            return
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
         if body['success'] is False:
             raise BitforexRestException(status_code, body)
 
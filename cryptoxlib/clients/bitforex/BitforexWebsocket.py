@@ -1,9 +1,9 @@
-import json
 import logging
 import websockets
 from abc import abstractmethod
 from typing import List, Callable, Any, Union, Optional
 
+from cryptoxlib import json_codec
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.bitforex import enums
@@ -28,12 +28,12 @@ class BitforexWebsocket(WebsocketMgr):
 
     async def _process_periodic(self, websocket: Websocket) -> None:
         if self.ping_checker.check():
-            LOG.debug(f"> {BitforexWebsocket.PING_MSG}")
+            LOG.debug("> %s", BitforexWebsocket.PING_MSG)
             await websocket.send(BitforexWebsocket.PING_MSG)
 
     async def _process_message(self, websocket: Websocket, message: str) -> None:
         if message != BitforexWebsocket.PONG_MSG:
-            message = json.loads(message)
+            message = json_codec.loads(message)
             subscription_id = BitforexSubscription.make_subscription_id(message['event'], message['param'])
             await self.publish_message(WebsocketMessage(subscription_id = subscription_id, message = message))
 
@@ -3,13 +3,15 @@ import logging
 import datetime
 import pytz
 from multidict import CIMultiDictProxy
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from cryptoxlib.CryptoXLibClient import CryptoXLibClient, RestCallType
+from cryptoxlib.RestCache import cached
 from cryptoxlib.clients.bitpanda import enums
 from cryptoxlib.clients.bitpanda.exceptions import BitpandaRestException, BitpandaException
 from cryptoxlib.clients.bitpanda.functions import map_pair
 from cryptoxlib.Pair import Pair
+from cryptoxlib.pagination import paginate
 from cryptoxlib.WebsocketMgr import WebsocketMgr, Subscription
 from cryptoxlib.clients.bitpanda.BitpandaWebsocket import BitpandaWebsocket
 
@@ -19,6 +21,8 @@ LOG = logging.getLogger(__name__)
 
 class BitpandaClient(CryptoXLibClient):
     REST_API_URI = "https://api.exchange.bitpanda.com/public/v1/"
+    # max number of items of history endpoints
+    MAX_PAGE_SIZE = 100
 
     def __init__(self, api_key: str = None, api_trace_log: bool = False,
                  ssl_context: ssl.SSLContext = None) -> None:
@@ -29,10 +33,11 @@ class BitpandaClient(CryptoXLibClient):
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         headers["Authorization"] = "Bearer " + self.api_key
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
         if str(status_code)[0] != '2':
             raise BitpandaRestException(status_code, body)
 
@@ -41,9 +46,17 @@ class BitpandaClient(CryptoXLibClient):
         return BitpandaWebsocket(subscriptions = subscriptions, api_key = self.api_key, ssl_context = ssl_context,
                                  startup_delay_ms = startup_delay_ms)
 
+    async def _fetch_server_timestamp_ms(self) -> int:
+        return (await self.get_time())['response']['epoch_millis']
+
+    async def _send_warmup_request(self) -> None:
+        await self._send_rest_call(RestCallType.GET, "time")
+
+    @cached(ttl_sec = 3600)
     async def get_currencies(self) -> dict:
         return await self._create_get("currencies")
     
+    @cached(ttl_sec = 3600)
     async def get_fee_groups(self) -> dict:
         return await self._create_get("fees")
 
@@ -76,6 +89,23 @@ class BitpandaClient(CryptoXLibClient):
 
         return await self._create_get("account/orders", params = params, signed = True)
 
+    def iter_account_orders(self, from_timestamp: datetime.datetime = None, to_timestamp: datetime.datetime = None,
+                            pair: Pair = None, with_cancelled_and_rejected: str = None,
+                            with_just_filled_inactive: str = None, with_just_orders: str = None,
+                            page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[dict]:
+        """
+        Iterates over the order history, pages are requested by the cursor returned with the previous page.
+        """
+        async def fetch_page(cursor: Optional[str]) -> dict:
+            return await self.get_account_orders(from_timestamp = from_timestamp, to_timestamp = to_timestamp,
+                                                 pair = pair, with_cancelled_and_rejected = with_cancelled_and_rejected,
+                                                 with_just_filled_inactive = with_just_filled_inactive,
+                                                 with_just_orders = with_just_orders, max_page_size = str(page_size),
+                                                 cursor = cursor)
+
+        return paginate(fetch_page, lambda response: response['response'].get('order_history', []),
+                        BitpandaClient._get_next_cursor)
+
     async def get_account_order(self, order_id: str) -> dict:
         return await self._create_get("account/orders/" + order_id, signed = True)
 
@@ -100,6 +130,26 @@ class BitpandaClient(CryptoXLibClient):
 
         return await self._create_get("account/trades", params = params, signed = True)
 
+    def iter_account_trades(self, from_timestamp: datetime.datetime = None, to_timestamp: datetime.datetime = None,
+                            pair: Pair = None, page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[dict]:
+        """
+        Iterates over the trade history, pages are requested by the cursor returned with the previous page.
+        """
+        async def fetch_page(cursor: Optional[str]) -> dict:
+            return await self.get_account_trades(from_timestamp = from_timestamp, to_timestamp = to_timestamp,
+                                                 pair = pair, max_page_size = str(page_size), cursor = cursor)
+
+        return paginate(fetch_page, lambda response: response['response'].get('trade_history', []),
+                        BitpandaClient._get_next_cursor)
+
+    @staticmethod
+    def _get_next_cursor(response: dict, items: List[dict]) -> Optional[str]:
+        # the cursor is omitted on the last page
+        if len(items) == 0:
+            return None
+
+        return response['response'].get('cursor')
+
     async def get_account_trade(self, trade_id: str) -> dict:
         return await self._create_get("account/trades/" + trade_id, signed = True)
 
@@ -207,6 +257,7 @@ class BitpandaClient(CryptoXLibClient):
 
         return await self._create_get("candlesticks/" + map_pair(pair), params = params)
 
+    @cached(ttl_sec = 300)
     async def get_instruments(self) -> dict:
         return await self._create_get("instruments")
 
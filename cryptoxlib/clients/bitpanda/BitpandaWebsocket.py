@@ -1,9 +1,10 @@
-import json
 import logging
-from typing import List, Any
+from typing import List, Any, Hashable, Optional
 
+from cryptoxlib import json_codec
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket, CallbacksType, \
     ClientWebsocketHandle, WebsocketOutboundMessage
+from cryptoxlib.WebsocketRequestTracker import WebsocketRequestTracker
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.bitpanda.functions import map_pair, map_multiple_pairs
 from cryptoxlib.clients.bitpanda import enums
@@ -17,6 +18,16 @@ class BitpandaWebsocket(WebsocketMgr):
     WEBSOCKET_URI = "wss://streams.exchange.bitpanda.com"
     MAX_MESSAGE_SIZE = 3 * 1024 * 1024  # 3MB
 
+    # answers of the ORDERS channel correlated with the requests, see CreateOrderMessage and CancelOrderMessage
+    ACKNOWLEDGEMENT_TYPES = {
+        "ORDER_CREATED": "CREATE_ORDER",
+        "ORDER_SUBMITTED_FOR_CANCELLATION": "CANCEL_ORDER"
+    }
+    REJECTION_TYPES = {
+        "ORDER_CREATION_FAILED": "CREATE_ORDER",
+        "CANCEL_ORDER_FAILED": "CANCEL_ORDER"
+    }
+
     def __init__(self, subscriptions: List[Subscription], api_key: str = None, ssl_context = None,
                  startup_delay_ms: int = 0) -> None:
         super().__init__(websocket_uri = self.WEBSOCKET_URI, subscriptions = subscriptions,
@@ -26,6 +37,7 @@ class BitpandaWebsocket(WebsocketMgr):
                          startup_delay_ms = startup_delay_ms)
 
         self.api_key = api_key
+        self.request_tracker = WebsocketRequestTracker()
 
     def get_websocket(self) -> Websocket:
         return self.get_aiohttp_websocket()
@@ -43,13 +55,13 @@ class BitpandaWebsocket(WebsocketMgr):
                 "api_token": self.api_key
             }
 
-            LOG.debug(f"> {authentication_message}")
-            await self.websocket.send(json.dumps(authentication_message))
+            LOG.debug("> %s", authentication_message)
+            await self.websocket.send(json_codec.dumps(authentication_message))
 
             message = await self.websocket.receive()
-            LOG.debug(f"< {message}")
+            LOG.debug("< %s", message)
 
-            message = json.loads(message)
+            message = json_codec.loads(message)
             if 'type' in message and message['type'] == 'AUTHENTICATED':
                 LOG.info(f"Websocket authenticated successfully.")
             else:
@@ -74,22 +86,22 @@ class BitpandaWebsocket(WebsocketMgr):
     async def send_subscription_message(self, subscriptions: List[Subscription]):
         subscription_message =  self._get_subscription_message(subscriptions)
 
-        LOG.debug(f"> {subscription_message}")
-        await self.websocket.send(json.dumps(subscription_message))
+        LOG.debug("> %s", subscription_message)
+        await self.websocket.send(json_codec.dumps(subscription_message))
 
     async def send_unsubscription_message(self, subscriptions: List[Subscription]):
         unsubscription_message = self._get_unsubscription_message(subscriptions)
 
-        LOG.debug(f"> {unsubscription_message}")
-        await self.websocket.send(json.dumps(unsubscription_message))
+        LOG.debug("> %s", unsubscription_message)
+        await self.websocket.send(json_codec.dumps(unsubscription_message))
 
     async def _process_message(self, websocket: Websocket, message: str) -> None:
-        message = json.loads(message)
+        message = json_codec.loads(message)
 
         # subscription negative response
         if "error" in message or message['type'] == "ERROR":
             raise BitpandaException(
-                f"Subscription error. Request [{json.dumps(self._get_subscription_message())}] Response [{json.dumps(message)}]")
+                f"Subscription error. Request [{json_codec.dumps(self._get_subscription_message())}] Response [{json_codec.dumps(message)}]")
 
         # subscription positive response
         elif message['type'] == "SUBSCRIPTIONS":
@@ -101,7 +113,7 @@ class BitpandaWebsocket(WebsocketMgr):
                 await self.publish_message(WebsocketMessage(
                     subscription_id = 'ORDERS',
                     message = message,
-                    websocket = ClientWebsocketHandle(websocket = websocket)
+                    websocket = self.get_client_websocket_handle(websocket)
                 ))
 
         # remote termination with an opportunity to reconnect
@@ -115,13 +127,33 @@ class BitpandaWebsocket(WebsocketMgr):
 
         # regular message
         else:
+            if message['channel_name'] == 'ORDERS' and self.request_tracker.has_pending_requests():
+                self._correlate_order_message(message)
+
             await self.publish_message(WebsocketMessage(
                 subscription_id = message['channel_name'],
                 message = message,
                 # for ORDERS channel communicate also the websocket handle
-                websocket = ClientWebsocketHandle(websocket = websocket) if message['channel_name'] == 'ORDERS' else None
+                websocket = self.get_client_websocket_handle(websocket) if message['channel_name'] == 'ORDERS' else None
             ))
 
+    def _correlate_order_message(self, message: dict) -> None:
+        if message['type'] in self.ACKNOWLEDGEMENT_TYPES:
+            request_type = self.ACKNOWLEDGEMENT_TYPES[message['type']]
+            resolve = self.request_tracker.resolve
+        elif message['type'] in self.REJECTION_TYPES:
+            request_type = self.REJECTION_TYPES[message['type']]
+            resolve = self.request_tracker.reject
+        else:
+            return
+
+        # requests are identified either by the order id or the client id, the ids are either part of the order
+        # or of the message itself
+        order = message.get('order', message)
+        for id_name in ('client_id', 'order_id'):
+            if id_name in order and resolve((request_type, order[id_name]), message):
+                return
+
 
 class BitpandaSubscription(Subscription):
     def __init__(self, callbacks: CallbacksType = None):
@@ -320,6 +352,13 @@ class CreateOrderMessage(WebsocketOutboundMessage):
 
         return ret
 
+    def get_request_id(self) -> Optional[Hashable]:
+        # acknowledgements can be correlated only by the client id
+        if self.client_id is None:
+            return None
+
+        return "CREATE_ORDER", self.client_id
+
 
 class CancelOrderMessage(WebsocketOutboundMessage):
     def __init__(self, order_id: str = None, client_id: str = None):
@@ -339,6 +378,15 @@ class CancelOrderMessage(WebsocketOutboundMessage):
 
         return ret
 
+    def get_request_id(self) -> Optional[Hashable]:
+        if self.order_id is not None:
+            return "CANCEL_ORDER", self.order_id
+        elif self.client_id is not None:
+            return "CANCEL_ORDER", self.client_id
+
+        # the acknowledgement cannot be correlated
+        return None
+
 
 class CancelAllOrdersMessage(WebsocketOutboundMessage):
     def __init__(self, order_ids: List[str] = None, pair: Pair = None):
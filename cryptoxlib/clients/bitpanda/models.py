@@ -0,0 +1,21 @@
+from typing import List
+
+from cryptoxlib.models import BookLevel
+
+# Decoders of bitpanda payloads into the compact models, see cryptoxlib.models.
+
+
+def decode_order_book_update(message: dict) -> List[BookLevel]:
+    # ORDER_BOOK_UPDATE event, changes are [side, price, amount]
+    return [BookLevel(change[1], change[2], change[0]) for change in message['changes']]
+
+
+def _get_book_levels(levels: list, side: str) -> List[BookLevel]:
+    # levels are [price, amount] in websocket snapshots and objects in the order book endpoint
+    return [BookLevel(level['price'], level['amount'], side) if isinstance(level, dict) else
+            BookLevel(level[0], level[1], side) for level in levels]
+
+
+def decode_order_book_snapshot(message: dict) -> List[BookLevel]:
+    # ORDER_BOOK_SNAPSHOT event or the order book endpoint at level 2
+    return _get_book_levels(message['bids'], 'BUY') + _get_book_levels(message['asks'], 'SELL')
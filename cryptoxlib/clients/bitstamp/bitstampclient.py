@@ -1,16 +1,18 @@
 import ssl
 import logging
-import hmac
-import hashlib
 import uuid
 import json
 from urllib.parse import urlencode
 
 from multidict import CIMultiDictProxy
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from cryptoxlib.CryptoXLibClient import CryptoXLibClient, RestCallType, ContentType
+from cryptoxlib.RestCache import cached
+from cryptoxlib.LazyJson import LazyJson
+from cryptoxlib.RequestSigner import HmacSigner, get_query_string
 from cryptoxlib.Pair import Pair
+from cryptoxlib.pagination import paginate_concurrently, get_offsets
 from cryptoxlib.clients.bitstamp.bitstampwebsocket import BitstampWebsocket
 from cryptoxlib.clients.bitstamp.enums import Group, Time, Step, Sort
 from cryptoxlib.clients.bitstamp.exceptions import BitstampRestException, BitstampException, BitstampSignatureException
@@ -30,6 +32,8 @@ class BitstampClient(CryptoXLibClient):
     PATH_PREFIX = "/api/" + VERSION + "/"
     REST_API_URI = PROTOCOL + HOST + PATH_PREFIX
     HOSTNAME = "BITSTAMP"
+    # max number of items of history endpoints
+    MAX_PAGE_SIZE = 1000
 
     def __init__(self,
                  api_key: str = None,
@@ -40,6 +44,7 @@ class BitstampClient(CryptoXLibClient):
         super().__init__(api_trace_log, ssl_context)
         self.api_key = api_key
         self.sec_key = sec_key
+        self.signer = HmacSigner(sec_key) if sec_key is not None else None
 
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
@@ -59,22 +64,21 @@ class BitstampClient(CryptoXLibClient):
         timestamp = str(self._get_current_timestamp_ms())
         nonce = str(uuid.uuid4())
         content_type = "" if data is None else "application/x-www-form-urlencoded"
-        query = "" if params is None or params == {} else "?" + urlencode(params)
+        query_string = "" if params is None else get_query_string(params)
         payload = "" if data is None else urlencode(data)
 
         message = self.HOSTNAME + " " + self.api_key + \
                   rest_call_type.value + \
                   self.HOST + \
                   self.PATH_PREFIX + resource + \
-                  query + \
+                  ("" if query_string == "" else "?" + query_string) + \
                   content_type + \
                   nonce + \
                   timestamp + \
                   self.VERSION + \
                   payload
 
-        message = message.encode("utf-8")
-        signature = hmac.new(self.sec_key, msg=message, digestmod=hashlib.sha256).hexdigest()
+        signature = self.signer.hexdigest(message)
         headers.update({
             "X-Auth": self.HOSTNAME + " " + self.api_key,
             "X-Auth-Signature": signature,
@@ -88,7 +92,8 @@ class BitstampClient(CryptoXLibClient):
 
         signature_data.update({
             "nonce": nonce,
-            "timestamp": timestamp
+            "timestamp": timestamp,
+            "query_string": query_string
         })
 
     def _preprocess_rest_response(self,
@@ -100,8 +105,10 @@ class BitstampClient(CryptoXLibClient):
         if str(status_code)[0] != '2':
             raise BitstampRestException(status_code, body)
         if signature_data["signed"]:
+            if isinstance(body, LazyJson):
+                body = body.get_value()
             string_to_sign = (signature_data["nonce"] + signature_data["timestamp"] + headers.get("Content-Type")).encode('utf-8') + json.dumps(body).encode("utf-8")
-            signature_check = hmac.new(self.sec_key, msg=string_to_sign, digestmod=hashlib.sha256).hexdigest()
+            signature_check = self.signer.hexdigest(string_to_sign)
             if not headers.get("X-Server-Auth-Signature") == signature_check:
                 raise BitstampSignatureException(status_code, body)
 
@@ -136,6 +143,7 @@ class BitstampClient(CryptoXLibClient):
         params = {"time": time.value} if time is not None else None
         return await self._create_get(f"transactions/{currency_pair}/", params=params, signed=False)
 
+    @cached(ttl_sec = 300)
     async def get_trading_pairs_info(self) -> dict:
         return await self._create_get("trading-pairs-info/", signed=False)
 
@@ -181,7 +189,19 @@ class BitstampClient(CryptoXLibClient):
         if since_id is not None:
             data["since_id"] = str(since_id)
 
-        return await self._create_post("user_transactions/", signed=True, content_type=ContentType.URL_ENCODED)
+        return await self._create_post("user_transactions/", data=data, signed=True, content_type=ContentType.URL_ENCODED)
+
+    def iter_user_transactions(self, sort: Sort, since_timestamp: int = None, since_id: int = None,
+                               page_size: int = MAX_PAGE_SIZE, concurrency: int = 4) -> AsyncIterator[dict]:
+        """
+        Iterates over user transactions, pages are requested by offset and fetched concurrently.
+        """
+        async def fetch_page(offset: int) -> dict:
+            return await self.get_user_transactions(offset, page_size, sort, since_timestamp, since_id)
+
+        return paginate_concurrently(fetch_page, lambda response: response['response'], get_offsets(page_size),
+                                     concurrency = concurrency,
+                                     is_last_page = lambda transactions: len(transactions) < page_size)
 
     async def get_user_transaction(self, base: str, quote: str, offset: int, limit: int, sort: Sort, since_timestamp: int = None, since_id: int = None) -> dict:
 
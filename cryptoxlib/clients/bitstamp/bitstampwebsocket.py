@@ -1,11 +1,11 @@
 import abc
 import asyncio
-import json
 import logging
 import ssl
 from abc import ABC
 from typing import List, Any
 
+from cryptoxlib import json_codec
 from cryptoxlib.Pair import Pair
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket, CallbacksType
 from cryptoxlib.clients.bitstamp.enums import Event, Status
@@ -67,18 +67,18 @@ class BitstampWebsocket(WebsocketMgr):
 
     async def send_subscription_message(self, subscriptions: List[Subscription]):
         messages = self.get_subscription_messages(subscriptions)
-        LOG.debug(f"> {messages}")
-        tasks = [async_create_task(self.websocket.send(json.dumps(message))) for message in messages]
+        LOG.debug("> %s", messages)
+        tasks = [async_create_task(self.websocket.send(json_codec.dumps(message))) for message in messages]
         await asyncio.gather(*tasks)
 
     async def send_unsubscription_message(self, subscriptions: List[Subscription]):
         messages = self.get_unsubscription_messages(subscriptions)
-        LOG.debug(f"> {messages}")
-        tasks = [async_create_task(self.websocket.send(json.dumps(message))) for message in messages]
+        LOG.debug("> %s", messages)
+        tasks = [async_create_task(self.websocket.send(json_codec.dumps(message))) for message in messages]
         await asyncio.gather(*tasks)
 
     async def _process_message(self, websocket: Websocket, message: str) -> None:
-        response = json.loads(message)
+        response = json_codec.loads(message)
 
         if response["event"] == Event.ERROR.value:
             LOG.error(f"Subscription error. Response [{response}]")
@@ -101,7 +101,6 @@ class BitstampWebsocket(WebsocketMgr):
             LOG.info(f"Successful reconnect'. Response[{response}]")
 
         else:
-            LOG.info(f"Response: [{response}]")
             await self.publish_message(
                 WebsocketMessage(
                     subscription_id=response["channel"],
@@ -111,7 +110,7 @@ class BitstampWebsocket(WebsocketMgr):
 
     async def send_heartbeat_message(self):
         message = {"event": Event.HEARTBEAT.value}
-        await self.websocket.send(json.dumps(message))
+        await self.websocket.send(json_codec.dumps(message))
 
     async def _process_periodic(self, websocket: Websocket) -> None:
         await self.send_heartbeat_message()
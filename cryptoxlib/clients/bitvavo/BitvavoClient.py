@@ -32,7 +32,7 @@ class BitvavoClient(CryptoXLibClient):
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         timestamp = self._get_current_timestamp_ms()
 
         resource_string = resource
@@ -49,7 +49,7 @@ class BitvavoClient(CryptoXLibClient):
         if data is not None:
             signature_string += json.dumps(data, separators=(',',':'))
 
-        LOG.debug(f"Signature input string: {signature_string}")
+        LOG.debug("Signature input string: %s", signature_string)
         signature = hmac.new(self.sec_key.encode('utf-8'), signature_string.encode('utf-8'), hashlib.sha256).hexdigest()
 
         headers['Bitvavo-Access-Key'] = self.api_key
@@ -57,13 +57,21 @@ class BitvavoClient(CryptoXLibClient):
         headers['Bitvavo-Access-Timestamp'] = str(timestamp)
         headers['Bitvavo-Access-Window'] = str(self.VALIDITY_WINDOW_MS)
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
         if str(status_code)[0] != '2':
             raise BitvavoException(f"BitvavoException: status [{status_code}], response [{body}]")
 
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
-        return BitvavoWebsocket(subscriptions, self.api_key, self.sec_key, ssl_context)
+        return BitvavoWebsocket(subscriptions, self.api_key, self.sec_key, ssl_context,
+                                timestamp_source = self._get_current_timestamp_ms)
+
+    async def _fetch_server_timestamp_ms(self) -> int:
+        return (await self.get_time())['response']['time']
+
+    async def _send_warmup_request(self) -> None:
+        await self._send_rest_call(RestCallType.GET, "time")
 
     async def get_time(self) -> dict:
         return await self._create_get("time")
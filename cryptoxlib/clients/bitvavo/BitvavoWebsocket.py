@@ -1,11 +1,11 @@
-import json
 import logging
 import websockets
 import hmac
 import hashlib
-import datetime
-from typing import List, Callable, Any, Optional
+from typing import List, Callable, Any, Optional, Hashable
 
+from cryptoxlib import json_codec
+from cryptoxlib.ServerClock import get_local_timestamp_ms
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.bitvavo.functions import map_pair
@@ -19,13 +19,16 @@ class BitvavoWebsocket(WebsocketMgr):
     WEBSOCKET_URI = "wss://ws.bitvavo.com/v2/"
 
     def __init__(self, subscriptions: List[Subscription], api_key: str = None, sec_key: str = None,
-                 ssl_context = None) -> None:
+                 ssl_context = None,
+                 timestamp_source: Callable[[], int] = None) -> None:
         super().__init__(websocket_uri = self.WEBSOCKET_URI, subscriptions = subscriptions,
                          ssl_context = ssl_context,
                          auto_reconnect = True)
 
         self.api_key = api_key
         self.sec_key = sec_key
+        # timestamps of authentication messages follow the exchange time if available
+        self.timestamp_source = timestamp_source if timestamp_source is not None else get_local_timestamp_ms
 
     async def send_authentication_message(self):
         requires_authentication = False
@@ -35,7 +38,7 @@ class BitvavoWebsocket(WebsocketMgr):
                 break
 
         if requires_authentication:
-            timestamp = int(datetime.datetime.now(tz = datetime.timezone.utc).timestamp() * 1000)
+            timestamp = self.timestamp_source()
             signature_string = str(timestamp) + 'GET/v2/websocket'
             signature = hmac.new(self.sec_key.encode('utf-8'), signature_string.encode('utf-8'),
                                  hashlib.sha256).hexdigest()
@@ -47,18 +50,18 @@ class BitvavoWebsocket(WebsocketMgr):
                 "timestamp": timestamp
             }
 
-            LOG.debug(f"> {authentication_message}")
-            await self.websocket.send(json.dumps(authentication_message))
+            LOG.debug("> %s", authentication_message)
+            await self.websocket.send(json_codec.dumps(authentication_message))
 
             message = await self.websocket.receive()
-            LOG.debug(f"< {message}")
+            LOG.debug("< %s", message)
 
-            message = json.loads(message)
+            message = json_codec.loads(message)
             if 'event' in message and message['event'] == 'authenticate' and \
                     'authenticated' in message and message['authenticated'] is True:
                 LOG.info(f"Websocket authenticated successfully.")
             else:
-                raise BitvavoException(f"Authentication error. Response [{json.dumps(message)}]")
+                raise BitvavoException(f"Authentication error. Response [{json_codec.dumps(message)}]")
 
     async def send_subscription_message(self, subscriptions: List[Subscription]):
         subscription_message = {
@@ -68,22 +71,22 @@ class BitvavoWebsocket(WebsocketMgr):
             ]
         }
 
-        LOG.debug(f"> {subscription_message}")
-        await self.websocket.send(json.dumps(subscription_message))
+        LOG.debug("> %s", subscription_message)
+        await self.websocket.send(json_codec.dumps(subscription_message))
 
     async def _process_message(self, websocket: websockets.WebSocketClientProtocol, message: str) -> None:
-        message = json.loads(message)
+        message = json_codec.loads(message)
 
         # subscription negative response
         if 'action' in message and message['action'] == 'subscribe' and "error" in message:
-            raise BitvavoException(f"Subscription error. Response [{json.dumps(message)}]")
+            raise BitvavoException(f"Subscription error. Response [{json_codec.dumps(message)}]")
 
         # subscription positive response
         if 'event' in message and message['event'] == 'subscribed':
             if len(message['subscriptions']) > 0:
                 LOG.info(f"Subscription confirmed for channels [{message['subscriptions']}]")
             else:
-                raise BitvavoException(f"Subscription error. No subscription confirmed. Response [{json.dumps(message)}]")
+                raise BitvavoException(f"Subscription error. No subscription confirmed. Response [{json_codec.dumps(message)}]")
 
         # regular message
         else:
@@ -148,6 +151,9 @@ class TickerSubscription(BitvavoSubscription):
     def get_channel_name():
         return "ticker"
 
+    def get_conflation_key(self, message: WebsocketMessage) -> Hashable:
+        return message.message['market']
+
     def get_subscription_message(self, **kwargs) -> dict:
         return {
             "name": self.get_channel_name(),
@@ -167,6 +173,9 @@ class Ticker24Subscription(BitvavoSubscription):
     def get_channel_name():
         return "ticker24h"
 
+    def get_conflation_key(self, message: WebsocketMessage) -> Hashable:
+        return message.message['market']
+
     def get_subscription_message(self, **kwargs) -> dict:
         return {
             "name": self.get_channel_name(),
@@ -33,27 +33,36 @@ class BtseClient(CryptoXLibClient):
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         timestamp = self._get_current_timestamp_ms()
 
         signature_string = f"/api/v3.1/{resource}{timestamp}"
         if data is not None:
             signature_string += json.dumps(data)
 
-        LOG.debug(f"Signature input string: {signature_string}")
+        LOG.debug("Signature input string: %s", signature_string)
         signature = hmac.new(self.sec_key.encode('utf-8'), signature_string.encode('utf-8'), hashlib.sha384).hexdigest()
 
         headers['btse-api'] = self.api_key
         headers['btse-nonce'] = str(timestamp)
         headers['btse-sign'] = signature
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
         if str(status_code)[0] != '2':
             raise BtseRestException(status_code, body)
 
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
-        return BtseWebsocket(subscriptions, self.api_key, self.sec_key, ssl_context)
+        return BtseWebsocket(subscriptions, self.api_key, self.sec_key, ssl_context,
+                             timestamp_source = self._get_current_timestamp_ms)
+
+    async def _fetch_server_timestamp_ms(self) -> int:
+        # the server time is provided in seconds
+        return int(float((await self.get_time())['response']['epoch']) * 1000)
+
+    async def _send_warmup_request(self) -> None:
+        await self._send_rest_call(RestCallType.GET, "time", headers = self._get_header())
 
     def _get_header(self):
         header = {
@@ -1,11 +1,11 @@
-import json
 import logging
-import datetime
 import websockets
 import hmac
 import hashlib
 from typing import List, Callable, Any, Optional
 
+from cryptoxlib import json_codec
+from cryptoxlib.ServerClock import get_local_timestamp_ms
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket, CallbacksType
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.btse.functions import map_pair
@@ -19,7 +19,8 @@ class BtseWebsocket(WebsocketMgr):
     WEBSOCKET_URI = "wss://ws.btse.com/spotWS"
 
     def __init__(self, subscriptions: List[Subscription], api_key: str = None, sec_key: str = None,
-                 ssl_context = None) -> None:
+                 ssl_context = None,
+                 timestamp_source: Callable[[], int] = None) -> None:
         super().__init__(websocket_uri = self.WEBSOCKET_URI, subscriptions = subscriptions,
                          ssl_context = ssl_context,
                          builtin_ping_interval = None,
@@ -28,6 +29,8 @@ class BtseWebsocket(WebsocketMgr):
 
         self.api_key = api_key
         self.sec_key = sec_key
+        # timestamps of authentication messages follow the exchange time if available
+        self.timestamp_source = timestamp_source if timestamp_source is not None else get_local_timestamp_ms
 
         self.ping_checker = PeriodicChecker(period_ms = 30 * 1000)
 
@@ -46,7 +49,7 @@ class BtseWebsocket(WebsocketMgr):
                 break
 
         if requires_authentication:
-            timestamp_ms = int(datetime.datetime.now(tz = datetime.timezone.utc).timestamp() * 1000)
+            timestamp_ms = self.timestamp_source()
             signature_string = f"/spotWS{timestamp_ms}"
             signature = hmac.new(self.sec_key.encode('utf-8'), signature_string.encode('utf-8'),
                                  hashlib.sha384).hexdigest()
@@ -56,13 +59,13 @@ class BtseWebsocket(WebsocketMgr):
                 "args": [self.api_key, timestamp_ms, signature]
             }
 
-            LOG.debug(f"> {authentication_message}")
-            await self.websocket.send(json.dumps(authentication_message))
+            LOG.debug("> %s", authentication_message)
+            await self.websocket.send(json_codec.dumps(authentication_message))
 
             message = await self.websocket.receive()
-            LOG.debug(f"< {message}")
+            LOG.debug("< %s", message)
 
-            message = json.loads(message)
+            message = json_codec.loads(message)
             if 'success' in message and message['success'] is True:
                 LOG.info(f"Authenticated websocket connected successfully.")
             else:
@@ -78,14 +81,14 @@ class BtseWebsocket(WebsocketMgr):
             "args": subscription_list
         }
 
-        LOG.debug(f"> {subscription_message}")
-        await self.websocket.send(json.dumps(subscription_message))
+        LOG.debug("> %s", subscription_message)
+        await self.websocket.send(json_codec.dumps(subscription_message))
 
         message = await self.websocket.receive()
-        LOG.debug(f"< {message}")
+        LOG.debug("< %s", message)
 
         try:
-            message = json.loads(message)
+            message = json_codec.loads(message)
             if message['event'] == 'subscribe' and len(message['channel']) > 0:
                 LOG.info(f"Websocket subscribed successfully.")
             else:
@@ -94,7 +97,7 @@ class BtseWebsocket(WebsocketMgr):
             raise BtseException(f"Subscription error. Response [{message}]")
 
     async def _process_message(self, websocket: Websocket, message: str) -> None:
-        message = json.loads(message)
+        message = json_codec.loads(message)
         topic = message['topic']
         channel = topic.split(':')[0]
 
@@ -1,13 +1,15 @@
 import ssl
 import logging
+import re
 import datetime
-import hmac
-import hashlib
 import pytz
 from multidict import CIMultiDictProxy
 from typing import List, Optional
 
 from cryptoxlib.CryptoXLibClient import CryptoXLibClient, RestCallType
+from cryptoxlib.RestCache import cached
+from cryptoxlib.LazyJson import LazyJson
+from cryptoxlib.RequestSigner import HmacSigner, get_query_string
 from cryptoxlib.clients.coinmate.functions import map_pair
 from cryptoxlib.clients.coinmate.exceptions import CoinmateRestException, CoinmateException
 from cryptoxlib.clients.coinmate import enums
@@ -21,6 +23,8 @@ LOG = logging.getLogger(__name__)
 
 class CoinmateClient(CryptoXLibClient):
     REST_API_URI = "https://coinmate.io/api/"
+    # errors are reported in the body of successful responses
+    ERROR_PATTERN = re.compile(rb'"error"\s*:\s*true')
 
     def __init__(self, user_id: str = None, api_key: str = None, sec_key: str = None, api_trace_log: bool = False,
                  ssl_context: ssl.SSLContext = None) -> None:
@@ -29,25 +33,31 @@ class CoinmateClient(CryptoXLibClient):
         self.user_id = user_id
         self.api_key = api_key
         self.sec_key = sec_key
+        self.signer = HmacSigner(sec_key) if sec_key is not None else None
 
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         nonce = self._get_current_timestamp_ms()
         input_message = str(nonce) + str(self.user_id) + self.api_key
 
-        m = hmac.new(self.sec_key.encode('utf-8'), input_message.encode('utf-8'), hashlib.sha256)
-
-        params['signature'] = m.hexdigest().upper()
+        params['signature'] = self.signer.hexdigest(input_message).upper()
         params['clientId'] = self.user_id
         params['publicKey'] = self.api_key
         params['nonce'] = nonce
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
+        signature_data['query_string'] = get_query_string(params)
+
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
         if str(status_code)[0] != '2':
             raise CoinmateRestException(status_code, body)
         else:
+            # lazily decoded bodies are decoded only if an error is reported
+            if isinstance(body, LazyJson) and not body.matches_prefix(CoinmateClient.ERROR_PATTERN):
+                return
+
             if "error" in body and body['error'] is True:
                 raise CoinmateRestException(status_code, body)
 
@@ -58,9 +68,11 @@ class CoinmateClient(CryptoXLibClient):
                                  ssl_context = ssl_context,
                                  startup_delay_ms = startup_delay_ms)
 
+    @cached(ttl_sec = 300)
     async def get_exchange_info(self) -> dict:
         return await self._create_get("tradingPairs")
 
+    @cached(ttl_sec = 300)
     async def get_currency_pairs(self) -> dict:
         return await self._create_get("products")
 
@@ -32,7 +32,7 @@ class EterbaseClient(CryptoXLibClient):
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         http_date = datetime.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")
 
         headers["Date"] = http_date
@@ -49,7 +49,8 @@ class EterbaseClient(CryptoXLibClient):
                                    'signature="' + signature + '"'
         headers["Content-Type"] = "application/json"
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
         if str(status_code)[0] != '2':
             raise EterbaseRestException(status_code, body)
 
@@ -1,10 +1,10 @@
-import json
 import logging
 import datetime
 import hmac
 import hashlib
 from typing import List, Any
 
+from cryptoxlib import json_codec
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket, CallbacksType
 from cryptoxlib.clients.eterbase.exceptions import EterbaseException
 
@@ -46,17 +46,17 @@ class EterbaseWebsocket(WebsocketMgr):
         ping_msg = {
             "type": "ping"
         }
-        LOG.debug(f"> {ping_msg}")
-        await websocket.send(json.dumps(ping_msg))
+        LOG.debug("> %s", ping_msg)
+        await websocket.send(json_codec.dumps(ping_msg))
 
     async def send_subscription_message(self, subscriptions: List[Subscription]):
         for subscription in subscriptions:
             subscription_message = subscription.get_subscription_message(account_id = self.account_id)
-            LOG.debug(f"> {subscription_message}")
-            await self.websocket.send(json.dumps(subscription_message))
+            LOG.debug("> %s", subscription_message)
+            await self.websocket.send(json_codec.dumps(subscription_message))
 
     async def _process_message(self, websocket: Websocket, message: str) -> None:
-        message = json.loads(message)
+        message = json_codec.loads(message)
 
         if 'type' not in message:
             LOG.error(f"ERROR: Message without 'type' property received: {message}")
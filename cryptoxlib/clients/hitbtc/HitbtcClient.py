@@ -7,6 +7,7 @@ from multidict import CIMultiDictProxy
 from typing import List, Optional
 
 from cryptoxlib.CryptoXLibClient import CryptoXLibClient, RestCallType
+from cryptoxlib.RestCache import cached
 from cryptoxlib.clients.hitbtc import enums
 from cryptoxlib.clients.hitbtc.exceptions import HitbtcRestException
 from cryptoxlib.clients.hitbtc.functions import map_pair
@@ -31,17 +32,20 @@ class HitbtcClient(CryptoXLibClient):
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         headers["Authorization"] = "Basic " + base64.b64encode(bytes(f"{self.api_key}:{self.sec_key}", "utf-8")).decode('utf-8')
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
         if str(status_code)[0] != '2':
             raise HitbtcRestException(status_code, body)
 
     def _get_websocket_mgr(self, subscriptions: List[Subscription], startup_delay_ms: int = 0,
                            ssl_context = None) -> WebsocketMgr:
-        return HitbtcWebsocket(subscriptions, self.api_key, self.sec_key, ssl_context, startup_delay_ms)
+        return HitbtcWebsocket(subscriptions, self.api_key, self.sec_key, ssl_context, startup_delay_ms,
+                               timestamp_source = self._get_current_timestamp_ms)
 
+    @cached(ttl_sec = 3600)
     async def get_currencies(self, currencies: List[str] = None) -> dict:
         params = {}
         if currencies:
@@ -52,6 +56,7 @@ class HitbtcClient(CryptoXLibClient):
     async def get_currency(self, currency: str) -> dict:
         return await self._create_get(f"public/currency/{currency}")
 
+    @cached(ttl_sec = 300)
     async def get_symbols(self, pairs: List[Pair] = None) -> dict:
         params = {}
         if pairs is not None:
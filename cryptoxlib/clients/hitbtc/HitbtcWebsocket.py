@@ -1,13 +1,15 @@
-import json
 import logging
 import datetime
 import hmac
 import pytz
 import hashlib
-from typing import List, Any
+from typing import List, Any, Hashable, Optional, Callable
 
+from cryptoxlib import json_codec
+from cryptoxlib.ServerClock import get_local_timestamp_ms
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket, CallbacksType, \
     ClientWebsocketHandle, WebsocketOutboundMessage
+from cryptoxlib.WebsocketRequestTracker import WebsocketRequestTracker
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.hitbtc.functions import map_pair
 from cryptoxlib.clients.hitbtc.exceptions import HitbtcException
@@ -21,7 +23,8 @@ class HitbtcWebsocket(WebsocketMgr):
     MAX_MESSAGE_SIZE = 3 * 1024 * 1024  # 3MB
 
     def __init__(self, subscriptions: List[Subscription], api_key: str = None, sec_key: str = None,
-                 ssl_context = None, startup_delay_ms: int = 0) -> None:
+                 ssl_context = None, startup_delay_ms: int = 0,
+                 timestamp_source: Callable[[], int] = None) -> None:
         super().__init__(websocket_uri = self.WEBSOCKET_URI, subscriptions = subscriptions,
                          ssl_context = ssl_context,
                          builtin_ping_interval = None,
@@ -31,6 +34,9 @@ class HitbtcWebsocket(WebsocketMgr):
 
         self.api_key = api_key
         self.sec_key = sec_key
+        # timestamps of authentication messages follow the exchange time if available
+        self.timestamp_source = timestamp_source if timestamp_source is not None else get_local_timestamp_ms
+        self.request_tracker = WebsocketRequestTracker()
 
     def get_websocket(self) -> Websocket:
         return self.get_aiohttp_websocket()
@@ -43,7 +49,7 @@ class HitbtcWebsocket(WebsocketMgr):
                 break
 
         if requires_authentication:
-            timestamp_ms = str(int(datetime.datetime.now(tz = datetime.timezone.utc).timestamp() * 1000))
+            timestamp_ms = str(self.timestamp_source())
             signature = hmac.new(self.sec_key.encode('utf-8'), timestamp_ms.encode('utf-8'),
                                  hashlib.sha256).hexdigest()
 
@@ -57,13 +63,13 @@ class HitbtcWebsocket(WebsocketMgr):
                 }
             }
 
-            LOG.debug(f"> {authentication_message}")
-            await self.websocket.send(json.dumps(authentication_message))
+            LOG.debug("> %s", authentication_message)
+            await self.websocket.send(json_codec.dumps(authentication_message))
 
             message = await self.websocket.receive()
-            LOG.debug(f"< {message}")
+            LOG.debug("< %s", message)
 
-            message = json.loads(message)
+            message = json_codec.loads(message)
             if 'result' in message and message['result'] == True:
                 LOG.info(f"Authenticated websocket connected successfully.")
             else:
@@ -72,11 +78,18 @@ class HitbtcWebsocket(WebsocketMgr):
     async def send_subscription_message(self, subscriptions: List[Subscription]):
         for subscription in subscriptions:
             subscription_message = subscription.get_subscription_message()
-            LOG.debug(f"> {subscription_message}")
-            await self.websocket.send(json.dumps(subscription_message))
+            LOG.debug("> %s", subscription_message)
+            await self.websocket.send(json_codec.dumps(subscription_message))
 
     async def _process_message(self, websocket: Websocket, message: str) -> None:
-        message = json.loads(message)
+        message = json_codec.loads(message)
+
+        # answers to requests (e.g. orders) carry the id of the request
+        if 'id' in message and self.request_tracker.has_pending_requests():
+            if 'error' in message:
+                self.request_tracker.reject(message['id'], message)
+            elif 'result' in message:
+                self.request_tracker.resolve(message['id'], message)
 
         if 'id' in message and 'result' in message and message['result'] == True:
             # subscription confirmation
@@ -86,7 +99,7 @@ class HitbtcWebsocket(WebsocketMgr):
                         await self.publish_message(WebsocketMessage(
                             subscription_id = 'account',
                             message = message,
-                            websocket = ClientWebsocketHandle(websocket = websocket)
+                            websocket = self.get_client_websocket_handle(websocket)
                         ))
         else:
             # regular message
@@ -95,7 +108,7 @@ class HitbtcWebsocket(WebsocketMgr):
                 subscription_id = subscription_id,
                 message = message,
                 # for account channel communicate also the websocket handle
-                websocket = ClientWebsocketHandle(websocket = websocket) if subscription_id == 'account' else None
+                websocket = self.get_client_websocket_handle(websocket) if subscription_id == 'account' else None
             )
             )
 
@@ -192,6 +205,9 @@ class TickerSubscription(HitbtcSubscription):
     def construct_subscription_id(self) -> Any:
         return f"ticker{map_pair(self.pair)}"
 
+    def get_conflation_key(self, message: WebsocketMessage) -> Hashable:
+        return message.message['params']['symbol']
+
 
 class TradesSubscription(HitbtcSubscription):
     def __init__(self, pair: Pair, limit: int = None, callbacks: CallbacksType = None):
@@ -235,8 +251,11 @@ class CreateOrderMessage(WebsocketOutboundMessage):
         self.strict_validate = strict_validate
         self.post_only = post_only
 
+        self.request_id = None
+
     def to_json(self):
-        id = HitbtcSubscription.generate_new_external_id()
+        # every send gets a new id, e.g. a retried message must not be correlated with the previous attempt
+        self.request_id = HitbtcSubscription.generate_new_external_id()
 
         ret = {
             "method": "newOrder",
@@ -247,7 +266,7 @@ class CreateOrderMessage(WebsocketOutboundMessage):
                 "quantity": self.amount,
                 'clientOrderId': self.client_id
             },
-            "id": id
+            "id": self.request_id
         }
 
         if self.price is not None:
@@ -266,24 +285,32 @@ class CreateOrderMessage(WebsocketOutboundMessage):
             ret['params']['timeInForce'] = self.time_in_force.value
 
         if self.expire_time:
-            ret['parms']["expireTime"] = self.expire_time.astimezone(pytz.utc).isoformat()
+            ret['params']["expireTime"] = self.expire_time.astimezone(pytz.utc).isoformat()
 
         return ret
 
+    def get_request_id(self) -> Optional[Hashable]:
+        return self.request_id
+
 
 class CancelOrderMessage(WebsocketOutboundMessage):
     def __init__(self, client_id: str):
         self.client_id = client_id
 
+        self.request_id = None
+
     def to_json(self):
-        id = HitbtcSubscription.generate_new_external_id()
+        self.request_id = HitbtcSubscription.generate_new_external_id()
 
         ret = {
             'method': 'cancelOrder',
             'params': {
                 "clientOrderId": self.client_id
             },
-            'id': id
+            'id': self.request_id
         }
 
-        return ret
\ No newline at end of file
+        return ret
+
+    def get_request_id(self) -> Optional[Hashable]:
+        return self.request_id
@@ -26,7 +26,7 @@ class LiquidClient(CryptoXLibClient):
     def _get_rest_api_uri(self) -> str:
         return self.REST_API_URI
 
-    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None) -> None:
+    def _sign_payload(self, rest_call_type: RestCallType, resource: str, data: dict = None, params: dict = None, headers: dict = None, signature_data: dict = None) -> None:
         authentication_payload = {
             "path": "/" + resource,
             "nonce": self._get_unix_timestamp_ns(),
@@ -38,7 +38,8 @@ class LiquidClient(CryptoXLibClient):
         signature = jwt.encode(authentication_payload, self.sec_key, 'HS256')
         headers["X-Quoine-Auth"] = signature.decode('utf-8')
 
-    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict]) -> None:
+    def _preprocess_rest_response(self, status_code: int, headers: 'CIMultiDictProxy[str]', body: Optional[dict],
+                                  signature_data: Optional[dict] = None) -> None:
         if str(status_code)[0] != '2':
             raise LiquidException(f"LiquidException: status [{status_code}], response [{body}]")
 
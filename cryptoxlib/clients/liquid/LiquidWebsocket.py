@@ -1,4 +1,3 @@
-import json
 import jwt
 import time
 import logging
@@ -6,6 +5,7 @@ import websockets
 from abc import abstractmethod
 from typing import List, Callable, Any, Optional
 
+from cryptoxlib import json_codec
 from cryptoxlib.WebsocketMgr import Subscription, WebsocketMgr, WebsocketMessage, Websocket
 from cryptoxlib.Pair import Pair
 from cryptoxlib.clients.liquid.functions import map_pair
@@ -48,8 +48,9 @@ class LiquidWebsocket(WebsocketMgr):
             "event": "quoine:auth_request",
             "data": authentication_data
         }
-        LOG.debug(f"> {authentication_request}")
-        await self.websocket.send(json.dumps(authentication_request))
+        LOG.debug("> %s", authentication_request)
+        with self.websocket.redacted_trace():
+            await self.websocket.send(json_codec.dumps(authentication_request))
 
     async def _process_periodic(self, websocket: Websocket) -> None:
         if self.ping_checker.check():
@@ -57,11 +58,11 @@ class LiquidWebsocket(WebsocketMgr):
                 "event": "pusher:ping",
                 "data": ''
             }
-            LOG.debug(f"> {ping_message}")
-            await websocket.send(json.dumps(ping_message))
+            LOG.debug("> %s", ping_message)
+            await websocket.send(json_codec.dumps(ping_message))
 
     async def _process_message(self, websocket: Websocket, message: str) -> None:
-        message = json.loads(message)
+        message = json_codec.loads(message)
 
         if message['event'] == "pusher:connection_established":
             pass
@@ -73,8 +74,8 @@ class LiquidWebsocket(WebsocketMgr):
                 subscription_message = subscription.get_subscription_message()
                 subscription_messages.append(subscription_message)
 
-            LOG.debug(f"> {subscription_messages}")
-            await websocket.send(json.dumps(subscription_messages))
+            LOG.debug("> %s", subscription_messages)
+            await websocket.send(json_codec.dumps(subscription_messages))
         elif message['event'] == "quoine:auth_failure":
             raise LiquidException(f"Websocket authentication error: {message}")
         elif message['event'] == "pusher_internal:subscription_succeeded":
@@ -96,6 +97,10 @@ class LiquidSubscription(Subscription):
     def construct_subscription_id(self) -> Any:
         return self.get_channel_name()
 
+    def requires_authentication(self) -> bool:
+        # the websocket is always authenticated
+        return True
+
     def get_subscription_message(self, **kwargs) -> dict:
         return {
             "event": "pusher:subscribe",
@@ -11,4 +11,22 @@ class WebsocketError(CryptoXLibException):
 
 
 class WebsocketClosed(CryptoXLibException):
-    pass
\ No newline at end of file
+    pass
+
+
+class RateLimitException(CryptoXLibException):
+    def __init__(self, message: str, retry_after_sec: float = None):
+        super().__init__(message)
+
+        self.retry_after_sec = retry_after_sec
+
+
+class WebsocketRequestRejected(CryptoXLibException):
+    def __init__(self, message: str, response: dict = None):
+        super().__init__(message)
+
+        self.response = response
+
+
+class WebsocketRequestTimeout(CryptoXLibException):
+    pass
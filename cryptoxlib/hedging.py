@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Tuple
+
+import aiohttp
+
+from cryptoxlib.version_conversions import async_create_task
+
+LOG = logging.getLogger(__name__)
+
+# errors after which the other request may still succeed, any other outcome (incl. errors reported by the exchange)
+# is an answer
+TRANSPORT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, OSError)
+
+
+async def send_hedged(send_primary: Callable[[], Awaitable[Any]], send_secondary: Callable[[], Awaitable[Any]],
+                      delay_sec: float) -> Tuple[Any, bool]:
+    """
+    Sends the primary request and, if it does not complete within delay_sec, the secondary one too. The first answer
+    is returned together with a flag whether it came from the secondary request, the other request is cancelled. If
+    both requests fail, the error of the primary one is raised.
+    """
+    primary = async_create_task(send_primary())
+    secondary = None
+    try:
+        done, _ = await asyncio.wait({primary}, timeout = delay_sec)
+        if primary.done() and not _is_transport_error(primary):
+            return primary.result(), False
+
+        LOG.debug(f"Hedging request not answered within [{delay_sec:.3f}] sec.")
+        secondary = async_create_task(send_secondary())
+
+        pending = {primary, secondary}
+        while len(pending) > 0:
+            done, pending = await asyncio.wait(pending, return_when = asyncio.FIRST_COMPLETED)
+            for request in (primary, secondary):
+                if request in done and not _is_transport_error(request):
+                    return request.result(), request is secondary
+
+        # both requests failed
+        return primary.result(), False
+    finally:
+        for request in (primary, secondary):
+            if request is not None and not request.done():
+                request.cancel()
+            elif request is not None and not request.cancelled():
+                # errors of the request which lost are not reported
+                request.exception()
+
+
+def _is_transport_error(request: asyncio.Task) -> bool:
+    return request.exception() is not None and isinstance(request.exception(), TRANSPORT_ERRORS)
@@ -0,0 +1,91 @@
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+LOG = logging.getLogger(__name__)
+
+# decoding errors of all supported codecs derive from ValueError
+JSONDecodeError = ValueError
+
+
+class JsonCodec(ABC):
+    NAME = None
+
+    @abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        pass
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> str:
+        pass
+
+
+class StdlibJsonCodec(JsonCodec):
+    NAME = "json"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj)
+
+
+class OrjsonJsonCodec(JsonCodec):
+    NAME = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+        self.orjson = orjson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self.orjson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self.orjson.dumps(obj).decode("utf-8")
+
+
+class UjsonJsonCodec(JsonCodec):
+    NAME = "ujson"
+
+    def __init__(self) -> None:
+        import ujson
+        self.ujson = ujson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self.ujson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self.ujson.dumps(obj, ensure_ascii = False)
+
+
+def create_default_codec() -> JsonCodec:
+    for codec_class in [OrjsonJsonCodec, UjsonJsonCodec]:
+        try:
+            return codec_class()
+        except ImportError:
+            pass
+
+    return StdlibJsonCodec()
+
+
+def get_codec() -> JsonCodec:
+    return _codec
+
+
+def set_codec(codec: JsonCodec) -> None:
+    global _codec, loads, dumps
+
+    LOG.debug(f"JSON codec set to [{codec.NAME}].")
+    _codec = codec
+
+    # module level functions are rebound so that callers avoid an extra indirection on every message
+    loads = codec.loads
+    dumps = codec.dumps
+
+
+_codec: JsonCodec = None
+loads = None
+dumps = None
+
+set_codec(create_default_codec())
@@ -0,0 +1,218 @@
+import json
+from array import array
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+# Compact models of high-volume payloads (trades, candlesticks, order book levels, order updates). Models keep their
+# fields in __slots__, numeric fields hold the original strings until first accessed and are then replaced by the
+# parsed float, i.e. strings are parsed at most once and only if needed. Exchange specific decoders are available
+# in the `models` module of the respective client package.
+
+
+class LazyFloat(object):
+    # descriptor parsing the string stored in the slot on first access
+    __slots__ = ('slot',)
+
+    def __init__(self, slot) -> None:
+        self.slot = slot
+
+    def __get__(self, instance, owner = None):
+        if instance is None:
+            return self
+
+        value = self.slot.__get__(instance, owner)
+        if value.__class__ is str:
+            value = float(value)
+            self.slot.__set__(instance, value)
+
+        return value
+
+    def __set__(self, instance, value) -> None:
+        self.slot.__set__(instance, value)
+
+
+def _lazy_fields(cls):
+    # exposes slots "_name" of the LAZY_FIELDS as lazily parsed attributes "name"
+    for field in cls.LAZY_FIELDS:
+        setattr(cls, field, LazyFloat(getattr(cls, '_' + field)))
+
+    return cls
+
+
+class Model(object):
+    __slots__ = ()
+
+    FIELDS = ()
+    LAZY_FIELDS = ()
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({', '.join(f'{k}={v!r}' for k, v in self.to_dict().items())})"
+
+
+@_lazy_fields
+class Trade(Model):
+    __slots__ = ('symbol', 'trade_id', '_price', '_quantity', 'timestamp_ms', 'is_buyer_maker')
+
+    FIELDS = ('symbol', 'trade_id', 'price', 'quantity', 'timestamp_ms', 'is_buyer_maker')
+    LAZY_FIELDS = ('price', 'quantity')
+
+    def __init__(self, symbol: Optional[str], trade_id: int, price: Union[str, float], quantity: Union[str, float],
+                 timestamp_ms: int, is_buyer_maker: Optional[bool] = None) -> None:
+        self.symbol = symbol
+        self.trade_id = trade_id
+        self._price = price
+        self._quantity = quantity
+        self.timestamp_ms = timestamp_ms
+        self.is_buyer_maker = is_buyer_maker
+
+
+@_lazy_fields
+class Candlestick(Model):
+    __slots__ = ('open_time_ms', '_open', '_high', '_low', '_close', '_volume', 'close_time_ms', '_quote_volume',
+                 'trade_count')
+
+    FIELDS = ('open_time_ms', 'open', 'high', 'low', 'close', 'volume', 'close_time_ms', 'quote_volume', 'trade_count')
+    LAZY_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'quote_volume')
+
+    def __init__(self, open_time_ms: int, open: Union[str, float], high: Union[str, float], low: Union[str, float],
+                 close: Union[str, float], volume: Union[str, float], close_time_ms: int = None,
+                 quote_volume: Union[str, float] = None, trade_count: int = None) -> None:
+        self.open_time_ms = open_time_ms
+        self._open = open
+        self._high = high
+        self._low = low
+        self._close = close
+        self._volume = volume
+        self.close_time_ms = close_time_ms
+        self._quote_volume = quote_volume
+        self.trade_count = trade_count
+
+
+@_lazy_fields
+class BookLevel(Model):
+    __slots__ = ('_price', '_quantity', 'side')
+
+    FIELDS = ('price', 'quantity', 'side')
+    LAZY_FIELDS = ('price', 'quantity')
+
+    def __init__(self, price: Union[str, float], quantity: Union[str, float], side: str = None) -> None:
+        self._price = price
+        self._quantity = quantity
+        self.side = side
+
+
+@_lazy_fields
+class OrderUpdate(Model):
+    __slots__ = ('symbol', 'order_id', 'client_order_id', 'side', 'order_type', 'status', 'execution_type',
+                 '_price', '_quantity', '_filled_quantity', '_last_fill_price', '_last_fill_quantity', 'timestamp_ms')
+
+    FIELDS = ('symbol', 'order_id', 'client_order_id', 'side', 'order_type', 'status', 'execution_type', 'price',
+              'quantity', 'filled_quantity', 'last_fill_price', 'last_fill_quantity', 'timestamp_ms')
+    LAZY_FIELDS = ('price', 'quantity', 'filled_quantity', 'last_fill_price', 'last_fill_quantity')
+
+    def __init__(self, symbol: str, order_id: Any, client_order_id: Optional[str], side: str, order_type: str,
+                 status: str, execution_type: Optional[str], price: Union[str, float], quantity: Union[str, float],
+                 filled_quantity: Union[str, float], last_fill_price: Union[str, float],
+                 last_fill_quantity: Union[str, float], timestamp_ms: int) -> None:
+        self.symbol = symbol
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.side = side
+        self.order_type = order_type
+        self.status = status
+        self.execution_type = execution_type
+        self._price = price
+        self._quantity = quantity
+        self._filled_quantity = filled_quantity
+        self._last_fill_price = last_fill_price
+        self._last_fill_quantity = last_fill_quantity
+        self.timestamp_ms = timestamp_ms
+
+
+class CandlestickArray(object):
+    """
+    Column-oriented storage of candlesticks in typed arrays, i.e. 8 bytes per field and candlestick without any
+    per-record objects. Suited for long histories, e.g. from iter_candlesticks or the backfill.
+    """
+    def __init__(self, candlesticks: Iterable[Candlestick] = None) -> None:
+        self.open_time_ms = array('q')
+        self.open = array('d')
+        self.high = array('d')
+        self.low = array('d')
+        self.close = array('d')
+        self.volume = array('d')
+
+        if candlesticks is not None:
+            self.extend(candlesticks)
+
+    def append(self, candlestick: Candlestick) -> None:
+        self.open_time_ms.append(candlestick.open_time_ms)
+        self.open.append(candlestick.open)
+        self.high.append(candlestick.high)
+        self.low.append(candlestick.low)
+        self.close.append(candlestick.close)
+        self.volume.append(candlestick.volume)
+
+    def extend(self, candlesticks: Iterable[Candlestick]) -> None:
+        for candlestick in candlesticks:
+            self.append(candlestick)
+
+    def __len__(self) -> int:
+        return len(self.open_time_ms)
+
+    def __getitem__(self, i: int) -> Candlestick:
+        return Candlestick(self.open_time_ms[i], self.open[i], self.high[i], self.low[i], self.close[i],
+                           self.volume[i])
+
+
+class TradeArray(object):
+    """
+    Column-oriented storage of trades in typed arrays, see CandlestickArray.
+    """
+    def __init__(self, trades: Iterable[Trade] = None) -> None:
+        self.trade_id = array('q')
+        self.price = array('d')
+        self.quantity = array('d')
+        self.timestamp_ms = array('q')
+        # 1 if the buyer was the maker, 0 if not, -1 if unknown
+        self.is_buyer_maker = array('b')
+
+        if trades is not None:
+            self.extend(trades)
+
+    def append(self, trade: Trade) -> None:
+        self.trade_id.append(trade.trade_id)
+        self.price.append(trade.price)
+        self.quantity.append(trade.quantity)
+        self.timestamp_ms.append(trade.timestamp_ms)
+        self.is_buyer_maker.append(-1 if trade.is_buyer_maker is None else int(trade.is_buyer_maker))
+
+    def extend(self, trades: Iterable[Trade]) -> None:
+        for trade in trades:
+            self.append(trade)
+
+    def __len__(self) -> int:
+        return len(self.trade_id)
+
+    def __getitem__(self, i: int) -> Trade:
+        is_buyer_maker = self.is_buyer_maker[i]
+        return Trade(None, self.trade_id[i], self.price[i], self.quantity[i], self.timestamp_ms[i],
+                     None if is_buyer_maker < 0 else bool(is_buyer_maker))
+
+
+def loads(data: Union[str, bytes], decode_object: Callable[[dict], Any]) -> Any:
+    """
+    Decodes JSON directly into models. Each JSON object is passed to decode_object as soon as it is parsed and only
+    its result is retained, i.e. the intermediate dicts are freed right away. Uses the standard library decoder as
+    the optional ones do not support object hooks.
+    """
+    return json.loads(data, object_hook = decode_object)
+
+
+def get_book_levels(levels: List[List[str]], side: str = None) -> List[BookLevel]:
+    return [BookLevel(level[0], level[1], side) for level in levels]
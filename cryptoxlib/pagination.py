@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Iterable, List, Optional
+
+from cryptoxlib.exceptions import CryptoXLibException
+from cryptoxlib.version_conversions import async_create_task
+
+LOG = logging.getLogger(__name__)
+
+# fetches a page identified by the cursor (id, offset, time window, opaque cursor, ...)
+PageFetcherType = Callable[[Any], Awaitable[dict]]
+# extracts items from the REST response of a page
+ItemsExtractorType = Callable[[dict], List[Any]]
+# derives the cursor of the next page from the response and items of the current page, None if there is no next page
+NextCursorType = Callable[[dict, List[Any]], Optional[Any]]
+
+
+async def paginate(fetch_page: PageFetcherType, get_items: ItemsExtractorType, get_next_cursor: NextCursorType,
+                   cursor: Any = None) -> AsyncIterator[Any]:
+    """
+    Iterates over items of an endpoint where the next page is determined by the previous one (e.g. fromId or cursor
+    pagination). The next page is fetched while the items of the current page are being consumed, i.e. at most two
+    pages are held in memory.
+    """
+    page = async_create_task(fetch_page(cursor))
+    try:
+        while page is not None:
+            response = await page
+            items = get_items(response)
+
+            next_cursor = get_next_cursor(response, items)
+            page = async_create_task(fetch_page(next_cursor)) if next_cursor is not None else None
+
+            for item in items:
+                yield item
+    finally:
+        # the consumer may stop iterating early
+        if page is not None and not page.done():
+            page.cancel()
+
+
+async def paginate_concurrently(fetch_page: PageFetcherType, get_items: ItemsExtractorType, cursors: Iterable[Any],
+                                concurrency: int = 1,
+                                is_last_page: Callable[[List[Any]], bool] = None) -> AsyncIterator[Any]:
+    """
+    Iterates over items of an endpoint where cursors of all pages are known in advance (e.g. offset or time window
+    pagination). Up to `concurrency` pages are fetched at once, items are yielded in the order of the cursors. The
+    iteration ends once the cursors are exhausted or is_last_page(items) returns True, which makes it possible to
+    paginate through an unbounded sequence of cursors.
+    """
+    if concurrency < 1:
+        raise CryptoXLibException(f"Concurrency [{concurrency}] must be a positive number.")
+
+    cursors = iter(cursors)
+    pages: Deque[asyncio.Task] = deque()
+
+    def fetch_next_page() -> None:
+        for cursor in cursors:
+            pages.append(async_create_task(fetch_page(cursor)))
+            break
+
+    try:
+        for _ in range(concurrency):
+            fetch_next_page()
+
+        while len(pages) > 0:
+            items = get_items(await pages.popleft())
+
+            if is_last_page is not None and is_last_page(items):
+                for item in items:
+                    yield item
+                return
+
+            fetch_next_page()
+
+            for item in items:
+                yield item
+    finally:
+        for page in pages:
+            if not page.done():
+                page.cancel()
+
+
+def get_offsets(page_size: int, offset: int = 0) -> Iterable[int]:
+    while True:
+        yield offset
+        offset += page_size
+
+
+def get_time_windows(start_tmstmp_ms: int, end_tmstmp_ms: int, window_ms: int) -> Iterable[tuple]:
+    # windows are inclusive on both ends as is common for startTime/endTime parameters
+    while start_tmstmp_ms <= end_tmstmp_ms:
+        yield start_tmstmp_ms, min(start_tmstmp_ms + window_ms - 1, end_tmstmp_ms)
+        start_tmstmp_ms += window_ms
@@ -0,0 +1,463 @@
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+import socket
+import ssl
+import struct
+import urllib.parse
+from collections import deque
+from typing import Deque, List, Optional, Union
+
+from cryptoxlib.version_conversions import async_create_task
+from cryptoxlib.exceptions import WebsocketClosed, WebsocketError
+
+LOG = logging.getLogger(__name__)
+
+# Minimal websocket client (RFC 6455) implemented directly over an asyncio protocol. Frames are parsed straight from
+# the receive buffer and complete messages are handed over to the reader without intermediate tasks or queues. Only
+# what exchanges use is supported, i.e. no extensions (compression) and no subprotocols.
+
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+CLOSE_CODE_NORMAL = 1000
+CLOSE_CODE_PROTOCOL_ERROR = 1002
+CLOSE_CODE_INVALID_DATA = 1007
+CLOSE_CODE_MESSAGE_TOO_BIG = 1009
+
+MAX_HANDSHAKE_SIZE = 64 * 1024
+CLOSE_TIMEOUT_SEC = 5
+# reading from the socket is paused while the reader lags behind by more messages than the high watermark
+READ_HIGH_WATERMARK = 10000
+READ_LOW_WATERMARK = 1000
+
+_UNPACK_UINT16 = struct.Struct("!H").unpack_from
+_UNPACK_UINT64 = struct.Struct("!Q").unpack_from
+_PACK_UINT16 = struct.Struct("!H").pack
+_PACK_UINT64 = struct.Struct("!Q").pack
+
+
+class ProtocolError(WebsocketError):
+    def __init__(self, message: str, close_code: int = CLOSE_CODE_PROTOCOL_ERROR):
+        super().__init__(message)
+
+        self.close_code = close_code
+
+
+def mask_payload(payload: bytes, mask: bytes) -> bytes:
+    # XOR of the payload with the repeated mask computed at once on big integers
+    length = len(payload)
+    if length == 0:
+        return payload
+
+    mask_bytes = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, 'little') ^ int.from_bytes(mask_bytes, 'little')).to_bytes(length, 'little')
+
+
+def build_frame(opcode: int, payload: bytes) -> bytes:
+    # frames sent by a client have to be masked
+    length = len(payload)
+    if length < 126:
+        header = bytes((0x80 | opcode, 0x80 | length))
+    elif length < 2 ** 16:
+        header = bytes((0x80 | opcode, 0x80 | 126)) + _PACK_UINT16(length)
+    else:
+        header = bytes((0x80 | opcode, 0x80 | 127)) + _PACK_UINT64(length)
+
+    mask = os.urandom(4)
+    return header + mask + mask_payload(payload, mask)
+
+
+class WebsocketProtocol(asyncio.Protocol):
+    def __init__(self, host: str, resource: str, max_message_size: int = 2 ** 20) -> None:
+        self.host = host
+        self.resource = resource
+        self.max_message_size = max_message_size
+
+        self.transport: Optional[asyncio.Transport] = None
+        self.handshake_key = base64.b64encode(os.urandom(16))
+        self.handshake_done: Optional[asyncio.Future] = None
+
+        self.buffer = bytearray()
+        self.fragments: list = []
+        self.fragments_opcode: Optional[int] = None
+        self.fragments_size = 0
+
+        self.messages: Deque[Union[str, bytes]] = deque()
+        self.message_waiter: Optional[asyncio.Future] = None
+        self.reading_paused = False
+        self.write_waiters: List[asyncio.Future] = []
+        self.writing_paused = False
+
+        self.pong_received = True
+        self.close_sent = False
+        self.closed: Optional[Exception] = None
+        self.close_waiter: Optional[asyncio.Future] = None
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        loop = asyncio.get_event_loop()
+        self.handshake_done = loop.create_future()
+        self.close_waiter = loop.create_future()
+
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+
+        transport.write(
+            f"GET {self.resource} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            f"Upgrade: websocket\r\n"
+            f"Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {self.handshake_key.decode('ascii')}\r\n"
+            f"Sec-WebSocket-Version: 13\r\n"
+            f"\r\n".encode('ascii'))
+
+    def data_received(self, data: bytes) -> None:
+        self.buffer += data
+
+        if not self.handshake_done.done():
+            if not self._process_handshake():
+                return
+
+        try:
+            self._process_frames()
+        except ProtocolError as e:
+            self._fail(e, e.close_code)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if self.closed is None:
+            self.closed = WebsocketError(f"Websocket connection lost: {exc}") if exc is not None \
+                else WebsocketClosed("Websocket was closed.")
+
+        if not self.handshake_done.done():
+            self.handshake_done.set_exception(self.closed)
+            # nobody waits for the handshake if connecting has been cancelled in the meantime
+            self.handshake_done.exception()
+        if not self.close_waiter.done():
+            self.close_waiter.set_result(None)
+        self._wake_reader()
+        self._wake_writers()
+
+    def pause_writing(self) -> None:
+        self.writing_paused = True
+
+    def resume_writing(self) -> None:
+        self.writing_paused = False
+        self._wake_writers()
+
+    def _process_handshake(self) -> bool:
+        end = self.buffer.find(b"\r\n\r\n")
+        if end < 0:
+            if len(self.buffer) > MAX_HANDSHAKE_SIZE:
+                self._fail_handshake("Websocket handshake response too long.")
+            return False
+
+        lines = bytes(self.buffer[:end]).decode('latin-1').split("\r\n")
+        del self.buffer[:end + 4]
+
+        status_line = lines[0].split(" ", 2)
+        if len(status_line) < 2 or status_line[1] != "101":
+            self._fail_handshake(f"Websocket handshake rejected: {lines[0]}")
+            return False
+
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        expected_accept = base64.b64encode(hashlib.sha1(self.handshake_key + WEBSOCKET_GUID).digest()).decode('ascii')
+        if headers.get("sec-websocket-accept") != expected_accept:
+            self._fail_handshake("Websocket handshake failed, invalid Sec-WebSocket-Accept header.")
+            return False
+
+        self.handshake_done.set_result(None)
+        return True
+
+    def _fail_handshake(self, message: str) -> None:
+        self.closed = WebsocketError(message)
+        self.handshake_done.set_exception(self.closed)
+        self.transport.close()
+
+    def _process_frames(self) -> None:
+        buffer = self.buffer
+        buffer_len = len(buffer)
+        messages = self.messages
+        message_count = len(messages)
+        max_message_size = self.max_message_size
+        view = memoryview(buffer)
+        pos = 0
+        try:
+            while buffer_len - pos >= 2:
+                b0 = buffer[pos]
+                b1 = buffer[pos + 1]
+
+                # fast path for complete unmasked text messages up to 64kB, i.e. almost all exchange messages. A text
+                # frame in the middle of a fragmented message is left to the full path which rejects it
+                if b0 == 0x81 and b1 <= 126 and self.fragments_opcode is None:
+                    if b1 == 126:
+                        if buffer_len - pos < 4:
+                            break
+                        start = pos + 4
+                        end = start + ((buffer[pos + 2] << 8) | buffer[pos + 3])
+                    else:
+                        start = pos + 2
+                        end = start + b1
+                    if end - start > max_message_size:
+                        raise ProtocolError(f"Websocket message too big [{end - start} B].", CLOSE_CODE_MESSAGE_TOO_BIG)
+                    if end > buffer_len:
+                        break
+
+                    try:
+                        messages.append(str(view[start:end], 'utf-8'))
+                    except UnicodeDecodeError as e:
+                        raise ProtocolError(f"Websocket text message is not valid UTF-8: {e}", CLOSE_CODE_INVALID_DATA)
+                    pos = end
+                    continue
+
+                length = b1 & 0x7F
+                header_len = 2
+                if length == 126:
+                    if buffer_len - pos < 4:
+                        break
+                    length = _UNPACK_UINT16(buffer, pos + 2)[0]
+                    header_len = 4
+                elif length == 127:
+                    if buffer_len - pos < 10:
+                        break
+                    length = _UNPACK_UINT64(buffer, pos + 2)[0]
+                    header_len = 10
+
+                if length > max_message_size:
+                    raise ProtocolError(f"Websocket message too big [{length} B].", CLOSE_CODE_MESSAGE_TOO_BIG)
+
+                masked = b1 & 0x80
+                if masked:
+                    header_len += 4
+
+                if buffer_len - pos < header_len + length:
+                    break
+
+                payload = bytes(view[pos + header_len:pos + header_len + length])
+                if masked:
+                    # servers must not mask frames but tolerate it anyway
+                    payload = mask_payload(payload, bytes(view[pos + header_len - 4:pos + header_len]))
+                pos += header_len + length
+
+                if b0 & 0x70:
+                    raise ProtocolError("Websocket frame uses an extension which has not been negotiated.")
+
+                self._process_frame(b0 & 0x80, b0 & 0x0F, payload)
+                if self.closed is not None:
+                    break
+        finally:
+            view.release()
+            if pos > 0:
+                del buffer[:pos]
+
+            if len(messages) > message_count:
+                if len(messages) > READ_HIGH_WATERMARK and not self.reading_paused:
+                    self.reading_paused = True
+                    self.transport.pause_reading()
+
+                self._wake_reader()
+
+    def _process_frame(self, fin: int, opcode: int, payload: bytes) -> None:
+        if opcode == OPCODE_TEXT or opcode == OPCODE_BINARY:
+            if self.fragments_opcode is not None:
+                raise ProtocolError("Websocket message started before the previous one was finished.")
+            if fin:
+                self._deliver(opcode, payload)
+            else:
+                self.fragments_opcode = opcode
+                self.fragments = [payload]
+                self.fragments_size = len(payload)
+        elif opcode == OPCODE_CONTINUATION:
+            if self.fragments_opcode is None:
+                raise ProtocolError("Unexpected websocket continuation frame.")
+            self.fragments.append(payload)
+            self.fragments_size += len(payload)
+            if self.fragments_size > self.max_message_size:
+                raise ProtocolError(f"Websocket message too big [{self.fragments_size} B].", CLOSE_CODE_MESSAGE_TOO_BIG)
+            if fin:
+                opcode = self.fragments_opcode
+                payload = b"".join(self.fragments)
+                self.fragments_opcode = None
+                self.fragments = []
+                self._deliver(opcode, payload)
+        elif opcode == OPCODE_PING:
+            self.transport.write(build_frame(OPCODE_PONG, payload))
+        elif opcode == OPCODE_PONG:
+            self.pong_received = True
+        elif opcode == OPCODE_CLOSE:
+            code = _UNPACK_UINT16(payload)[0] if len(payload) >= 2 else None
+            reason = payload[2:].decode('utf-8', errors = 'replace')
+            self.closed = WebsocketClosed(f"Websocket was closed: {code} {reason}")
+            if not self.close_sent:
+                self.close_sent = True
+                self.transport.write(build_frame(OPCODE_CLOSE, payload[:2]))
+            self.transport.close()
+            self._wake_reader()
+        else:
+            raise ProtocolError(f"Unknown websocket opcode [{opcode}].")
+
+    def _deliver(self, opcode: int, payload: bytes) -> None:
+        # the reader is woken up once all frames received at once are processed
+        if opcode == OPCODE_TEXT:
+            try:
+                payload = payload.decode('utf-8')
+            except UnicodeDecodeError as e:
+                raise ProtocolError(f"Websocket text message is not valid UTF-8: {e}", CLOSE_CODE_INVALID_DATA)
+        self.messages.append(payload)
+
+    def _wake_reader(self) -> None:
+        if self.message_waiter is not None and not self.message_waiter.done():
+            self.message_waiter.set_result(None)
+
+    def _wake_writers(self) -> None:
+        write_waiters = self.write_waiters
+        self.write_waiters = []
+        for write_waiter in write_waiters:
+            if not write_waiter.done():
+                write_waiter.set_result(None)
+
+    def _fail(self, exception: Exception, close_code: int) -> None:
+        LOG.warning(f"Websocket protocol error: {exception}")
+        self.closed = exception
+        if not self.close_sent:
+            self.close_sent = True
+            self.transport.write(build_frame(OPCODE_CLOSE, _PACK_UINT16(close_code)))
+        self.transport.close()
+        self._wake_reader()
+
+    async def receive(self) -> Union[str, bytes]:
+        while not self.messages:
+            if self.closed is not None:
+                raise self.closed
+
+            self.message_waiter = asyncio.get_event_loop().create_future()
+            await self.message_waiter
+            self.message_waiter = None
+
+        message = self.messages.popleft()
+        if self.reading_paused and len(self.messages) < READ_LOW_WATERMARK:
+            self.reading_paused = False
+            self.transport.resume_reading()
+
+        return message
+
+    async def send(self, message: Union[str, bytes]) -> None:
+        if self.closed is not None or self.close_sent:
+            raise WebsocketClosed("Websocket attempted to send data while connection is closed.")
+
+        if isinstance(message, str):
+            self.transport.write(build_frame(OPCODE_TEXT, message.encode('utf-8')))
+        else:
+            self.transport.write(build_frame(OPCODE_BINARY, message))
+
+        if self.writing_paused:
+            # several senders may wait for the transport buffer to drain at the same time
+            write_waiter = asyncio.get_event_loop().create_future()
+            self.write_waiters.append(write_waiter)
+            try:
+                await write_waiter
+            finally:
+                if write_waiter in self.write_waiters:
+                    self.write_waiters.remove(write_waiter)
+
+            if self.closed is not None:
+                raise self.closed
+
+    def ping(self) -> bool:
+        # returns False if the previous ping has not been answered
+        if not self.pong_received:
+            return False
+
+        self.pong_received = False
+        self.transport.write(build_frame(OPCODE_PING, b""))
+
+        return True
+
+    async def close(self, code: int = CLOSE_CODE_NORMAL) -> None:
+        if self.closed is None and not self.close_sent:
+            self.close_sent = True
+            self.transport.write(build_frame(OPCODE_CLOSE, _PACK_UINT16(code)))
+
+            # wait for the closing handshake of the server
+            try:
+                await asyncio.wait_for(asyncio.shield(self.close_waiter), CLOSE_TIMEOUT_SEC)
+            except asyncio.TimeoutError:
+                pass
+
+        self.transport.close()
+
+    def abort(self, reason: str) -> None:
+        self.closed = WebsocketError(reason)
+        self.transport.abort()
+        self._wake_reader()
+
+
+class WebsocketConnection(object):
+    def __init__(self, protocol: WebsocketProtocol, ping_interval: Optional[float]) -> None:
+        self.protocol = protocol
+        self.ping_interval = ping_interval
+
+        self.ping_task: Optional[asyncio.Task] = None
+        if ping_interval is not None:
+            self.ping_task = async_create_task(self._keepalive())
+
+    async def _keepalive(self) -> None:
+        while self.protocol.closed is None:
+            await asyncio.sleep(self.ping_interval)
+            if not self.protocol.ping():
+                self.protocol.abort(f"Websocket ping not answered within {self.ping_interval} sec.")
+
+    async def receive(self) -> Union[str, bytes]:
+        return await self.protocol.receive()
+
+    async def send(self, message: Union[str, bytes]) -> None:
+        await self.protocol.send(message)
+
+    async def close(self) -> None:
+        if self.ping_task is not None:
+            self.ping_task.cancel()
+            self.ping_task = None
+
+        await self.protocol.close()
+
+
+async def connect(websocket_uri: str, ssl_context: ssl.SSLContext = None, max_message_size: int = 2 ** 20,
+                  ping_interval: Optional[float] = 20) -> WebsocketConnection:
+    url = urllib.parse.urlsplit(websocket_uri)
+    if url.scheme not in ("ws", "wss"):
+        raise WebsocketError(f"Unsupported websocket URI scheme [{url.scheme}].")
+
+    secure = url.scheme == "wss"
+    if secure and ssl_context is None:
+        ssl_context = ssl.create_default_context()
+
+    resource = (url.path or "/") + (f"?{url.query}" if url.query else "")
+    protocol = WebsocketProtocol(url.netloc, resource, max_message_size)
+
+    loop = asyncio.get_event_loop()
+    transport, _ = await loop.create_connection(lambda: protocol, url.hostname, url.port or (443 if secure else 80),
+                                                ssl = ssl_context if secure else None,
+                                                server_hostname = url.hostname if secure else None)
+    try:
+        await protocol.handshake_done
+    except BaseException:
+        transport.close()
+        raise
+
+    return WebsocketConnection(protocol, ping_interval)
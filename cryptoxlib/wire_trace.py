@@ -0,0 +1,88 @@
+import logging
+import time
+from collections import deque
+from typing import Any, List, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+# (timestamp, direction, source, payload)
+WireTraceRecord = Tuple[float, str, Any, Any]
+
+INBOUND = "<"
+OUTBOUND = ">"
+# replaces payloads carrying credentials
+REDACTED = "<redacted>"
+
+
+class WireTracer(object):
+    """
+    Sampled tracing of raw websocket frames and REST calls, independent of the library's debug logging.
+
+    - sample_rate: every N-th frame is logged by this module's logger (cryptoxlib.wire_trace)
+    - buffer_size: the last N frames are kept in memory and dumped to the log in case of an error
+
+    Payloads are formatted only when they are actually logged.
+    """
+
+    def __init__(self, sample_rate: int = None, buffer_size: int = None, log_level: int = logging.INFO) -> None:
+        self.sample_rate = sample_rate
+        self.log_level = log_level
+
+        self.buffer: Optional[deque] = deque(maxlen = buffer_size) if buffer_size else None
+        self.frame_count = 0
+
+        # checked on the hot path before calling trace(...)
+        self.enabled = bool(sample_rate) or self.buffer is not None
+
+    def trace(self, direction: str, source: Any, payload: Any) -> None:
+        if self.buffer is not None:
+            self.buffer.append((time.time(), direction, source, payload))
+
+        if self.sample_rate:
+            self.frame_count += 1
+            if self.frame_count % self.sample_rate == 0:
+                LOG.log(self.log_level, "[%s] %s %s", source, direction, payload)
+
+    def get_records(self) -> List[WireTraceRecord]:
+        if self.buffer is None:
+            return []
+
+        return list(self.buffer)
+
+    def dump(self, reason: str = None, log_level: int = logging.ERROR) -> None:
+        if self.buffer is None or len(self.buffer) == 0:
+            return
+
+        records = self.get_records()
+        self.buffer.clear()
+
+        LOG.log(log_level, "Wire trace of the last %d frames%s:", len(records), f" ({reason})" if reason else "")
+        for tmstmp, direction, source, payload in records:
+            LOG.log(log_level, "%.6f [%s] %s %s", tmstmp, source, direction, payload)
+
+    def clear(self) -> None:
+        if self.buffer is not None:
+            self.buffer.clear()
+
+
+# disabled by default, see enable_wire_trace(...)
+tracer = WireTracer()
+
+
+def get_tracer() -> WireTracer:
+    return tracer
+
+
+def set_tracer(new_tracer: WireTracer) -> None:
+    global tracer
+    tracer = new_tracer
+
+
+def enable_wire_trace(sample_rate: int = None, buffer_size: int = None, log_level: int = logging.INFO) -> WireTracer:
+    set_tracer(WireTracer(sample_rate = sample_rate, buffer_size = buffer_size, log_level = log_level))
+
+    return tracer
+
+
+def disable_wire_trace() -> None:
+    set_tracer(WireTracer())
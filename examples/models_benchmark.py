@@ -0,0 +1,50 @@
+import json
+import timeit
+import tracemalloc
+
+from cryptoxlib.clients.binance import models as binance_models
+from cryptoxlib.models import CandlestickArray
+
+# Memory and decoding time of binance aggregate trades and candlesticks held as decoded dicts/lists, as compact
+# models and as column arrays
+
+RECORDS = 100000
+
+
+def measure(name: str, fcn) -> None:
+    tracemalloc.start()
+    result = fcn()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    duration_sec = timeit.timeit(fcn, number = 1)
+
+    print(f"{name:40} retained {size / RECORDS:7.1f} B/record, peak {peak / RECORDS:7.1f} B/record, "
+          f"{duration_sec / RECORDS * 1e6:5.2f} us/record")
+
+    return result
+
+
+def run():
+    agg_trades = json.dumps([{
+        "a": 26129 + i, "p": f"{0.01633102 + i * 1e-8:.8f}", "q": "4.70443515", "f": 27781 + i, "l": 27781 + i,
+        "T": 1498793709153 + i, "m": True, "M": True
+    } for i in range(RECORDS)]).encode('utf-8')
+
+    candlesticks = json.dumps([[
+        1499040000000 + i * 60000, "0.01634790", "0.80000000", "0.01575800", "0.01577100", "148976.11427815",
+        1499644799999 + i * 60000, "2434.19055334", 308, "1756.87402397", "28.46694368", "0"
+    ] for i in range(RECORDS)]).encode('utf-8')
+
+    print(f"Decoding {RECORDS} records:")
+
+    measure("aggregate trades as dicts", lambda: json.loads(agg_trades))
+    measure("aggregate trades as models", lambda: binance_models.loads_aggregate_trades(agg_trades))
+
+    measure("candlesticks as lists", lambda: json.loads(candlesticks))
+    measure("candlesticks as models", lambda: binance_models.loads_candlesticks(candlesticks))
+    measure("candlesticks as arrays", lambda: CandlestickArray(binance_models.loads_candlesticks(candlesticks)))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,109 @@
+import hmac
+import hashlib
+import timeit
+import uuid
+import yarl
+from urllib.parse import urlencode
+
+from cryptoxlib.CryptoXLib import CryptoXLib
+from cryptoxlib.CryptoXLibClient import RestCallType
+from cryptoxlib.ServerClock import get_local_timestamp_ms
+
+# Microbenchmark of request signing. Compares the clients' signing (pre-keyed HMAC context, query string built once
+# and sent as is) with the previous implementation which created a new HMAC context for each request and let the
+# HTTP client encode the parameters into the URL again.
+
+ITERATIONS = 100000
+
+API_KEY = "vmPUZE6mv9SD5VNHk4HlWFsOr6aKE2zvsw0MuIgwCIPy6utIco14y7Ju91duEh8A"
+SEC_KEY = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j"
+USER_ID = "12345"
+
+PARAMS = {
+    "symbol": "LTCBTC",
+    "side": "BUY",
+    "type": "LIMIT",
+    "timeInForce": "GTC",
+    "quantity": "1",
+    "price": "0.1",
+    "recvWindow": "5000",
+    "timestamp": "1499827319559"
+}
+
+
+def get_url(uri: str, params: dict, signature_data: dict) -> yarl.URL:
+    # the same as CryptoXLibClient._send_rest_call(...)
+    query_string = signature_data.get("query_string")
+    if query_string is not None:
+        return yarl.URL(uri + ('?' + query_string if len(query_string) > 0 else ''), encoded = True)
+
+    return yarl.URL(uri).with_query(params)
+
+
+def legacy_binance(resource: str, params: dict, headers: dict) -> yarl.URL:
+    params_string = '&'.join([f"{key}={val}" for key, val in params.items()])
+    params['signature'] = hmac.new(SEC_KEY.encode('utf-8'), params_string.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    return yarl.URL("https://api.binance.com/" + resource).with_query(params)
+
+
+def legacy_bitforex(resource: str, params: dict, headers: dict) -> yarl.URL:
+    params['accessKey'] = API_KEY
+    params_string = "/api/v1/" + resource + '?' + '&'.join([f"{key}={val}" for key, val in sorted(params.items())])
+    params['signData'] = hmac.new(SEC_KEY.encode('utf-8'), params_string.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    return yarl.URL("https://api.bitforex.com/api/v1/" + resource).with_query(params)
+
+
+def legacy_coinmate(resource: str, params: dict, headers: dict) -> yarl.URL:
+    nonce = get_local_timestamp_ms()
+    input_message = str(nonce) + USER_ID + API_KEY
+    params['signature'] = hmac.new(SEC_KEY.encode('utf-8'), input_message.encode('utf-8'), hashlib.sha256).hexdigest().upper()
+    params['clientId'] = USER_ID
+    params['publicKey'] = API_KEY
+    params['nonce'] = nonce
+
+    return yarl.URL("https://coinmate.io/api/" + resource).with_query(params)
+
+
+def legacy_bitstamp(resource: str, params: dict, headers: dict) -> yarl.URL:
+    timestamp = str(get_local_timestamp_ms())
+    nonce = str(uuid.uuid4())
+    message = "BITSTAMP " + API_KEY + "POST" + "www.bitstamp.net" + "/api/v2/" + resource + "?" + urlencode(params) + \
+              nonce + timestamp + "v2"
+    headers["X-Auth-Signature"] = hmac.new(SEC_KEY.encode('utf-8'), msg = message.encode("utf-8"), digestmod = hashlib.sha256).hexdigest()
+
+    return yarl.URL("https://www.bitstamp.net/api/v2/" + resource).with_query(params)
+
+
+def benchmark(name: str, client, resource: str, legacy_fcn) -> None:
+    uri = client._get_rest_api_uri() + resource
+
+    def sign():
+        params = dict(PARAMS)
+        signature_data = {"signed": True}
+        client._sign_payload(RestCallType.POST, resource, None, params, {}, signature_data)
+        get_url(uri, params, signature_data)
+
+    def sign_legacy():
+        legacy_fcn(resource, dict(PARAMS), {})
+
+    sign_sec = timeit.timeit(sign, number = ITERATIONS)
+    legacy_sec = timeit.timeit(sign_legacy, number = ITERATIONS)
+
+    print(f"{name:10} current: {sign_sec / ITERATIONS * 1e6:6.2f} us/request, "
+          f"previous: {legacy_sec / ITERATIONS * 1e6:6.2f} us/request")
+
+
+def run():
+    print(f"Signing {ITERATIONS} requests per exchange:")
+
+    benchmark("binance", CryptoXLib.create_binance_client(API_KEY, SEC_KEY), "api/v3/order", legacy_binance)
+    benchmark("bitforex", CryptoXLib.create_bitforex_client(API_KEY, SEC_KEY), "trade/placeOrder", legacy_bitforex)
+    benchmark("coinmate", CryptoXLib.create_coinmate_client(USER_ID, API_KEY, SEC_KEY), "buyLimit", legacy_coinmate)
+    benchmark("bitstamp", CryptoXLib.create_bitstamp_client(API_KEY, SEC_KEY.encode('utf-8')), "buy/btcusd/",
+              legacy_bitstamp)
+
+
+if __name__ == "__main__":
+    run()
@@ -99,9 +99,10 @@ class CryptoXLibTest(aiounittest.AsyncTestCase):
         else:
             return self.loop
 
-    async def assertWsMessageCount(self, ws_message_counter: WsMessageCounter, timeout: float = 25.0):
+    async def assertWsMessageCount(self, ws_message_counter: WsMessageCounter, timeout: float = 25.0,
+                                   worker_processes: int = 0):
         try:
-            await asyncio.wait_for(self.client.start_websockets(), timeout = timeout)
+            await asyncio.wait_for(self.client.start_websockets(worker_processes = worker_processes), timeout = timeout)
         except CryptoXLibWsSuccessException as e:
             LOG.info(f"SUCCESS exception: {e}")
             return True
@@ -5,7 +5,8 @@ import datetime
 
 from cryptoxlib.CryptoXLib import CryptoXLib
 from cryptoxlib.clients.binance import enums
-from cryptoxlib.clients.binance.BinanceWebsocket import CandlestickSubscription, DepthSubscription
+from cryptoxlib.clients.binance.BinanceWebsocket import CandlestickSubscription, DepthSubscription, \
+    OrderBookSubscription
 from cryptoxlib.Pair import Pair
 
 from CryptoXLibTest import CryptoXLibTest, WsMessageCounter
@@ -100,6 +101,32 @@ class BinanceWs(CryptoXLibTest):
 
         await self.assertWsMessageCount(message_counter)
 
+    async def test_order_book(self):
+        message_counter = WsMessageCounter()
+        self.client.compose_subscriptions([
+            OrderBookSubscription(Pair('BTC', 'USDT'), 100, callbacks = [message_counter.generate_callback(3)])
+        ])
+
+        await self.assertWsMessageCount(message_counter)
+
+    async def test_order_book_changes(self):
+        message_counter = WsMessageCounter()
+        self.client.compose_subscriptions([
+            OrderBookSubscription(Pair('BTC', 'USDT'), 100, changes_only = True,
+                                  callbacks = [message_counter.generate_callback(3)])
+        ])
+
+        await self.assertWsMessageCount(message_counter)
+
+    async def test_order_book_worker_process(self):
+        message_counter = WsMessageCounter()
+        callback = message_counter.generate_callback(3)
+        self.client.compose_subscriptions([
+            OrderBookSubscription(Pair('BTC', 'USDT'), 100, callbacks = [lambda book: callback(book)])
+        ])
+
+        await self.assertWsMessageCount(message_counter, worker_processes = 1)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
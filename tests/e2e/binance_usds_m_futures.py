@@ -9,7 +9,7 @@ from cryptoxlib.clients.binance.BinanceFuturesWebsocket import AggregateTradeSub
     AllMarketTickersSubscription, MiniTickerSubscription, OrderBookTickerSubscription, \
     OrderBookSymbolTickerSubscription, LiquidationOrdersSubscription, BlvtCandlestickSubscription, \
     BlvtSubscription, CompositeIndexSubscription, DepthSubscription, CandlestickSubscription, \
-    ContContractCandlestickSubscription, TickerSubscription, AccountSubscription
+    ContContractCandlestickSubscription, TickerSubscription, AccountSubscription, OrderBookSubscription
 from cryptoxlib.clients.binance.exceptions import BinanceRestException
 from cryptoxlib.Pair import Pair
 
@@ -465,6 +465,14 @@ class BinanceUSDSMFuturesMarketWs(CryptoXLibTest):
 
         await self.assertWsMessageCount(message_counter)
 
+    async def test_order_book(self):
+        message_counter = WsMessageCounter()
+        self.client.compose_subscriptions([
+            OrderBookSubscription(symbol = Pair('BTC', 'USDT'), frequency = 100, callbacks = [message_counter.generate_callback(3)])
+        ])
+
+        await self.assertWsMessageCount(message_counter)
+
     async def test_blvt(self):
         message_counter = WsMessageCounter()
         self.client.compose_subscriptions([